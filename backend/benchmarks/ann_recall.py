@@ -0,0 +1,137 @@
+"""Recall and latency of the ANN shortlist against exhaustive scoring.
+
+Runs on a synthetic, clustered candidate pool so no models or datasets are
+needed::
+
+    python -m backend.benchmarks.ann_recall --pool 200000 --dim 384
+"""
+import argparse
+import itertools
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from backend.models import JobProfile
+from backend.matching.ann import IVFIndex, shortlist
+from backend.matching.batch_scoring import (
+    CandidateMatrix,
+    pack_bitsets,
+    score_candidates,
+    overall_scores,
+    batch_semantic_similarity,
+)
+
+SKILLS = ["python", "java", "sql", "aws", "docker", "kubernetes", "react", "git", "linux", "excel",
+          "machine learning", "deep learning", "nlp", "tableau", "azure", "gcp", "django", "flask"]
+DEGREES = ["BACHELOR", "MASTER", "PHD"]
+
+def synthetic_pool(n: int, dim: int, clusters: int, rng: np.random.Generator) -> CandidateMatrix:
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32)
+    emb = centers[rng.integers(0, clusters, n)] + 0.6 * rng.standard_normal((n, dim)).astype(np.float32)
+    skill_rows = [rng.choice(len(SKILLS), rng.integers(0, 7), replace=False).tolist() for _ in range(n)]
+    degree_rows = [rng.choice(len(DEGREES), rng.integers(0, 2), replace=False).tolist() for _ in range(n)]
+    experience = rng.integers(0, 15, n).astype(np.float64)
+    experience[rng.random(n) < 0.3] = np.nan
+    return CandidateMatrix(
+        ids=[str(i) for i in range(n)],
+        names=[None] * n,
+        embeddings=emb,
+        norms=np.linalg.norm(emb.astype(np.float64), axis=1),
+        experience=experience,
+        skill_vocab=SKILLS,
+        skill_bits=pack_bitsets(skill_rows, len(SKILLS)),
+        degree_vocab=DEGREES,
+        degree_bits=pack_bitsets(degree_rows, len(DEGREES)),
+        cert_vocab=[],
+        cert_bits=pack_bitsets([[] for _ in range(n)], 0),
+    )
+
+def synthetic_jobs(m: CandidateMatrix, count: int, rng: np.random.Generator) -> List[JobProfile]:
+    jobs = []
+    for _ in range(count):
+        anchor = m.embeddings[rng.integers(0, len(m))]
+        jobs.append(JobProfile(
+            raw_text="",
+            required_skills=rng.choice(SKILLS, 4, replace=False).tolist(),
+            min_years_experience=float(rng.integers(1, 8)),
+            education_requirements=["BACHELOR"],
+            embedding=(anchor + 0.3 * rng.standard_normal(anchor.shape)).tolist(),
+        ))
+    return jobs
+
+def _top(scores: np.ndarray, rows: np.ndarray, n: int) -> set:
+    best = np.argsort(-scores, kind="stable")[:n]
+    return set(np.asarray(rows)[best].tolist())
+
+def run(pool: int, dim: int, clusters: int, queries: int, top_n: int,
+        lists: List[int], probes: List[int], ks: List[int], floors: List[float], seed: int) -> Dict:
+    rng = np.random.default_rng(seed)
+    m = synthetic_pool(pool, dim, clusters, rng)
+    jobs = synthetic_jobs(m, queries, rng)
+    all_rows = np.arange(len(m))
+
+    exact_top, exact_sem, exact_ms = [], [], []
+    for job in jobs:
+        t0 = time.perf_counter()
+        scores = overall_scores(score_candidates(job, m))
+        exact_ms.append((time.perf_counter() - t0) * 1000)
+        exact_top.append(_top(scores, all_rows, top_n))
+        exact_sem.append(batch_semantic_similarity(job, m))
+
+    report = {
+        "pool": pool, "dim": dim, "queries": queries, "top_n": top_n,
+        "exhaustive_ms": float(np.median(exact_ms)),
+        "runs": [],
+    }
+    for n_lists in lists:
+        t0 = time.perf_counter()
+        ivf = IVFIndex.build(m.embeddings, m.norms, n_lists=n_lists, seed=seed)
+        build_s = time.perf_counter() - t0
+        for n_probe, k, floor in itertools.product(probes, ks, floors):
+            latencies, recalls, sem_recalls, sizes = [], [], [], []
+            for job, exact, sem in zip(jobs, exact_top, exact_sem):
+                t0 = time.perf_counter()
+                rows = shortlist(job, m, ivf, k, n_probe, floor)
+                scores = overall_scores(score_candidates(job, m.take(rows)))
+                latencies.append((time.perf_counter() - t0) * 1000)
+                recalls.append(len(_top(scores, rows, top_n) & exact) / len(exact))
+                ann = ivf.search(m.embeddings, m.norms, np.asarray(job.embedding), k, n_probe)
+                sem_recalls.append(len(set(ann.tolist()) & _top(sem, all_rows, k)) / k)
+                sizes.append(len(rows))
+            report["runs"].append({
+                "n_lists": n_lists, "n_probe": n_probe, "k": k, "skill_floor": floor,
+                "build_s": round(build_s, 3),
+                "median_ms": float(np.median(latencies)),
+                "shortlist_size": float(np.mean(sizes)),
+                "semantic_recall_at_k": float(np.mean(sem_recalls)),
+                "top_n_recall": float(np.mean(recalls)),
+            })
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="ANN shortlist recall/latency vs exhaustive scoring")
+    parser.add_argument("--pool", type=int, default=100000, help="Synthetic candidates")
+    parser.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    parser.add_argument("--clusters", type=int, default=200, help="Latent clusters in the synthetic pool")
+    parser.add_argument("--queries", type=int, default=20, help="Synthetic jobs")
+    parser.add_argument("--topn", type=int, default=10, help="Top-N compared against exhaustive ranking")
+    parser.add_argument("--lists", type=int, nargs="+", default=[256], help="ANN partition counts to try")
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 4, 16], help="Partitions probed per query")
+    parser.add_argument("--k", type=int, nargs="+", default=[200, 1000], help="Semantic neighbours kept")
+    parser.add_argument("--skill-floor", type=float, nargs="+", default=[1.0, 0.75], help="Skill-match floor for always-scored candidates")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args.pool, args.dim, args.clusters, args.queries, args.topn,
+                 args.lists, args.probes, args.k, args.skill_floor, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
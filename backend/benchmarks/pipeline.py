@@ -0,0 +1,184 @@
+"""Per-stage throughput and memory of the matching pipeline.
+
+Generates synthetic data (see ``synthetic.py``), then times text extraction,
+NER, embedding, scoring and end-to-end ranking, including ``cli_kaggle`` in a
+subprocess. By default the deterministic hashing encoder stands in for the
+sentence-transformer and a blank spaCy pipeline is used when the configured
+model isn't installed, so it runs offline::
+
+    python -m backend.benchmarks.pipeline --pdf 100 --docx 100 --csv-rows 5000 --out bench.json
+    python -m backend.benchmarks.pipeline --baseline bench.json   # compare with an earlier run
+
+Throughput comes from an untraced pass; peak Python allocations from a second
+pass under ``tracemalloc``.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from backend.config import SPACY_MODEL
+from backend.benchmarks.synthetic import generate
+from backend.job_matching import rank_candidates, list_documents
+from backend.matching.batch_scoring import CandidateMatrix, score_candidates
+from backend.matching.scoring import compute_component_scores
+from backend.nlp.embeddings import HASHING_ENCODER, HashingEncoder, embed_text, embed_texts, set_model
+from backend.nlp.ner_skill_extractor import extract_entities, extract_entities_batch, load_nlp, set_nlp
+from backend.parsing.job_parser import parse_job_profile
+from backend.parsing.resume_parser import parse_resumes
+from backend.parsing.text_extraction import extract_document, extract_text_any
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+def _measure(fn: Callable[[], object], items: int, memory: bool) -> Dict:
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    result = {"items": items, "seconds": seconds, "items_per_s": items / seconds if seconds else None}
+    if memory:
+        tracemalloc.start()
+        fn()
+        result["peak_alloc_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return result
+
+def _select_models(encoder: str, spacy_model: str) -> Dict[str, str]:
+    if encoder == HASHING_ENCODER:
+        set_model(HashingEncoder())
+    else:
+        from sentence_transformers import SentenceTransformer
+
+        set_model(SentenceTransformer(encoder))
+    try:
+        nlp = load_nlp(spacy_model)
+    except RuntimeError:
+        print(f"spaCy model '{spacy_model}' is not installed; using a blank pipeline", file=sys.stderr)
+        spacy_model = "blank"
+        nlp = load_nlp(spacy_model)
+    set_nlp(nlp)
+    return {"encoder": encoder, "spacy_model": spacy_model}
+
+def _cli_kaggle(job: str, csv_path: str, env: Dict[str, str], chunksize: int) -> Dict:
+    cmd = [
+        sys.executable, "-m", "backend.cli_kaggle", "--job", job, "--csv-path", csv_path,
+        "--name-column", "Name", "--topn", "10", "--chunksize", str(chunksize), "--no-cache",
+    ]
+    before = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    start = time.perf_counter()
+    subprocess.run(cmd, cwd=REPO_ROOT, env=env, check=True, capture_output=True)
+    seconds = time.perf_counter() - start
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS; it is a high-water mark over
+    # all children, so it is only reported when this run raised it.
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    return {"seconds": seconds, "max_rss_mb": maxrss / scale if maxrss > before else None}
+
+def run(args) -> Dict:
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="jobmatch-bench-")
+    paths = generate(data_dir, args.pdf, args.docx, args.csv_rows, args.jobs, args.seed)
+    models = _select_models(args.encoder, args.spacy_model)
+    memory = not args.no_memory
+
+    files = [str(p) for p in sorted(list_documents(paths["resumes"]))]
+    jobs = [str(p) for p in sorted(list_documents(paths["jobs"], what="job profile"))]
+    extractions = [extract_document(f) for f in files]
+    texts: List[str] = [e.text for e in extractions]
+    job = parse_job_profile(jobs[0])
+    cands = parse_resumes(files)
+
+    stages = {
+        "extract_text_any": _measure(lambda: [extract_text_any(f) for f in files], len(files), memory),
+        "extract_entities": _measure(lambda: [extract_entities(t) for t in texts], len(texts), memory),
+        "extract_entities_batch": _measure(lambda: extract_entities_batch(texts), len(texts), memory),
+        "embed_text": _measure(lambda: [embed_text(t) for t in texts], len(texts), memory),
+        "embed_texts": _measure(lambda: embed_texts(texts), len(texts), memory),
+        "compute_component_scores": _measure(
+            lambda: [compute_component_scores(job, c) for c in cands], len(cands), memory
+        ),
+        "score_candidates": _measure(
+            lambda: score_candidates(job, CandidateMatrix.from_profiles(cands)), len(cands), memory
+        ),
+        "rank_candidates": _measure(
+            lambda: rank_candidates(jobs[0], paths["resumes"], 10), len(files), memory
+        ),
+    }
+
+    env = dict(os.environ, JOBMATCH_EMBEDDING_MODEL=models["encoder"], JOBMATCH_SPACY_MODEL=models["spacy_model"])
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+    kaggle = _cli_kaggle(jobs[0], paths["csv"], env, args.chunksize)
+    kaggle.update(items=args.csv_rows, items_per_s=args.csv_rows / kaggle["seconds"])
+    stages["cli_kaggle"] = kaggle
+    pdf_stats = [e.stats for f, e in zip(files, extractions) if f.endswith(".pdf")]
+    stages["extract_text_any"].update(
+        pdf_pages=sum(s.pages for s in pdf_stats),
+        pdf_pages_read=sum(s.read for s in pdf_stats),
+        pdf_pages_skipped=sum(s.skipped for s in pdf_stats),
+        truncated=sum(e.stats.truncated for e in extractions),
+    )
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            **models,
+            "pdf": args.pdf,
+            "docx": args.docx,
+            "csv_rows": args.csv_rows,
+            "seed": args.seed,
+            "data_dir": data_dir,
+        },
+        "stages": stages,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10),
+    }
+
+def compare(report: Dict, baseline: Dict) -> List[str]:
+    """One line per stage: throughput relative to ``baseline`` (>1 is faster)."""
+    lines = []
+    for name, stage in report["stages"].items():
+        old = baseline.get("stages", {}).get(name)
+        if not old or not old.get("items_per_s") or not stage.get("items_per_s"):
+            continue
+        lines.append(f"{name:26s} {stage['items_per_s'] / old['items_per_s']:6.2f}x")
+    return lines
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the matching pipeline on synthetic data")
+    parser.add_argument("--pdf", type=int, default=50, help="Synthetic resume PDFs")
+    parser.add_argument("--docx", type=int, default=50, help="Synthetic resume DOCX files")
+    parser.add_argument("--csv-rows", type=int, default=2000, help="Rows in the synthetic Kaggle CSV")
+    parser.add_argument("--jobs", type=int, default=3, help="Synthetic job profiles")
+    parser.add_argument("--chunksize", type=int, default=1000, help="cli_kaggle --chunksize")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=None, help="Where to write the synthetic data (default: a temp dir)")
+    parser.add_argument("--encoder", default=HASHING_ENCODER,
+                        help=f"'{HASHING_ENCODER}' for the offline stand-in, or a sentence-transformers model name")
+    parser.add_argument("--spacy-model", default=SPACY_MODEL, help="spaCy pipeline ('blank' for none)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare throughput against")
+    parser.add_argument("--out", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+    if args.baseline:
+        with open(args.baseline) as f:
+            print("\n".join(compare(report, json.load(f))), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
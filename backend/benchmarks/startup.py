@@ -0,0 +1,92 @@
+"""Import and CLI startup cost.
+
+Each target is timed in a fresh interpreter so module caches don't hide the
+cost; ``-X importtime`` output is used to list the slowest imports::
+
+    python -m backend.benchmarks.startup --repeat 5 --out startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+IMPORT_TARGETS = [
+    "backend.job_matching",
+    "backend.main",
+    "backend.cli",
+    "backend.cli_kaggle",
+]
+
+CLI_TARGETS = [
+    ["-m", "backend.cli", "--help"],
+    ["-m", "backend.cli_kaggle", "--help"],
+]
+
+def _run(args: List[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *args], cwd=REPO_ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+def _slowest_imports(module: str, top: int) -> List[Dict]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append({"module": parts[2].strip(), "cumulative_ms": int(parts[1]) / 1000})
+    rows.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+    return rows[:top]
+
+def _warm_up_seconds() -> float:
+    code = (
+        "import time; from backend.nlp.features import warm_up; "
+        "t = time.perf_counter(); warm_up(); print(time.perf_counter() - t)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, check=True, capture_output=True, text=True,
+    )
+    return float(proc.stdout.strip().splitlines()[-1])
+
+def run(repeat: int, top: int, warm_up: bool) -> Dict:
+    report: Dict = {"python": sys.version.split()[0], "repeat": repeat, "imports": [], "cli": []}
+    for module in IMPORT_TARGETS:
+        times = [_run(["-c", f"import {module}"]) for _ in range(repeat)]
+        report["imports"].append({
+            "module": module,
+            "median_s": statistics.median(times),
+            "slowest_imports": _slowest_imports(module, top),
+        })
+    for args in CLI_TARGETS:
+        times = [_run(args) for _ in range(repeat)]
+        report["cli"].append({"command": " ".join(args), "median_s": statistics.median(times)})
+    if warm_up:
+        report["model_warm_up_s"] = _warm_up_seconds()
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import and CLI startup time")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed per module")
+    parser.add_argument("--warm-up", action="store_true", help="Also time loading spaCy and the encoder")
+    parser.add_argument("--out", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    text = json.dumps(run(args.repeat, args.top, args.warm_up), indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
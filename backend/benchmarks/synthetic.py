@@ -0,0 +1,124 @@
+"""Synthetic resumes and job profiles for benchmarks.
+
+Texts draw their skills from ``data/skills_dictionary.json`` so the skill
+matcher has real work to do; everything is seeded and reproducible::
+
+    python -m backend.benchmarks.synthetic --out bench-data --pdf 200 --docx 200 --csv-rows 10000
+"""
+import argparse
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Dict, List
+
+import fitz  # PyMuPDF
+from docx import Document
+
+from backend.nlp.taxonomy import TAXONOMY
+
+SKILLS: List[str] = TAXONOMY.names
+
+FIRST_NAMES = ["Asha", "Ben", "Chen", "Divya", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonas", "Kavya", "Liam"]
+LAST_NAMES = ["Rao", "Smith", "Wang", "Iyer", "Garcia", "Haddad", "Kim", "Tanaka", "Silva", "Berg", "Nair", "Murphy"]
+COMPANIES = ["Google", "Acme Corp", "Initech", "Globex", "Umbrella Analytics", "Stark Industries", "Wayne Enterprises"]
+DEGREES = ["Bachelor of Technology", "Bachelor of Science", "Master of Science", "MSc Data Science", "PhD in Computer Science"]
+CERTS = ["AWS Certified Solutions Architect", "PMP", "CCNA", "CISSP"]
+ROLES = ["Software Engineer", "Data Scientist", "Backend Developer", "ML Engineer", "Data Analyst", "DevOps Engineer"]
+FILLER = [
+    "Delivered features end to end in a cross-functional team.",
+    "Improved reliability and reduced incident volume quarter over quarter.",
+    "Mentored junior engineers and ran code reviews.",
+    "Worked closely with product managers to scope and prioritise work.",
+    "Owned on-call rotation and wrote runbooks for common failures.",
+    "Presented results to stakeholders and documented design decisions.",
+]
+
+def resume_text(rng: random.Random) -> Dict[str, str]:
+    """One resume as ``{"name": ..., "text": ...}``."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, min(len(SKILLS), rng.randint(3, 10)))
+    years = rng.randint(0, 15)
+    lines = [
+        name,
+        f"{rng.choice(ROLES)} with {years} years of experience.",
+        f"Skills: {', '.join(skills)}",
+        "Experience",
+    ]
+    for _ in range(rng.randint(1, 4)):
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)}. Used {rng.choice(skills)} and {rng.choice(skills)} daily.")
+        lines.extend(rng.sample(FILLER, 2))
+    lines += ["Education", rng.choice(DEGREES)]
+    if rng.random() < 0.3:
+        lines += ["Certifications", rng.choice(CERTS)]
+    return {"name": name, "text": "\n".join(lines)}
+
+def job_text(rng: random.Random) -> str:
+    role = rng.choice(ROLES)
+    skills = rng.sample(SKILLS, min(len(SKILLS), rng.randint(4, 8)))
+    lines = [
+        role,
+        f"We are hiring a {role} to join our platform team.",
+        f"Requires {rng.randint(1, 8)}+ years of experience with {', '.join(skills)}.",
+        f"A {rng.choice(['bachelor', 'master'])} degree in a related field is expected.",
+    ]
+    if rng.random() < 0.3:
+        lines.append(f"{rng.choice(CERTS)} preferred.")
+    lines.extend(rng.sample(FILLER, 2))
+    return "\n".join(lines)
+
+def write_pdf(path: Path, text: str) -> None:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=10)
+    doc.save(str(path))
+    doc.close()
+
+def write_docx(path: Path, text: str) -> None:
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(str(path))
+
+def write_csv(path: Path, rows: int, rng: random.Random, text_column: str = "Resume", name_column: str = "Name") -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([name_column, text_column])
+        for _ in range(rows):
+            r = resume_text(rng)
+            writer.writerow([r["name"], r["text"]])
+
+def generate(out_dir: str, pdf: int, docx: int, csv_rows: int, jobs: int, seed: int = 0) -> Dict[str, str]:
+    """Write a resume folder, a Kaggle-style CSV and job PDFs under ``out_dir``.
+
+    Returns the paths of what was written.
+    """
+    rng = random.Random(seed)
+    out = Path(out_dir)
+    resumes = out / "resumes"
+    job_dir = out / "jobs"
+    resumes.mkdir(parents=True, exist_ok=True)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    for i in range(pdf):
+        write_pdf(resumes / f"resume_{i:05d}.pdf", resume_text(rng)["text"])
+    for i in range(docx):
+        write_docx(resumes / f"resume_{pdf + i:05d}.docx", resume_text(rng)["text"])
+    for i in range(jobs):
+        write_pdf(job_dir / f"job_{i:03d}.pdf", job_text(rng))
+    csv_path = out / "resumes.csv"
+    write_csv(csv_path, csv_rows, rng)
+    return {"resumes": str(resumes), "jobs": str(job_dir), "csv": str(csv_path)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic resumes and job profiles")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--pdf", type=int, default=100, help="Resume PDFs to write")
+    parser.add_argument("--docx", type=int, default=100, help="Resume DOCX files to write")
+    parser.add_argument("--csv-rows", type=int, default=1000, help="Rows in the Kaggle-style CSV")
+    parser.add_argument("--jobs", type=int, default=5, help="Job profile PDFs to write")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(generate(args.out, args.pdf, args.docx, args.csv_rows, args.jobs, args.seed), indent=2))
+
+if __name__ == "__main__":
+    main()
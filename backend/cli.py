@@ -1,23 +1,178 @@
 import argparse
 import json
 import sys
+import time
+from pathlib import Path
 
-from backend.job_matching import rank_candidates
+from backend.config import FEATURE_CACHE_DIR
+from backend.folder_sync import FolderSync
+from backend.job_matching import list_documents, rank_candidates, rank_candidates_batch
+from backend.models import JobMatches
+from backend.nlp.dedup import Deduplicator
+from backend.parsing.job_parser import parse_job_profiles
+from backend.parsing.parallel import ParserPool
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.score_run import score_run_writers
+from backend.streaming import NdjsonWriter
+from backend import timing
+
+def _print_failures(failures, stream=None):
+    for f in failures:
+        print(f"SKIPPED {f.path}: {f.error}", file=sys.stderr)
+    if stream is not None:
+        stream.failures(failures)
+    failures.clear()
+
+def _write_ranked(stream, ranked, multi_job):
+    if multi_job:
+        for r in ranked:
+            stream.matches(r.matches, r.job)
+    else:
+        stream.matches(ranked)
+    stream.done()
+
+def _rank_incremental(args, cache, failures, stream=None, dedup=None):
+    """Rank from the folder's manifest, re-parsing only what changed.
+
+    With ``--watch`` this keeps polling and prints one JSON line per update
+    instead of returning. ``dedup`` finds duplicates among the files parsed
+    in this process, not against profiles from earlier runs.
+    """
+    if args.jobs:
+        job_paths = sorted(str(p) for p in list_documents(args.jobs, what="job profile"))
+    else:
+        job_paths = [args.job]
+    jobs = parse_job_profiles(job_paths, cache=cache)
+    folder = FolderSync(args.resumes, args.state_dir)
+    try:
+        with ParserPool(args.workers) as parser:
+            first = True
+            while True:
+                stats = folder.sync(parser, cache, failures, stream.progress("parse") if stream else None, dedup)
+                if args.watch is not None and not (first or stats.dirty):
+                    # Nothing to re-rank; only newly unreadable files to report.
+                    _print_failures(failures, stream)
+                    time.sleep(args.watch)
+                    continue
+                writers = []
+                if args.save_scores:
+                    labels = [Path(p).name for p in job_paths] if args.jobs else None
+                    writers = score_run_writers(args.save_scores, jobs, labels, lookup=folder.pool.get)
+                ranked = folder.rank(jobs, args.topn, records=[w.add for w in writers] or None)
+                for w in writers:
+                    w.close()
+                if args.jobs:
+                    ranked = [JobMatches(job=Path(p).name, matches=r) for p, r in zip(job_paths, ranked)]
+                else:
+                    ranked = ranked[0]
+                if args.watch is None:
+                    print(
+                        f"incremental: {stats.added} new, {stats.changed} changed, "
+                        f"{stats.removed} removed, {stats.unchanged} unchanged, "
+                        f"{stats.skipped} unreadable (skipped until they change)",
+                        file=sys.stderr,
+                    )
+                    return ranked
+                _print_failures(failures, stream)
+                if stream is not None:
+                    _write_ranked(stream, ranked, bool(args.jobs))
+                else:
+                    print(json.dumps([r.model_dump() for r in ranked]), flush=True)
+                first = False
+                time.sleep(args.watch)
+    finally:
+        folder.close()
 
 def main():
     parser = argparse.ArgumentParser(description="AI-Based Job Profile and Resume Matching System (folder-based resumes)")
-    parser.add_argument("--job", required=True, help="Path to job profile PDF")
+    jobs = parser.add_mutually_exclusive_group(required=True)
+    jobs.add_argument("--job", help="Path to job profile PDF")
+    jobs.add_argument("--jobs", metavar="DIR", help="Folder of job profiles; resumes are parsed once and ranked for each")
     parser.add_argument("--resumes", required=True, help="Folder with candidate resumes (PDF/DOCX)")
     parser.add_argument("--topn", type=int, default=10, help="Number of top candidates to return")
+    parser.add_argument("--workers", type=int, default=1, help="Processes used to parse resumes")
+    parser.add_argument("--cache-dir", default=FEATURE_CACHE_DIR, help="Directory for the parsed-feature cache")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the parsed-feature cache")
+    parser.add_argument("--incremental", action="store_true", help="Keep a manifest of parsed resumes and only re-parse new or changed files")
+    parser.add_argument("--state-dir", default=None, help="Where --incremental keeps its manifest (default: RESUMES/.jobmatch)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", default=None, help="Implies --incremental; poll the folder and print updated rankings as one JSON line per change")
+    parser.add_argument("--lean", action="store_true", help="Drop resume text after feature extraction to save memory")
+    parser.add_argument("--dedup", action="store_true", help="Detect exact and near-duplicate resumes before NLP; duplicates reuse the first copy's features")
+    parser.add_argument("--dedup-threshold", type=float, default=0.85, help="Estimated Jaccard similarity (word 5-grams) at which two resumes count as near-duplicates")
+    parser.add_argument("--collapse-duplicates", action="store_true", help="Implies --dedup; keep only the first copy of duplicate resumes in the ranking")
+    parser.add_argument("--save-scores", metavar="DIR", default=None, help="Save every candidate's component scores for backend.cli_rerank (with --jobs, one subdirectory per job)")
+    parser.add_argument("--ndjson", action="store_true", help="Stream progress and results as JSON lines instead of one JSON document")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings to stderr (stages in --workers processes are not included)")
     args = parser.parse_args()
 
+    dedup = Deduplicator(threshold=args.dedup_threshold) if args.dedup or args.collapse_duplicates else None
+    if args.collapse_duplicates and (args.incremental or args.watch is not None):
+        parser.error("--collapse-duplicates does not apply to --incremental/--watch; use --dedup")
+
+    if args.profile:
+        timing.enable(keep_samples=True)
+    start = time.perf_counter()
+
+    cache = None if args.no_cache else FeatureCache(args.cache_dir)
+
+    failures = []
+    stream = NdjsonWriter() if args.ndjson else None
+    progress = stream.progress("parse") if stream else None
+
     try:
-        ranked = rank_candidates(args.job, args.resumes, args.topn)
+        if args.incremental or args.watch is not None:
+            ranked = _rank_incremental(args, cache, failures, stream, dedup)
+        elif args.jobs:
+            job_paths = sorted(str(p) for p in list_documents(args.jobs, what="job profile"))
+            ranked = rank_candidates_batch(
+                job_paths,
+                args.resumes,
+                args.topn,
+                cache=cache,
+                workers=args.workers,
+                failures=failures,
+                lean=args.lean,
+                save_scores=args.save_scores,
+                progress=progress,
+                dedup=dedup,
+                collapse_duplicates=args.collapse_duplicates,
+            )
+        else:
+            ranked = rank_candidates(
+                args.job,
+                args.resumes,
+                args.topn,
+                cache=cache,
+                workers=args.workers,
+                failures=failures,
+                lean=args.lean,
+                save_scores=args.save_scores,
+                progress=progress,
+                dedup=dedup,
+                collapse_duplicates=args.collapse_duplicates,
+            )
+    except KeyboardInterrupt:
+        return
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
 
-    print(json.dumps([r.model_dump() for r in ranked], indent=2))
+    _print_failures(failures, stream)
+
+    if cache is not None:
+        stats = cache.stats()
+        print(f"feature cache: {stats['hits']} hits, {stats['misses']} misses", file=sys.stderr)
+
+    if dedup is not None:
+        print(dedup.stats.summary(), file=sys.stderr)
+
+    if args.profile:
+        print(timing.format_summary(time.perf_counter() - start), file=sys.stderr)
+
+    if stream is not None:
+        _write_ranked(stream, ranked, bool(args.jobs))
+    else:
+        print(json.dumps([r.model_dump() for r in ranked], indent=2))
 
 if __name__ == "__main__":
     main()
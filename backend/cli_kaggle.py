@@ -1,58 +1,155 @@
 import argparse
 import json
 import sys
+import time
+from pathlib import Path
 
-from backend.parsing.job_parser import parse_job_profile
-from backend.datasets.kaggle_loader import load_kaggle_resumes
-from backend.matching.scoring import compute_component_scores, compute_overall_score
-from backend.matching.explanation import build_rationale
-from backend.models import MatchResult
+from backend.config import FEATURE_CACHE_DIR
+from backend.job_matching import list_documents
+from backend.models import JobMatches
+from backend.parsing.job_parser import parse_job_profiles
+from backend.datasets.kaggle_loader import iter_kaggle_resumes, DEFAULT_CHUNKSIZE
+from backend.matching.ranking import TopN, push_scored_many, finalize, rank_rows, rank_rows_many
+from backend.matching.ann import IVFIndex, shortlist
+from backend.nlp.dedup import Deduplicator, collapse_duplicates
+from backend.storage.candidate_index import CandidateIndex, build_index
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.score_run import score_run_writers
+from backend.streaming import NdjsonWriter
+from backend import timing
+
+def _iter_csv(args, cache, lean=False, dedup=None):
+    batches = iter_kaggle_resumes(
+        csv_path=args.csv_path,
+        text_column=args.text_column,
+        name_column=args.name_column,
+        max_rows=args.max_rows,
+        cache=cache,
+        n_process=args.nlp_processes,
+        chunksize=args.chunksize,
+        lean=lean,
+        dedup=dedup,
+    )
+    if args.collapse_duplicates:
+        return (collapse_duplicates(batch) for batch in batches)
+    return batches
 
 def main():
     parser = argparse.ArgumentParser(description="AI-Based Job & Resume Matching (Kaggle dataset version)")
-    parser.add_argument("--job", required=True, help="Path to job profile PDF")
-    parser.add_argument("--csv-path", required=True, help="Path to Kaggle CSV with resumes")
+    jobs_arg = parser.add_mutually_exclusive_group()
+    jobs_arg.add_argument("--job", help="Path to job profile PDF")
+    jobs_arg.add_argument("--jobs", metavar="DIR", help="Folder of job profiles; candidates are parsed once and ranked for each")
+    parser.add_argument("--csv-path", help="Path to Kaggle CSV with resumes")
+    parser.add_argument("--index", metavar="DIR", help="Rank against a prebuilt candidate index instead of a CSV")
+    parser.add_argument("--build-index", metavar="DIR", help="Parse --csv-path into a candidate index at DIR and exit")
+    parser.add_argument("--ann-lists", type=int, default=None, help="With --build-index: also build an ANN index with this many partitions")
+    parser.add_argument("--ann-k", type=int, default=0, help="With --index: only fully score the K nearest semantic neighbours (0 = exhaustive)")
+    parser.add_argument("--ann-probes", type=int, default=8, help="ANN partitions scanned per query (higher = better recall, slower)")
+    parser.add_argument("--ann-skill-floor", type=float, default=0.75, help="Always score candidates whose skill match is at least this")
     parser.add_argument("--text-column", default="Resume", help="Column containing full resume text")
     parser.add_argument("--name-column", default=None, help="Optional column containing candidate names")
     parser.add_argument("--max-rows", type=int, default=None, help="Max rows from Kaggle CSV (for quicker tests)")
     parser.add_argument("--topn", type=int, default=10, help="Number of top candidates to return")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="CSV rows parsed and scored per batch")
+    parser.add_argument("--nlp-processes", type=int, default=1, help="spaCy worker processes for NER")
+    parser.add_argument("--cache-dir", default=FEATURE_CACHE_DIR, help="Directory for the parsed-feature cache")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the parsed-feature cache")
+    parser.add_argument("--lean", action="store_true", help="Drop resume text after feature extraction (ranking only; indexes keep it)")
+    parser.add_argument("--dedup", action="store_true", help="Detect exact and near-duplicate resumes before NLP; duplicates reuse the first copy's features")
+    parser.add_argument("--dedup-threshold", type=float, default=0.85, help="Estimated Jaccard similarity (word 5-grams) at which two resumes count as near-duplicates")
+    parser.add_argument("--collapse-duplicates", action="store_true", help="Implies --dedup; keep only the first copy of duplicate resumes in the ranking or index")
+    parser.add_argument("--save-scores", metavar="DIR", default=None, help="Save every candidate's component scores for backend.cli_rerank (with --jobs, one subdirectory per job)")
+    parser.add_argument("--ndjson", action="store_true", help="Stream progress and results as JSON lines instead of one JSON document")
+    parser.add_argument("--profile", action="store_true", help="Print per-stage timings to stderr")
     args = parser.parse_args()
 
+    if args.build_index:
+        if not args.csv_path:
+            parser.error("--build-index requires --csv-path")
+    elif not (args.job or args.jobs) or not (args.csv_path or args.index):
+        parser.error("--job or --jobs, and one of --csv-path or --index, are required")
+    if (args.dedup or args.collapse_duplicates) and args.index:
+        parser.error("--dedup and --collapse-duplicates apply when parsing --csv-path, not to --index")
+
+    cache = None if args.no_cache else FeatureCache(args.cache_dir)
+    stream = NdjsonWriter() if args.ndjson else None
+    dedup = Deduplicator(threshold=args.dedup_threshold) if args.dedup or args.collapse_duplicates else None
+
+    if args.profile:
+        timing.enable(keep_samples=True)
+    start = time.perf_counter()
+
     try:
-        job = parse_job_profile(args.job)
-        candidates = load_kaggle_resumes(
-            csv_path=args.csv_path,
-            text_column=args.text_column,
-            name_column=args.name_column,
-            max_rows=args.max_rows,
-        )
+        if args.build_index:
+            count = build_index(args.build_index, _iter_csv(args, cache, dedup=dedup))
+            print(f"Indexed {count} candidates into {args.build_index}", file=sys.stderr)
+            if args.ann_lists and count:
+                m = CandidateIndex(args.build_index).matrix
+                IVFIndex.build(m.embeddings, m.norms, n_lists=args.ann_lists).save(args.build_index)
+            return
+
+        if args.jobs:
+            job_paths = sorted(str(p) for p in list_documents(args.jobs, what="job profile"))
+        else:
+            job_paths = [args.job]
+        jobs = parse_job_profiles(job_paths, cache=cache)
+        writers = []
+        if args.save_scores:
+            labels = [Path(p).name for p in job_paths] if args.jobs else None
+            writers = score_run_writers(args.save_scores, jobs, labels, index_dir=args.index)
+        records = [w.add for w in writers] or None
+
+        if args.index:
+            index = CandidateIndex(args.index)
+            if args.ann_k:
+                ivf = IVFIndex.load(args.index)
+                if ivf is None:
+                    raise ValueError(f"Index {args.index} has no ANN partitions; rebuild it with --ann-lists")
+                ranked = [
+                    rank_rows(
+                        job, index.matrix, index.profile, args.topn,
+                        rows=shortlist(job, index.matrix, ivf, args.ann_k, args.ann_probes, args.ann_skill_floor),
+                        record=records[i] if records else None,
+                    )
+                    for i, job in enumerate(jobs)
+                ]
+            else:
+                ranked = rank_rows_many(jobs, index.matrix, index.profile, args.topn, records=records)
+        else:
+            tops = [TopN(args.topn) for _ in jobs]
+            # Each batch is scored against every job as soon as it is parsed;
+            # only the current top candidates are kept alive between batches.
+            parsed = 0
+            for batch in _iter_csv(args, cache, lean=args.lean, dedup=dedup):
+                push_scored_many(tops, jobs, batch, records=records)
+                parsed += len(batch)
+                if stream is not None:
+                    stream.progress("parse")(parsed, args.max_rows)
+            ranked = [finalize(top, job) for top, job in zip(tops, jobs)]
+        for w in writers:
+            w.close()
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if cache is not None:
+            stats = cache.stats()
+            print(f"feature cache: {stats['hits']} hits, {stats['misses']} misses", file=sys.stderr)
+        if dedup is not None:
+            print(dedup.stats.summary(), file=sys.stderr)
+        if args.profile:
+            print(timing.format_summary(time.perf_counter() - start), file=sys.stderr)
 
-    results: list[MatchResult] = []
-
-    for cand in candidates:
-        comps, matched, missing_req, missing_pref = compute_component_scores(job, cand)
-        fit = compute_overall_score(comps)
-        rationale = build_rationale(job, cand, comps, matched, missing_req, missing_pref)
-        results.append(
-            MatchResult(
-                candidate_id=cand.candidate_id,
-                name=cand.name,
-                fit_score_0_100=round(fit, 2),
-                components=comps,
-                matched_skills=matched,
-                missing_required_skills=missing_req,
-                nice_to_have_missing_skills=missing_pref,
-                rationale=rationale,
-            )
-        )
-
-    results.sort(key=lambda r: r.fit_score_0_100, reverse=True)
-    results = results[: args.topn]
-
-    print(json.dumps([r.model_dump() for r in results], indent=2))
+    if stream is not None:
+        for p, r in zip(job_paths, ranked):
+            stream.matches(r, Path(p).name if args.jobs else None)
+        stream.done()
+        return
+    if args.jobs:
+        output = [JobMatches(job=Path(p).name, matches=r).model_dump() for p, r in zip(job_paths, ranked)]
+    else:
+        output = [r.model_dump() for r in ranked[0]]
+    print(json.dumps(output, indent=2))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,46 @@
+import argparse
+import json
+import sys
+import time
+
+from backend.models import WeightedMatches
+from backend.storage.score_run import ScoreRun, resolve_weights
+
+def _load_weights(args):
+    weights = [json.loads(w) for w in args.weights]
+    if args.weights_file:
+        with open(args.weights_file) as f:
+            text = f.read().strip()
+        # A JSON list of configurations, or one configuration per line.
+        weights += json.loads(text) if text.startswith("[") else [json.loads(line) for line in text.splitlines() if line.strip()]
+    return weights or [None]
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-rank a saved run (--save-scores) under different score weights")
+    parser.add_argument("--scores", required=True, metavar="DIR", help="Directory written by cli.py/cli_kaggle.py --save-scores")
+    parser.add_argument("--weights", action="append", default=[], metavar="JSON",
+                        help='Weights to apply, e.g. \'{"skill_match": 0.6, "semantic_similarity": 0.3}\'; '
+                             "components left out keep their default. Repeat to compare configurations")
+    parser.add_argument("--weights-file", default=None, help="JSON list (or JSON lines) of weight configurations")
+    parser.add_argument("--topn", type=int, default=10, help="Number of top candidates to return per configuration")
+    args = parser.parse_args()
+
+    try:
+        weights = _load_weights(args)
+        run = ScoreRun.load(args.scores)
+        start = time.perf_counter()
+        ranked = run.rerank(weights, args.topn)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"re-ranked {len(run)} candidates under {len(weights)} weight configurations in {elapsed * 1000:.1f} ms", file=sys.stderr)
+    if len(weights) == 1:
+        output = [r.model_dump() for r in ranked[0]]
+    else:
+        output = [WeightedMatches(weights=resolve_weights(w), matches=r).model_dump() for w, r in zip(weights, ranked)]
+    print(json.dumps(output, indent=2))
+
+if __name__ == "__main__":
+    main()
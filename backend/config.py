@@ -1,6 +1,58 @@
+from pathlib import Path
 from typing import Dict
+import os
 
-EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+# "hashing" selects the offline stand-in encoder (see nlp/embeddings.py).
+EMBEDDING_MODEL = os.environ.get("JOBMATCH_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# "blank" selects an empty English pipeline (dictionary skills only, no NER).
+SPACY_MODEL = os.environ.get("JOBMATCH_SPACY_MODEL", "en_core_web_sm")
+EMBEDDING_BATCH_SIZE = 64
+# How profiles hold their embedding: "float32", or "int8" (quantized with one
+# scale per vector; ~4x smaller, scores shift slightly).
+EMBEDDING_DTYPE = os.environ.get("JOBMATCH_EMBEDDING_DTYPE", "float32")
+NER_BATCH_SIZE = 64
+
+FEATURE_CACHE_DIR = os.environ.get(
+    "JOBMATCH_CACHE_DIR", str(Path.home() / ".cache" / "job-profile-matcher")
+)
+FEATURE_CACHE_MAX_BYTES = 2 * 1024**3
+
+# Candidates uploaded to the API's persistent pool.
+POOL_DIR = os.environ.get(
+    "JOBMATCH_POOL_DIR", str(Path.home() / ".local" / "share" / "job-profile-matcher" / "pool")
+)
+
+# Parsed job profiles the API keeps in memory, keyed by upload hash.
+JOB_CACHE_MAX_ENTRIES = int(os.environ.get("JOBMATCH_JOB_CACHE_SIZE", "256"))
+JOB_CACHE_TTL_SECONDS = float(os.environ.get("JOBMATCH_JOB_CACHE_TTL", str(24 * 3600)))
+# Component scores of recent /match and /pool/match runs, kept for /rerank.
+SCORE_RUN_CACHE_SIZE = int(os.environ.get("JOBMATCH_SCORE_RUNS", "32"))
+
+# Load models when the API starts rather than on the first request.
+WARM_UP_MODELS = os.environ.get("JOBMATCH_WARMUP", "1") != "0"
+
+# Resume-parsing processes used by the API (the CLIs take --workers).
+PARSE_WORKERS = int(os.environ.get("JOBMATCH_WORKERS", "1"))
+
+# Text extraction stops after this many PDF pages / characters (0 = no
+# limit). Long portfolios rarely add anything after the first pages, and the
+# embedding only sees the first 8000 characters anyway.
+EXTRACT_MAX_PAGES = int(os.environ.get("JOBMATCH_MAX_PAGES", "30"))
+EXTRACT_MAX_CHARS = int(os.environ.get("JOBMATCH_MAX_CHARS", "100000"))
+# Processes that split the pages of one large PDF (1 = read in-process). Only
+# documents with at least PDF_PARALLEL_MIN_PAGES pages inside the page budget
+# are split, so this is inactive under the default 30-page budget; it applies
+# when JOBMATCH_MAX_PAGES is 0 or at least 64. The character budget still
+# stops reading early.
+PDF_PAGE_WORKERS = int(os.environ.get("JOBMATCH_PDF_WORKERS", "1"))
+PDF_PARALLEL_MIN_PAGES = 64
+
+# Threads the API runs parsing/scoring on, off the event loop. Requests beyond
+# this queue instead of competing for the same cores.
+API_THREADS = int(os.environ.get("JOBMATCH_API_THREADS", "4"))
+
+# Request and pipeline-stage histograms served by the API's /metrics.
+METRICS_ENABLED = os.environ.get("JOBMATCH_METRICS", "1") != "0"
 
 DEFAULT_WEIGHTS: Dict[str, float] = {
     "skill_match": 0.40,
@@ -1,18 +1,29 @@
-from typing import Iterable, List
+from typing import Iterable, Iterator, List, Optional
 from pathlib import Path
 import uuid
 
 import pandas as pd
 
 from backend.models import CandidateProfile, EducationEntry, ExperienceEntry
-from backend.nlp.ner_skill_extractor import extract_entities
-from backend.nlp.embeddings import embed_text
+from backend.nlp.dedup import Deduplicator
+from backend.nlp.embeddings import compact_embedding
+from backend.nlp.features import extract_features
+from backend.parsing.resume_parser import make_lean
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.text_store import TextStore
+
+DEFAULT_CHUNKSIZE = 1000
 
 def load_kaggle_resumes(
     csv_path: str,
     text_column: str = "Resume",
     name_column: str | None = None,
     max_rows: int | None = None,
+    cache: Optional[FeatureCache] = None,
+    n_process: int = 1,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
 ) -> List[CandidateProfile]:
     """Load resumes from a Kaggle CSV file and convert them to CandidateProfile objects.
 
@@ -26,35 +37,120 @@ def load_kaggle_resumes(
         Optional column for candidate name; if None, names will be left empty.
     max_rows : int | None, optional
         Limit the number of rows to load (for quick testing).
+    cache : FeatureCache | None, optional
+        On-disk feature cache; rows whose text was seen before skip NER and
+        embedding.
+    n_process : int, default 1
+        Number of spaCy worker processes used for NER.
+    lean : bool, default False
+        Drop each resume's text once its features are extracted; nothing in
+        scoring or ranking reads it.
+    text_store : TextStore | None, optional
+        Lean mode that appends the texts to this store instead, recording
+        each one's position in ``raw_text_span`` (see ``fetch_raw_text``).
+    dedup : Deduplicator | None, optional
+        Rows that repeat (or nearly repeat) an earlier row reuse its features
+        instead of running NER and embedding, and get ``duplicate_of`` set.
 
     Returns
     -------
     List[CandidateProfile]
     """
+    candidates: List[CandidateProfile] = []
+    for batch in iter_kaggle_resumes(
+        csv_path,
+        text_column=text_column,
+        name_column=name_column,
+        max_rows=max_rows,
+        cache=cache,
+        n_process=n_process,
+        lean=lean,
+        text_store=text_store,
+        dedup=dedup,
+    ):
+        candidates.extend(batch)
+    return candidates
+
+def iter_kaggle_resumes(
+    csv_path: str,
+    text_column: str = "Resume",
+    name_column: str | None = None,
+    max_rows: int | None = None,
+    cache: Optional[FeatureCache] = None,
+    n_process: int = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
+) -> Iterator[List[CandidateProfile]]:
+    """Stream resumes from a Kaggle CSV in batches of at most ``chunksize`` rows.
+
+    Only the text and name columns are read, and each chunk is parsed and
+    yielded before the next one is loaded, so memory stays bounded by the
+    chunk size rather than the file size.
+
+    Parameters
+    ----------
+    csv_path : str
+        Path to the Kaggle CSV dataset.
+    text_column, name_column, max_rows, cache, n_process, lean, text_store, dedup
+        As for ``load_kaggle_resumes``.
+    chunksize : int, default 1000
+        Rows read, parsed and yielded per batch.
+
+    Yields
+    ------
+    List[CandidateProfile]
+    """
     p = Path(csv_path)
     if not p.exists():
         raise FileNotFoundError(f"Kaggle CSV not found: {p.resolve()}")
 
-    df = pd.read_csv(p)
+    columns = list(pd.read_csv(p, nrows=0).columns)
 
-    if text_column not in df.columns:
+    if text_column not in columns:
         raise ValueError(
             f"Expected text column '{text_column}' not found. "
-            f"Available columns: {list(df.columns)}"
+            f"Available columns: {columns}"
         )
 
-    if max_rows is not None:
-        df = df.head(max_rows)
+    use_name = bool(name_column) and name_column in columns
+    usecols = [text_column] + ([name_column] if use_name and name_column != text_column else [])
 
-    candidates: List[CandidateProfile] = []
+    remaining = max_rows
+    for chunk in pd.read_csv(p, usecols=usecols, dtype=str, chunksize=chunksize):
+        if remaining is not None:
+            if remaining <= 0:
+                break
+            chunk = chunk.head(remaining)
+            remaining -= len(chunk)
+
+        texts = [str(t) for t in chunk[text_column]]
+        if use_name:
+            names = [str(n) for n in chunk[name_column]]
+        else:
+            names = [None] * len(texts)
 
-    for _, row in df.iterrows():
-        text = str(row[text_column])
-        name = str(row[name_column]) if name_column and name_column in df.columns else None
+        batch = _build_candidates(texts, names, cache, n_process, dedup)
+        if lean or text_store is not None:
+            make_lean(batch, text_store)
+        yield batch
 
-        ents = extract_entities(text)
-        embedding = embed_text(text)
+def _build_candidates(
+    texts: List[str],
+    names: List[Optional[str]],
+    cache: Optional[FeatureCache],
+    n_process: int,
+    dedup: Optional[Deduplicator] = None,
+) -> List[CandidateProfile]:
+    if dedup is None:
+        features = extract_features(texts, cache, n_process=n_process)
+    else:
+        features, duplicates = dedup.extract_features(texts, cache, n_process)
+
+    candidates: List[CandidateProfile] = []
 
+    for text, name, (ents, embedding) in zip(texts, names, features):
         cand = CandidateProfile(
             candidate_id=str(uuid.uuid4()),
             name=name,
@@ -70,9 +166,11 @@ def load_kaggle_resumes(
             projects=ents["projects"],
             total_years_experience=None,
             domains=[],
-            embedding=embedding,
+            embedding=compact_embedding(embedding),
             raw_text=text,
         )
         candidates.append(cand)
 
+    if dedup is not None:
+        dedup.link(candidates, duplicates)
     return candidates
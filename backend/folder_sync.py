@@ -0,0 +1,220 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import hashlib
+import os
+
+from pydantic import BaseModel
+
+from backend.config import EMBEDDING_DTYPE, EMBEDDING_MODEL, SPACY_MODEL
+from backend.job_matching import list_documents
+from backend.models import JobProfile, MatchResult
+from backend.nlp.features import feature_key
+from backend.nlp.ner_skill_extractor import EXTRACTOR_VERSION, SKILLS_DICTIONARY_VERSION
+from backend.parsing.parallel import ParserPool, Progress
+from backend.matching.ranking import Recorder
+from backend.nlp.dedup import Deduplicator
+from backend.parsing.resume_parser import ParseFailure
+from backend.storage.candidate_pool import CandidatePool
+from backend.storage.feature_cache import FeatureCache
+
+MANIFEST_VERSION = 1
+STATE_DIRNAME = ".jobmatch"
+
+# Profiles parsed under different models or dictionaries can't be mixed.
+_FEATURES_VERSION = f"{EMBEDDING_MODEL}/{EMBEDDING_DTYPE}/{SPACY_MODEL}/{SKILLS_DICTIONARY_VERSION}/{EXTRACTOR_VERSION}"
+
+class ManifestEntry(BaseModel):
+    size: int
+    mtime_ns: int
+    sha256: str
+    feature_key: str
+    candidate_id: str
+
+class FailedEntry(BaseModel):
+    size: int
+    mtime_ns: int
+    sha256: str
+    error: str
+
+class Manifest(BaseModel):
+    version: int = MANIFEST_VERSION
+    features_version: str = _FEATURES_VERSION
+    entries: Dict[str, ManifestEntry] = {}
+    # Files that could not be parsed; skipped until they change.
+    failed: Dict[str, FailedEntry] = {}
+
+class SyncStats(NamedTuple):
+    added: int
+    changed: int
+    removed: int
+    unchanged: int
+    failed: int
+    skipped: int = 0  # unchanged files that failed to parse before
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class FolderSync:
+    """Parsed resumes for one folder, kept current across runs.
+
+    A manifest (size, mtime, content hash, feature-cache key and candidate id
+    per file) and a ``CandidatePool`` of the parsed profiles live in
+    ``state_dir`` (default ``<folder>/.jobmatch``). ``sync`` only stats
+    unchanged files; new and modified ones are parsed and deleted ones
+    dropped, so its cost follows the size of the change. Renamed files are
+    recognised by their hash and not re-parsed. Files that fail to parse are
+    remembered the same way and not retried until they change.
+    """
+
+    def __init__(self, folder: str, state_dir: Optional[str] = None):
+        self.folder = Path(folder)
+        self.state_dir = Path(state_dir) if state_dir else self.folder / STATE_DIRNAME
+        self.manifest_path = self.state_dir / "manifest.json"
+        self.pool = CandidatePool(str(self.state_dir / "pool"))
+        self.manifest = self._load()
+
+    def _load(self) -> Manifest:
+        manifest = Manifest()
+        if self.manifest_path.exists():
+            stored = Manifest.model_validate_json(self.manifest_path.read_text())
+            if stored.version == MANIFEST_VERSION and stored.features_version == _FEATURES_VERSION:
+                manifest = stored
+        self.pool.load()
+        # Rows the manifest doesn't know about come from a run that stopped
+        # before saving it (or from an outdated model); they are re-parsed.
+        known = {e.candidate_id for e in manifest.entries.values()}
+        listed = self.pool.list_candidates(0, len(self.pool))
+        self.pool.delete([c["candidate_id"] for c in listed if c["candidate_id"] not in known])
+        live = {c["candidate_id"] for c in listed}
+        manifest.entries = {k: e for k, e in manifest.entries.items() if e.candidate_id in live}
+        return manifest
+
+    def _save(self) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(self.manifest.model_dump_json())
+        os.replace(tmp, self.manifest_path)
+
+    def sync(
+        self,
+        parser: ParserPool,
+        cache: Optional[FeatureCache] = None,
+        failures: Optional[List[ParseFailure]] = None,
+        progress: Optional[Progress] = None,
+        dedup: Optional[Deduplicator] = None,
+    ) -> SyncStats:
+        """Bring the pool in line with the folder; ``dedup`` is passed on to ``parser``."""
+        entries = self.manifest.entries
+        known_bad = self.manifest.failed
+        seen = set()
+        todo: Dict[str, tuple] = {}
+        unchanged = skipped = 0
+        touched = False
+        for path in list_documents(str(self.folder)):
+            name = path.name
+            seen.add(name)
+            st = path.stat()
+            bad_entry = known_bad.get(name)
+            if bad_entry is not None:
+                if (bad_entry.size, bad_entry.mtime_ns) != (st.st_size, st.st_mtime_ns):
+                    digest = _sha256(path)
+                    if bad_entry.sha256 != digest:
+                        del known_bad[name]
+                        todo[name] = (path, st, digest)
+                        touched = True
+                        continue
+                    known_bad[name] = bad_entry.model_copy(update={"size": st.st_size, "mtime_ns": st.st_mtime_ns})
+                    touched = True
+                skipped += 1
+                continue
+            entry = entries.get(name)
+            if entry is not None and (entry.size, entry.mtime_ns) == (st.st_size, st.st_mtime_ns):
+                unchanged += 1
+                continue
+            digest = _sha256(path)
+            if entry is not None and entry.sha256 == digest:
+                # Touched but not modified.
+                entries[name] = entry.model_copy(update={"size": st.st_size, "mtime_ns": st.st_mtime_ns})
+                unchanged += 1
+                touched = True
+                continue
+            todo[name] = (path, st, digest)
+        for name in [n for n in known_bad if n not in seen]:
+            del known_bad[name]
+            touched = True
+
+        changed = [name for name in todo if name in entries]
+        stale = [entries.pop(name).candidate_id for name in changed]
+        gone: Dict[str, List[ManifestEntry]] = {}
+        for name in [n for n in entries if n not in seen]:
+            entry = entries.pop(name)
+            gone.setdefault(entry.sha256, []).append(entry)
+
+        # A new name whose content matches a removed file is a rename.
+        for name in [n for n in todo if n not in changed]:
+            path, st, digest = todo[name]
+            if gone.get(digest):
+                moved = gone[digest].pop()
+                entries[name] = moved.model_copy(update={"size": st.st_size, "mtime_ns": st.st_mtime_ns})
+                del todo[name]
+                unchanged += 1
+                touched = True
+        removed = [e.candidate_id for group in gone.values() for e in group]
+        stale += removed
+
+        names = list(todo)
+        cands, failed = parser.parse([str(todo[n][0]) for n in names], cache=cache, progress=progress, dedup=dedup)
+        if failures is not None:
+            failures.extend(failed)
+        bad = {f.path: f.error for f in failed}
+        ok = [n for n in names if str(todo[n][0]) not in bad]
+        for name in names:
+            path, st, digest = todo[name]
+            if str(path) in bad:
+                known_bad[name] = FailedEntry(size=st.st_size, mtime_ns=st.st_mtime_ns, sha256=digest, error=bad[str(path)])
+        for name, cand in zip(ok, cands):
+            _, st, digest = todo[name]
+            entries[name] = ManifestEntry(
+                size=st.st_size,
+                mtime_ns=st.st_mtime_ns,
+                sha256=digest,
+                feature_key=feature_key(cand.raw_text),
+                candidate_id=cand.candidate_id,
+            )
+
+        self.pool.delete(stale)
+        self.pool.add(cands, ok)
+        if touched or todo or stale:
+            self._save()
+        reparsed = len(set(changed) & set(ok))
+        return SyncStats(
+            added=len(ok) - reparsed,
+            changed=reparsed,
+            # A modified file that no longer parses drops out of the ranking too.
+            removed=len(removed) + len(changed) - reparsed,
+            unchanged=unchanged,
+            failed=len(failed),
+            skipped=skipped,
+        )
+
+    def rank(
+        self,
+        jobs: Sequence[JobProfile],
+        top_n: int = 10,
+        weights: Dict[str, float] | None = None,
+        records: Optional[Sequence[Recorder]] = None,
+    ) -> List[List[MatchResult]]:
+        """Rank the pool for each job; ``records`` get candidate ids, so pass ``lookup=self.pool.get`` to their writers."""
+        records = records or [None] * len(jobs)
+        return [self.pool.match(job, top_n, weights, record) for job, record in zip(jobs, records)]
+
+    def close(self) -> None:
+        self.pool.close()
@@ -1,49 +1,114 @@
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence
 
-from backend.parsing.job_parser import parse_job_profile
-from backend.parsing.resume_parser import parse_resume
-from backend.matching.scoring import compute_component_scores, compute_overall_score
-from backend.matching.explanation import build_rationale
-from backend.models import MatchResult
+from backend.parsing.job_parser import parse_job_profile, parse_job_profiles
+from backend.parsing.resume_parser import ParseFailure
+from backend.parsing.parallel import Progress, parse_resumes_parallel
+from backend.matching.ranking import rank_profiles, rank_profiles_many
+from backend.models import CandidateProfile, JobMatches, MatchResult
+from backend.nlp.dedup import Deduplicator, collapse_duplicates
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.score_run import ScoreRunWriter, score_run_writers
 
-def rank_candidates(job_pdf: str, resumes_dir: str, top_n: int = 10, weights=None) -> List[MatchResult]:
-    job_path = Path(job_pdf)
-    resumes_path = Path(resumes_dir)
+DOCUMENT_SUFFIXES = {".pdf", ".doc", ".docx"}
+
+def list_documents(folder: str, what: str = "resume") -> List[Path]:
+    """PDF/DOCX files directly inside ``folder``."""
+    path = Path(folder)
+    if not path.exists() or not path.is_dir():
+        raise FileNotFoundError(f"{what.capitalize()}s folder not found or not a directory: {path.resolve()}")
+    files = list(path.glob("*"))
+    if not files:
+        raise FileNotFoundError(f"No {what} files found in folder: {path.resolve()}")
+    return [p for p in files if p.suffix.lower() in DOCUMENT_SUFFIXES]
+
+def _parse_resumes(
+    resume_paths: List[str],
+    cache: Optional[FeatureCache],
+    workers: int,
+    failures: Optional[List[ParseFailure]],
+    lean: bool = False,
+    progress: Optional[Progress] = None,
+    dedup: Optional[Deduplicator] = None,
+    collapse: bool = False,
+) -> List[CandidateProfile]:
+    candidates, failed = parse_resumes_parallel(
+        resume_paths, workers, cache=cache, lean=lean, progress=progress, dedup=dedup
+    )
+    if failures is None and failed:
+        raise RuntimeError(failed[0].error)
+    if failures is not None:
+        failures.extend(failed)
+    return collapse_duplicates(candidates) if collapse else candidates
 
+def rank_candidates(
+    job_pdf: str,
+    resumes_dir: str,
+    top_n: int = 10,
+    weights=None,
+    cache: Optional[FeatureCache] = None,
+    workers: int = 1,
+    failures: Optional[List[ParseFailure]] = None,
+    lean: bool = False,
+    save_scores: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    dedup: Optional[Deduplicator] = None,
+    collapse_duplicates: bool = False,
+) -> List[MatchResult]:
+    """Rank the resumes in ``resumes_dir`` against the job profile in ``job_pdf``.
+
+    Resumes are parsed across ``workers`` processes. If ``failures`` is given,
+    unreadable files are appended to it and skipped; otherwise the first one
+    raises. ``lean`` drops resume text once features are extracted.
+    ``save_scores`` writes every candidate's component scores to that
+    directory for re-ranking under other weights (see ``ScoreRun``), and
+    ``progress(done, total)`` is called as resumes are parsed. With ``dedup``
+    duplicate resumes reuse the first copy's features;
+    ``collapse_duplicates`` also leaves them out of the ranking.
+    """
+    job_path = Path(job_pdf)
     if not job_path.exists():
         raise FileNotFoundError(f"Job profile file not found: {job_path.resolve()}")
-    if not resumes_path.exists() or not resumes_path.is_dir():
-        raise FileNotFoundError(f"Resumes folder not found or not a directory: {resumes_path.resolve()}")
-
-    job = parse_job_profile(str(job_path))
-
-    results: List[MatchResult] = []
-    resume_files = list(resumes_path.glob("*"))
-    if not resume_files:
-        raise FileNotFoundError(f"No resume files found in folder: {resumes_path.resolve()}")
-
-    for path in resume_files:
-        if path.suffix.lower() not in {".pdf", ".doc", ".docx"}:
-            continue
-        cand = parse_resume(str(path))
-
-        comps, matched, missing_req, missing_pref = compute_component_scores(job, cand)
-        fit = compute_overall_score(comps, weights)
-        rationale = build_rationale(job, cand, comps, matched, missing_req, missing_pref)
-
-        results.append(
-            MatchResult(
-                candidate_id=cand.candidate_id,
-                name=cand.name,
-                fit_score_0_100=round(fit, 2),
-                components=comps,
-                matched_skills=matched,
-                missing_required_skills=missing_req,
-                nice_to_have_missing_skills=missing_pref,
-                rationale=rationale,
-            )
-        )
-
-    results.sort(key=lambda r: r.fit_score_0_100, reverse=True)
-    return results[:top_n]
+    resume_paths = [str(p) for p in list_documents(resumes_dir)]
+
+    job = parse_job_profile(str(job_path), cache=cache)
+    candidates = _parse_resumes(resume_paths, cache, workers, failures, lean, progress, dedup, collapse_duplicates)
+    writer = ScoreRunWriter(job, save_scores) if save_scores else None
+    ranked = rank_profiles(job, candidates, top_n, weights, writer.add if writer else None)
+    if writer is not None:
+        writer.close()
+    return ranked
+
+def rank_candidates_batch(
+    job_paths: Sequence[str],
+    resumes_dir: str,
+    top_n: int = 10,
+    weights=None,
+    cache: Optional[FeatureCache] = None,
+    workers: int = 1,
+    failures: Optional[List[ParseFailure]] = None,
+    lean: bool = False,
+    save_scores: Optional[str] = None,
+    progress: Optional[Progress] = None,
+    dedup: Optional[Deduplicator] = None,
+    collapse_duplicates: bool = False,
+) -> List[JobMatches]:
+    """Rank one resume folder against many job profiles.
+
+    Resumes are parsed once and every job is scored against the whole pool in
+    a single pass; see ``rank_candidates`` for ``workers``, ``failures``,
+    ``lean``, ``progress``, ``dedup`` and ``collapse_duplicates``. With
+    ``save_scores`` each job's run goes to a subdirectory named after its file.
+    """
+    for p in job_paths:
+        if not Path(p).exists():
+            raise FileNotFoundError(f"Job profile file not found: {Path(p).resolve()}")
+    resume_paths = [str(p) for p in list_documents(resumes_dir)]
+
+    jobs = parse_job_profiles(job_paths, cache=cache)
+    candidates = _parse_resumes(resume_paths, cache, workers, failures, lean, progress, dedup, collapse_duplicates)
+    writers = score_run_writers(save_scores, jobs, [Path(p).name for p in job_paths]) if save_scores else []
+    ranked = rank_profiles_many(jobs, candidates, top_n, weights, [w.add for w in writers] or None)
+    for w in writers:
+        w.close()
+    return [JobMatches(job=Path(p).name, matches=r) for p, r in zip(job_paths, ranked)]
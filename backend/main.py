@@ -1,56 +1,325 @@
-from fastapi import FastAPI, UploadFile, File
-from typing import List
-import tempfile
-import shutil
-from pathlib import Path
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import List, Optional, Tuple
+import asyncio
+import time
+import uuid
+from urllib.parse import quote
 
-from backend.parsing.job_parser import parse_job_profile
-from backend.parsing.resume_parser import parse_resume
-from backend.matching.scoring import compute_component_scores, compute_overall_score
-from backend.matching.explanation import build_rationale
-from backend.models import MatchResult
+from backend import timing
+from backend.config import (
+    API_THREADS, JOB_CACHE_TTL_SECONDS, METRICS_ENABLED, PARSE_WORKERS, SCORE_RUN_CACHE_SIZE, WARM_UP_MODELS,
+)
+from backend.nlp.features import warm_up
+from backend.parsing.job_parser import parse_job_uploads
+from backend.parsing.parallel import MAX_CHUNK, PROGRESS_CHUNK, ParserPool
+from backend.matching.ranking import TopN, build_match_result, push_scored, rank_profiles, rank_profiles_many
+from backend.models import (
+    CandidateProfile, JobMatches, JobProfile, MatchResult, RerankRequest, StreamDone, StreamProgress, StreamResult,
+    StreamSkipped, WeightedMatches,
+)
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.candidate_pool import CandidatePool
+from backend.storage.job_cache import JobCache, TTLCache
+from backend.storage.score_run import ScoreRun, ScoreRunWriter, resolve_weights
+from backend.streaming import ndjson_line
 
-app = FastAPI(title="AI-Based Job Profile and Resume Matching API (Kaggle-ready)")
+request_timings = timing.Histograms()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Caches, pools and threads live on app.state and are created here rather
+    # than at import, so importing the app (tests, tools) stays cheap.
+    if METRICS_ENABLED:
+        timing.enable()
+    state = app.state
+    state.feature_cache = FeatureCache()
+    state.job_cache = JobCache()
+    state.score_runs: TTLCache[ScoreRun] = TTLCache(SCORE_RUN_CACHE_SIZE, JOB_CACHE_TTL_SECONDS)
+    state.candidate_pool = CandidatePool()
+    state.parser_pool = ParserPool(PARSE_WORKERS)
+    # Parsing, NLP and scoring are CPU-bound; they run here so the event loop
+    # keeps serving other requests. Calls into the shared spaCy pipeline and
+    # encoder are serialized (see nlp/); text extraction and scoring overlap.
+    state.cpu_executor = ThreadPoolExecutor(max_workers=API_THREADS, thread_name_prefix="jobmatch")
+    # Models load lazily everywhere else; API workers pay that cost up front
+    # so the first request isn't the slow one.
+    if WARM_UP_MODELS:
+        warm_up()
+        state.parser_pool.warm_up()
+    state.candidate_pool.load()
+    try:
+        yield
+    finally:
+        state.parser_pool.close()
+        state.candidate_pool.close()
+        state.cpu_executor.shutdown()
+        state.feature_cache.close()
+
+app = FastAPI(title="AI-Based Job Profile and Resume Matching API (Kaggle-ready)", lifespan=lifespan)
+
+@app.middleware("http")
+async def time_requests(request: Request, call_next):
+    if not METRICS_ENABLED:
+        return await call_next(request)
+    start = time.perf_counter()
+    response = await call_next(request)
+    # The route template, not the raw path, so ids don't explode label cardinality.
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    request_timings.observe((request.method, path, str(response.status_code)), time.perf_counter() - start)
+    return response
+
+async def _run_cpu(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(app.state.cpu_executor, fn, *args)
+
+@app.post("/jobs")
+async def register_job(job_file: UploadFile = File(...)):
+    """Parse and cache a job profile; pass the returned ``job_id`` to /match."""
+    [job_id], [job] = await _load_jobs([job_file])
+    return {"job_id": job_id, "title": job.title, "required_skills": job.required_skills}
 
 @app.post("/match", response_model=List[MatchResult])
 async def match_candidates(
-    job_file: UploadFile = File(...),
+    response: Response,
+    job_file: Optional[UploadFile] = File(None),
+    resume_files: List[UploadFile] = File(...),
+    top_n: int = 10,
+    job_id: Optional[str] = None,
+    keep_run: bool = False,
+):
+    """Rank uploaded resumes; with ``keep_run`` the scores are kept for /rerank (``X-Run-Id``)."""
+    if job_file is None:
+        job = _cached_job(job_id)
+        candidates = await _load_candidates(response, resume_files)
+    else:
+        ([job_id], [job]), candidates = await asyncio.gather(
+            _load_jobs([job_file]), _load_candidates(response, resume_files)
+        )
+    response.headers["X-Job-Id"] = job_id
+    writer = ScoreRunWriter(job) if keep_run else None
+    ranked = await _run_cpu(rank_profiles, job, candidates, top_n, None, writer.add if writer else None)
+    if writer is not None:
+        response.headers["X-Run-Id"] = _keep_run(writer)
+    return ranked
+
+@app.post("/match/stream")
+async def match_candidates_stream(
+    job_file: Optional[UploadFile] = File(None),
     resume_files: List[UploadFile] = File(...),
     top_n: int = 10,
+    job_id: Optional[str] = None,
+    keep_run: bool = False,
 ):
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-        job_path = tmpdir_path / job_file.filename
-        with open(job_path, "wb") as f:
-            shutil.copyfileobj(job_file.file, f)
-
-        resume_paths = []
-        for rf in resume_files:
-            rp = tmpdir_path / rf.filename
-            with open(rp, "wb") as f:
-                shutil.copyfileobj(rf.file, f)
-            resume_paths.append(rp)
-
-        job = parse_job_profile(str(job_path))
-
-        results: List[MatchResult] = []
-        for rp in resume_paths:
-            cand = parse_resume(str(rp))
-            comps, matched, missing_req, missing_pref = compute_component_scores(job, cand)
-            fit = compute_overall_score(comps)
-            rationale = build_rationale(job, cand, comps, matched, missing_req, missing_pref)
-            results.append(
-                MatchResult(
-                    candidate_id=cand.candidate_id,
-                    name=cand.name,
-                    fit_score_0_100=round(fit, 2),
-                    components=comps,
-                    matched_skills=matched,
-                    missing_required_skills=missing_req,
-                    nice_to_have_missing_skills=missing_pref,
-                    rationale=rationale,
-                )
-            )
-
-        results.sort(key=lambda r: r.fit_score_0_100, reverse=True)
-        return results[:top_n]
+    """``/match`` as NDJSON (see ``backend.streaming``).
+
+    Progress records are sent while resumes are parsed, then one record per
+    result as it is built; skipped uploads are reported in the stream rather
+    than a header, and with ``keep_run`` the final ``done`` record carries
+    the ``run_id``.
+    """
+    if job_file is None:
+        job = _cached_job(job_id)
+    else:
+        [job_id], [job] = await _load_jobs([job_file])
+    uploads = await _read_uploads(resume_files)
+    return StreamingResponse(
+        _stream_match(job, job_id, uploads, top_n, keep_run),
+        media_type="application/x-ndjson",
+        headers={"X-Job-Id": job_id},
+    )
+
+async def _stream_match(job: JobProfile, job_id: str, uploads: List[Tuple[str, bytes]], top_n: int, keep_run: bool):
+    candidates: List[CandidateProfile] = []
+    failed = []
+    step = max(PROGRESS_CHUNK, MAX_CHUNK * PARSE_WORKERS)
+    for i in range(0, len(uploads), step):
+        ok, bad = await _run_cpu(
+            app.state.parser_pool.parse_uploads, uploads[i : i + step], True, app.state.feature_cache
+        )
+        candidates.extend(ok)
+        failed.extend(bad)
+        yield ndjson_line(StreamProgress(stage="parse", done=min(i + step, len(uploads)), total=len(uploads)))
+    for f in failed:
+        yield ndjson_line(StreamSkipped(path=f.path, error=f.error))
+
+    top: TopN[CandidateProfile] = TopN(top_n)
+    writer = ScoreRunWriter(job) if keep_run else None
+    await _run_cpu(push_scored, top, job, candidates, None, writer.add if writer else None)
+    run_id = _keep_run(writer) if writer is not None else None
+    winners = top.items()
+    for rank, (_, cand) in enumerate(winners, 1):
+        match = await _run_cpu(build_match_result, job, cand)
+        yield ndjson_line(StreamResult(rank=rank, match=match))
+    yield ndjson_line(StreamDone(results=len(winners), skipped=len(failed), job_id=job_id, run_id=run_id))
+
+@app.post("/match/batch", response_model=List[JobMatches])
+async def match_candidates_batch(
+    response: Response,
+    job_files: List[UploadFile] = File([]),
+    resume_files: List[UploadFile] = File(...),
+    top_n: int = 10,
+    job_ids: List[str] = Query([]),
+):
+    """Rank the same resumes against several jobs, parsing each resume once.
+
+    Jobs given by ``job_ids`` come first, labelled by id, followed by the
+    uploaded ``job_files``, labelled by filename.
+    """
+    if not job_files and not job_ids:
+        raise HTTPException(status_code=400, detail="Upload job_files or pass job_ids from POST /jobs")
+    cached = [_cached_job(i) for i in job_ids]
+    (upload_ids, uploaded), candidates = await asyncio.gather(
+        _load_jobs(job_files), _load_candidates(response, resume_files)
+    )
+    jobs = cached + uploaded
+    labels = list(job_ids) + [f.filename for f in job_files]
+    response.headers["X-Job-Ids"] = ",".join(list(job_ids) + upload_ids)
+    ranked = await _run_cpu(rank_profiles_many, jobs, candidates, top_n)
+    return [JobMatches(job=label, matches=r) for label, r in zip(labels, ranked)]
+
+@app.post("/rerank", response_model=List[WeightedMatches])
+async def rerank(request: RerankRequest):
+    """Rank a previous /match or /pool/match run again under other weights.
+
+    Nothing is parsed or re-scored: each weight configuration is applied to
+    the run's stored component scores.
+    """
+    run = app.state.score_runs.get(request.run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired run_id '{request.run_id}'; match again")
+    try:
+        weights = [resolve_weights(w) for w in request.weights]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        ranked = await _run_cpu(run.rerank, weights, request.top_n)
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return [WeightedMatches(weights=w, matches=r) for w, r in zip(weights, ranked)]
+
+def _keep_run(writer: ScoreRunWriter) -> str:
+    """Store a finished run for /rerank; returns its ``run_id``."""
+    run_id = uuid.uuid4().hex
+    app.state.score_runs.put(run_id, writer.close())
+    return run_id
+
+async def _read_uploads(files: List[UploadFile]) -> List[Tuple[str, bytes]]:
+    data = await asyncio.gather(*(f.read() for f in files))
+    return [(f.filename, d) for f, d in zip(files, data)]
+
+def _cached_job(job_id: Optional[str]) -> JobProfile:
+    if job_id is None:
+        raise HTTPException(status_code=400, detail="Upload a job_file or pass a job_id from POST /jobs")
+    job = app.state.job_cache.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job_id '{job_id}'; upload the job file again")
+    return job
+
+async def _load_jobs(files: List[UploadFile]) -> Tuple[List[str], List[JobProfile]]:
+    """Job ids and profiles for uploaded job files; only cache misses are parsed."""
+    uploads = await _read_uploads(files)
+    ids = [JobCache.key(data) for _, data in uploads]
+    jobs = [app.state.job_cache.get(i) for i in ids]
+    missing = [k for k, job in enumerate(jobs) if job is None]
+    if missing:
+        parsed = await _run_cpu(parse_job_uploads, [uploads[k] for k in missing], app.state.feature_cache)
+        for k, job in zip(missing, parsed):
+            app.state.job_cache.put(ids[k], job)
+            jobs[k] = job
+    return ids, jobs
+
+async def _load_candidates(response: Response, files: List[UploadFile]) -> List[CandidateProfile]:
+    return (await _parse_candidates(response, files))[1]
+
+async def _parse_candidates(response: Response, files: List[UploadFile]) -> Tuple[List[str], List[CandidateProfile]]:
+    """Parsed resumes and the filenames they came from."""
+    uploads = await _read_uploads(files)
+    candidates, failed = await _run_cpu(app.state.parser_pool.parse_uploads, uploads, True, app.state.feature_cache)
+    if failed:
+        # Unreadable uploads are skipped and named in a header so the rest
+        # of the batch is still ranked.
+        response.headers["X-Failed-Files"] = ",".join(quote(f.path) for f in failed)
+    # Parsed profiles keep upload order, minus the failures.
+    skip = Counter(f.path for f in failed)
+    sources = []
+    for name, _ in uploads:
+        if skip[name]:
+            skip[name] -= 1
+        else:
+            sources.append(name)
+    return sources, candidates
+
+@app.post("/pool/candidates")
+async def add_pool_candidates(response: Response, resume_files: List[UploadFile] = File(...)):
+    """Parse resumes once and keep them in the server-side pool."""
+    sources, candidates = await _parse_candidates(response, resume_files)
+    ids = await _run_cpu(app.state.candidate_pool.add, candidates, sources)
+    return [{"candidate_id": i, "source": src} for i, src in zip(ids, sources)]
+
+@app.get("/pool/candidates")
+def list_pool_candidates(offset: int = 0, limit: int = 100):
+    pool = app.state.candidate_pool
+    return {"total": len(pool), "candidates": pool.list_candidates(offset, limit)}
+
+@app.delete("/pool/candidates/{candidate_id}")
+def delete_pool_candidate(candidate_id: str):
+    if not app.state.candidate_pool.delete([candidate_id]):
+        raise HTTPException(status_code=404, detail=f"Candidate '{candidate_id}' is not in the pool")
+    return {"deleted": candidate_id}
+
+@app.post("/pool/match", response_model=List[MatchResult])
+async def match_pool(
+    response: Response,
+    job_file: Optional[UploadFile] = File(None),
+    top_n: int = 10,
+    job_id: Optional[str] = None,
+    keep_run: bool = False,
+):
+    """Rank the stored pool against a job; nothing but the job is uploaded.
+
+    With ``keep_run`` the run's component scores and candidate ids are kept
+    for /rerank, which looks the winners up in the pool again.
+    """
+    if job_file is None:
+        job = _cached_job(job_id)
+    else:
+        [job_id], [job] = await _load_jobs([job_file])
+    response.headers["X-Job-Id"] = job_id
+    writer = ScoreRunWriter(job, lookup=_pool_profile) if keep_run else None
+    ranked = await _run_cpu(app.state.candidate_pool.match, job, top_n, None, writer.add if writer else None)
+    if writer is not None:
+        response.headers["X-Run-Id"] = _keep_run(writer)
+    return ranked
+
+def _pool_profile(candidate_id: str) -> CandidateProfile:
+    cand = app.state.candidate_pool.get(candidate_id)
+    if cand is None:
+        raise LookupError(f"Candidate '{candidate_id}' has been removed from the pool since this run; match again")
+    return cand
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text format: request latency and time per pipeline stage."""
+    lines = request_timings.prometheus(
+        "jobmatch_request_duration_seconds", ("method", "path", "status"), "HTTP request latency."
+    )
+    lines += timing.stages.prometheus(
+        "jobmatch_stage_duration_seconds", ("stage",), "Time spent in each pipeline stage."
+    )
+    lines += timing.counters.prometheus(
+        "jobmatch_pipeline_total", "name", "Running totals, e.g. pages and characters extracted."
+    )
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/cache/stats")
+def cache_stats():
+    state = app.state
+    return {
+        "features": state.feature_cache.stats(),
+        "jobs": state.job_cache.stats(),
+        "score_runs": state.score_runs.stats(),
+    }
@@ -0,0 +1,144 @@
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from backend.models import JobProfile
+from backend.matching.batch_scoring import CandidateMatrix, batch_skill_match
+
+# Rows normalized/assigned per step so the pool never has to fit in memory twice.
+_ASSIGN_CHUNK = 65536
+
+def _unit_rows(embeddings: np.ndarray, norms: np.ndarray) -> np.ndarray:
+    safe = np.where(norms == 0, 1.0, norms).astype(np.float32)
+    return np.asarray(embeddings, dtype=np.float32) / safe[:, None]
+
+def _assign(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return np.argmax(x @ centroids.T, axis=1).astype(np.int32)
+
+def _kmeans(x: np.ndarray, n_lists: int, n_iter: int, rng: np.random.Generator) -> np.ndarray:
+    """Spherical k-means: centroids are unit vectors, similarity is the dot product."""
+    centroids = x[rng.choice(len(x), n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        assign = _assign(x, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=n_lists)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        sums = np.add.reduceat(x[order], starts, axis=0)
+        lengths = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids[filled] = sums / np.where(lengths == 0, 1.0, lengths)
+        # Re-seed empty lists from random points so every list stays in use.
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            centroids[empty] = x[rng.choice(len(x), len(empty), replace=False)]
+    return centroids
+
+class IVFIndex:
+    """Inverted-file ANN index over cosine similarity.
+
+    Candidates are partitioned by their nearest k-means centroid; a query
+    scans only the ``n_probe`` lists whose centroids are closest to it. More
+    lists make each probe cheaper, more probes raise recall.
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        norms: np.ndarray,
+        n_lists: Optional[int] = None,
+        n_iter: int = 10,
+        sample_per_list: int = 256,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        n = len(embeddings)
+        if n == 0:
+            raise ValueError("Cannot build an ANN index over an empty pool")
+        n_lists = min(n, n_lists or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+
+        sample = np.sort(rng.choice(n, min(n, n_lists * sample_per_list), replace=False))
+        centroids = _kmeans(_unit_rows(embeddings[sample], norms[sample]), n_lists, n_iter, rng)
+
+        assign = np.empty(n, dtype=np.int32)
+        for start in range(0, n, _ASSIGN_CHUNK):
+            stop = start + _ASSIGN_CHUNK
+            assign[start:stop] = _assign(_unit_rows(embeddings[start:stop], norms[start:stop]), centroids)
+
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))]).astype(np.int64)
+        return cls(centroids, order, offsets)
+
+    def search(
+        self,
+        embeddings: np.ndarray,
+        norms: np.ndarray,
+        query: np.ndarray,
+        k: int,
+        n_probe: int = 8,
+    ) -> np.ndarray:
+        """Row ids of (approximately) the ``k`` rows most cosine-similar to ``query``."""
+        q = np.asarray(query, dtype=np.float32)
+        q_norm = np.linalg.norm(q)
+        if q_norm == 0 or k <= 0:
+            return np.zeros(0, dtype=np.int64)
+        q = q / q_norm
+
+        probe = np.argsort(-(self.centroids @ q))[: max(1, n_probe)]
+        rows = np.concatenate([self.order[self.offsets[p] : self.offsets[p + 1]] for p in probe])
+        if len(rows) == 0:
+            return rows
+        rows.sort()
+        sims = (np.asarray(embeddings[rows], dtype=np.float32) @ q) / np.where(norms[rows] == 0, 1.0, norms[rows])
+        if len(rows) > k:
+            keep = np.argpartition(-sims, k - 1)[:k]
+            rows = rows[keep]
+        return np.sort(rows)
+
+    def save(self, index_dir: str) -> None:
+        d = Path(index_dir)
+        np.save(d / "ivf_centroids.npy", self.centroids)
+        np.save(d / "ivf_order.npy", self.order)
+        np.save(d / "ivf_offsets.npy", self.offsets)
+
+    @classmethod
+    def load(cls, index_dir: str) -> Optional["IVFIndex"]:
+        d = Path(index_dir)
+        if not (d / "ivf_centroids.npy").exists():
+            return None
+        return cls(
+            np.load(d / "ivf_centroids.npy"),
+            np.load(d / "ivf_order.npy", mmap_mode="r"),
+            np.load(d / "ivf_offsets.npy"),
+        )
+
+def shortlist(
+    job: JobProfile,
+    matrix: CandidateMatrix,
+    ivf: IVFIndex,
+    k: int,
+    n_probe: int = 8,
+    skill_floor: float = 0.75,
+) -> np.ndarray:
+    """Rows worth scoring in full for ``job``.
+
+    The union of the ``k`` approximate semantic neighbours of the job and every
+    candidate whose skill match is at least ``skill_floor`` (only applied when
+    the job lists required skills, since otherwise everyone scores 1.0).
+    """
+    rows = np.zeros(0, dtype=np.int64)
+    if job.embedding is not None:
+        rows = ivf.search(matrix.embeddings, matrix.norms, np.asarray(job.embedding), k, n_probe)
+    if job.required_skills:
+        strong = np.flatnonzero(batch_skill_match(job, matrix) >= skill_floor)
+        rows = np.union1d(rows, strong)
+    return rows
@@ -0,0 +1,267 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+
+from backend.models import JobProfile, CandidateProfile
+from backend.config import DEFAULT_WEIGHTS
+from backend.nlp.taxonomy import TAXONOMY
+from backend.timing import span, timed
+
+COMPONENTS = (
+    "skill_match",
+    "experience_alignment",
+    "education_match",
+    "certifications_match",
+    "semantic_similarity",
+)
+
+# Rows per chunk when upcasting float32 embeddings for the float64 dot product.
+_DOT_CHUNK = 16384
+
+def pack_bitsets(rows: Sequence[Iterable[int]], width: int) -> np.ndarray:
+    """Pack per-row id sets into an (N, ceil(width / 8)) uint8 bitset matrix."""
+    bits = np.zeros((len(rows), (width + 7) // 8), dtype=np.uint8)
+    row_idx = [i for i, ids in enumerate(rows) for _ in ids]
+    col_idx = [j for ids in rows for j in ids]
+    if col_idx:
+        r = np.asarray(row_idx, dtype=np.intp)
+        c = np.asarray(col_idx, dtype=np.intp)
+        np.bitwise_or.at(bits, (r, c >> 3), (0x80 >> (c & 7)).astype(np.uint8))
+    return bits
+
+def bitset_column(bits: np.ndarray, j: int) -> np.ndarray:
+    return (bits[:, j >> 3] & (0x80 >> (j & 7))) != 0
+
+def bitset_any(bits: np.ndarray, cols: Iterable[int]) -> np.ndarray:
+    """Rows with at least one of ``cols`` set, in one pass over the touched bytes."""
+    mask = pack_bitsets([list(cols)], bits.shape[1] * 8)[0]
+    touched = np.flatnonzero(mask)
+    if len(touched) == 0:
+        return np.zeros(bits.shape[0], dtype=bool)
+    return (bits[:, touched] & mask[touched]).any(axis=1)
+
+def bitset_rows(bits: np.ndarray, width: int) -> List[List[int]]:
+    """Inverse of ``pack_bitsets``."""
+    dense = np.unpackbits(bits, axis=1, count=width).astype(bool)
+    return [np.flatnonzero(row).tolist() for row in dense]
+
+def _index_rows(values: Sequence[Iterable[str]], vocab: List[str]) -> List[List[int]]:
+    lookup = {v: i for i, v in enumerate(vocab)}
+    return [sorted({lookup[v] for v in vs}) for vs in values]
+
+class CandidateMatrix:
+    """Column-oriented view of a candidate pool for vectorized scoring.
+
+    Skills, degrees and certifications are packed bitsets over their own
+    vocabularies, experience is a float array with NaN for unknown, and
+    embeddings are kept as float32 rows together with their norms.
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        names: List[Optional[str]],
+        embeddings: np.ndarray,
+        norms: np.ndarray,
+        experience: np.ndarray,
+        skill_vocab: List[str],
+        skill_bits: np.ndarray,
+        degree_vocab: List[str],
+        degree_bits: np.ndarray,
+        cert_vocab: List[str],
+        cert_bits: np.ndarray,
+    ):
+        self.ids = ids
+        self.names = names
+        self.embeddings = embeddings
+        self.norms = norms
+        self.experience = experience
+        self.skill_vocab = skill_vocab
+        self.skill_bits = skill_bits
+        self.degree_vocab = degree_vocab
+        self.degree_bits = degree_bits
+        self.cert_vocab = cert_vocab
+        self.cert_bits = cert_bits
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_profiles(cls, cands: Sequence[CandidateProfile]) -> "CandidateMatrix":
+        skills = [set(c.skills) for c in cands]
+        degrees = [{e.degree for e in c.education if e.degree} for c in cands]
+        certs = [set(c.certifications) for c in cands]
+        skill_vocab = sorted(set().union(*skills))
+        degree_vocab = sorted(set().union(*degrees))
+        cert_vocab = sorted(set().union(*certs))
+
+        dim = max((len(c.embedding) for c in cands if c.embedding is not None), default=0)
+        embeddings = np.zeros((len(cands), dim), dtype=np.float32)
+        for i, c in enumerate(cands):
+            if c.embedding is not None:
+                embeddings[i] = c.embedding
+        norms = np.linalg.norm(embeddings.astype(np.float64), axis=1)
+
+        experience = np.array(
+            [np.nan if c.total_years_experience is None else c.total_years_experience for c in cands],
+            dtype=np.float64,
+        )
+
+        return cls(
+            ids=[c.candidate_id for c in cands],
+            names=[c.name for c in cands],
+            embeddings=embeddings,
+            norms=norms,
+            experience=experience,
+            skill_vocab=skill_vocab,
+            skill_bits=pack_bitsets(_index_rows(skills, skill_vocab), len(skill_vocab)),
+            degree_vocab=degree_vocab,
+            degree_bits=pack_bitsets(_index_rows(degrees, degree_vocab), len(degree_vocab)),
+            cert_vocab=cert_vocab,
+            cert_bits=pack_bitsets(_index_rows(certs, cert_vocab), len(cert_vocab)),
+        )
+
+    def take(self, rows: Sequence[int]) -> "CandidateMatrix":
+        rows = np.asarray(rows, dtype=np.intp)
+        return CandidateMatrix(
+            ids=[self.ids[i] for i in rows],
+            names=[self.names[i] for i in rows],
+            embeddings=self.embeddings[rows],
+            norms=self.norms[rows],
+            experience=self.experience[rows],
+            skill_vocab=self.skill_vocab,
+            skill_bits=self.skill_bits[rows],
+            degree_vocab=self.degree_vocab,
+            degree_bits=self.degree_bits[rows],
+            cert_vocab=self.cert_vocab,
+            cert_bits=self.cert_bits[rows],
+        )
+
+def _count_present(bits: np.ndarray, vocab: List[str], wanted: Iterable[str]) -> np.ndarray:
+    lookup = {v: i for i, v in enumerate(vocab)}
+    count = np.zeros(bits.shape[0], dtype=np.int64)
+    for w in set(wanted):
+        if w in lookup:
+            count += bitset_column(bits, lookup[w])
+    return count
+
+def batch_skill_match(job: JobProfile, m: CandidateMatrix) -> np.ndarray:
+    job_required = set(job.required_skills)
+    if not job_required:
+        return np.ones(len(m))
+    covered = np.zeros(len(m), dtype=np.int64)
+    lookup = {cs: j for j, cs in enumerate(m.skill_vocab)}
+    unknown = [(j, cs) for j, cs in enumerate(m.skill_vocab) if cs not in TAXONOMY]
+    for js in job_required:
+        # Same exact-or-substring rule as skill_match_score: taxonomy skills
+        # come from the precomputed relation, anything else is tested directly.
+        cols = {lookup[cs] for cs in TAXONOMY.covers(js) if cs in lookup}
+        cols.update(j for j, cs in unknown if js in cs or cs in js)
+        covered += bitset_any(m.skill_bits, cols)
+    return covered / len(job_required)
+
+def batch_experience_alignment(job: JobProfile, m: CandidateMatrix) -> np.ndarray:
+    if job.min_years_experience is None:
+        return np.full(len(m), 0.5)
+    if job.min_years_experience <= 0:
+        scores = np.ones(len(m))
+    else:
+        scores = np.clip(m.experience / job.min_years_experience, 0.0, 1.0)
+    return np.where(np.isnan(m.experience), 0.5, scores)
+
+def batch_education_match(job: JobProfile, m: CandidateMatrix) -> np.ndarray:
+    if not job.education_requirements:
+        return np.ones(len(m))
+    has_degree = m.degree_bits.any(axis=1)
+    overlap = _count_present(m.degree_bits, m.degree_vocab, job.education_requirements)
+    return np.where(has_degree, overlap / len(job.education_requirements), 0.0)
+
+def batch_certifications_match(job: JobProfile, m: CandidateMatrix) -> np.ndarray:
+    if not job.certifications_required:
+        return np.ones(len(m))
+    overlap = _count_present(m.cert_bits, m.cert_vocab, job.certifications_required)
+    return overlap / len(job.certifications_required)
+
+def batch_semantic_similarity(job: JobProfile, m: CandidateMatrix) -> np.ndarray:
+    scores = np.zeros(len(m))
+    if job.embedding is None or m.embeddings.shape[1] == 0:
+        return scores
+    j = np.asarray(job.embedding, dtype=np.float64)
+    j_norm = np.linalg.norm(j)
+    if j_norm == 0:
+        return scores
+    for start in range(0, len(m), _DOT_CHUNK):
+        chunk = m.embeddings[start : start + _DOT_CHUNK].astype(np.float64)
+        scores[start : start + len(chunk)] = chunk @ j
+    nonzero = m.norms != 0
+    scores[nonzero] /= m.norms[nonzero] * j_norm
+    scores[~nonzero] = 0.0
+    return scores
+
+@timed("batch_semantic_matrix")
+def batch_semantic_matrix(jobs: Sequence[JobProfile], m: CandidateMatrix) -> np.ndarray:
+    """(M, N) cosine similarity of every job against every candidate.
+
+    All jobs are stacked into one matrix so the pool is multiplied once
+    (chunked, in float64) instead of once per job.
+    """
+    scores = np.zeros((len(jobs), len(m)))
+    dim = m.embeddings.shape[1]
+    if dim == 0:
+        return scores
+    j = np.zeros((len(jobs), dim))
+    for i, job in enumerate(jobs):
+        if job.embedding is not None:
+            j[i] = job.embedding
+    j_norms = np.linalg.norm(j, axis=1)
+    for start in range(0, len(m), _DOT_CHUNK):
+        chunk = m.embeddings[start : start + _DOT_CHUNK].astype(np.float64)
+        scores[:, start : start + len(chunk)] = j @ chunk.T
+    denom = np.outer(j_norms, m.norms)
+    nonzero = denom != 0
+    scores[nonzero] /= denom[nonzero]
+    scores[~nonzero] = 0.0
+    return scores
+
+@timed("score_candidates")
+def score_candidates(job: JobProfile, m: CandidateMatrix) -> Dict[str, np.ndarray]:
+    """All five component scores for every candidate in ``m``.
+
+    Each column matches what ``compute_component_scores`` returns for the
+    corresponding candidate.
+    """
+    return {
+        "skill_match": batch_skill_match(job, m),
+        "experience_alignment": batch_experience_alignment(job, m),
+        "education_match": batch_education_match(job, m),
+        "certifications_match": batch_certifications_match(job, m),
+        "semantic_similarity": batch_semantic_similarity(job, m),
+    }
+
+def score_jobs(jobs: Sequence[JobProfile], m: CandidateMatrix) -> Iterator[Dict[str, np.ndarray]]:
+    """``score_candidates`` for each job in turn, sharing one semantic matrix product.
+
+    Columns are yielded per job so only the (M, N) semantic block and one
+    job's other columns are alive at a time.
+    """
+    semantic = batch_semantic_matrix(jobs, m)
+    for i, job in enumerate(jobs):
+        with span("score_jobs"):
+            columns = {
+                "skill_match": batch_skill_match(job, m),
+                "experience_alignment": batch_experience_alignment(job, m),
+                "education_match": batch_education_match(job, m),
+                "certifications_match": batch_certifications_match(job, m),
+                "semantic_similarity": semantic[i],
+            }
+        yield columns
+
+def overall_scores(columns: Dict[str, np.ndarray], weights: Dict[str, float] | None = None) -> np.ndarray:
+    w = weights or DEFAULT_WEIGHTS
+    total = (
+        columns["skill_match"] * w["skill_match"]
+        + columns["experience_alignment"] * w["experience_alignment"]
+        + columns["education_match"] * w["education_match"]
+        + columns["certifications_match"] * w["certifications_match"]
+        + columns["semantic_similarity"] * w["semantic_similarity"]
+    )
+    return total * 100.0
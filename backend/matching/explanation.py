@@ -1,5 +1,7 @@
 from backend.models import JobProfile, CandidateProfile, MatchComponentScore
+from backend.timing import timed
 
+@timed("build_rationale")
 def build_rationale(
     job: JobProfile,
     cand: CandidateProfile,
@@ -0,0 +1,194 @@
+from typing import Any, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+import heapq
+import numpy as np
+
+from backend.models import JobProfile, CandidateProfile, MatchComponentScore, MatchResult
+from backend.matching.scoring import compute_component_scores, compute_overall_score, skill_match_score
+from backend.matching.explanation import build_rationale
+from backend.matching.batch_scoring import CandidateMatrix, score_candidates, score_jobs, overall_scores
+
+T = TypeVar("T")
+
+# Results show fit scores to this many decimals; ranking uses the same precision.
+SCORE_DECIMALS = 2
+
+# Called with each scored batch's component columns and the candidates (or
+# matrix rows) they belong to, e.g. ``ScoreRunWriter.add``.
+Recorder = Callable[[Dict[str, np.ndarray], Sequence[Any]], None]
+
+class TopN(Generic[T]):
+    """Bounded min-heap keeping the ``n`` best-scoring items pushed so far.
+
+    Scores are compared at ``SCORE_DECIMALS``, the precision results show,
+    and ties keep the item that arrived first, so the order matches a stable
+    descending sort of the results.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self._heap: List[Tuple[float, int, T]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, score: float, item: T) -> None:
+        self._push(round(float(score), SCORE_DECIMALS), self._seq, item)
+        self._seq += 1
+
+    def _push(self, score: float, seq: int, item: T) -> None:
+        if self.n <= 0:
+            return
+        entry = (score, -seq, item)
+        if len(self._heap) < self.n:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def push_many(self, scores: np.ndarray, items: Sequence[T]) -> None:
+        scores = np.round(np.asarray(scores, dtype=np.float64), SCORE_DECIMALS)
+        idx = np.arange(len(scores))
+        if self.n <= 0:
+            idx = idx[:0]
+        elif len(scores) > self.n:
+            # Only the n best of this batch can possibly make it into the heap.
+            kth = np.partition(scores, len(scores) - self.n)[len(scores) - self.n]
+            above = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[: self.n - len(above)]
+            idx = np.sort(np.concatenate([above, ties]))
+        base = self._seq
+        for i in idx:
+            self._push(float(scores[i]), base + int(i), items[i])
+        self._seq = base + len(scores)
+
+    def items(self) -> List[Tuple[float, T]]:
+        """Retained ``(score, item)`` pairs, best first."""
+        ordered = sorted(self._heap, key=lambda e: (e[0], e[1]), reverse=True)
+        return [(score, item) for score, _, item in ordered]
+
+def build_match_result(
+    job: JobProfile,
+    cand: CandidateProfile,
+    weights: Dict[str, float] | None = None,
+    comps: Optional[MatchComponentScore] = None,
+) -> MatchResult:
+    """Full result for one candidate; pass ``comps`` if they are already known."""
+    if comps is None:
+        comps, matched, missing_req, missing_pref = compute_component_scores(job, cand)
+    else:
+        _, matched, missing_req, missing_pref = skill_match_score(job, cand)
+    fit = compute_overall_score(comps, weights)
+    rationale = build_rationale(job, cand, comps, matched, missing_req, missing_pref)
+    return MatchResult(
+        candidate_id=cand.candidate_id,
+        name=cand.name,
+        fit_score_0_100=round(fit, SCORE_DECIMALS),
+        components=comps,
+        matched_skills=matched,
+        missing_required_skills=missing_req,
+        nice_to_have_missing_skills=missing_pref,
+        rationale=rationale,
+    )
+
+def push_scored(
+    top: TopN[Any],
+    job: JobProfile,
+    cands: Sequence[CandidateProfile],
+    weights: Dict[str, float] | None = None,
+    record: Optional[Recorder] = None,
+) -> None:
+    """Score a batch of candidates and offer them to ``top``."""
+    if not cands:
+        return
+    columns = score_candidates(job, CandidateMatrix.from_profiles(cands))
+    if record is not None:
+        record(columns, cands)
+    top.push_many(overall_scores(columns, weights), cands)
+
+def push_scored_many(
+    tops: Sequence[TopN[Any]],
+    jobs: Sequence[JobProfile],
+    cands: Sequence[CandidateProfile],
+    weights: Dict[str, float] | None = None,
+    records: Optional[Sequence[Recorder]] = None,
+) -> None:
+    """``push_scored`` for several jobs; ``tops[i]`` collects ``jobs[i]``'s winners."""
+    if not cands:
+        return
+    for i, columns in enumerate(score_jobs(jobs, CandidateMatrix.from_profiles(cands))):
+        if records is not None:
+            records[i](columns, cands)
+        tops[i].push_many(overall_scores(columns, weights), cands)
+
+def finalize(
+    top: TopN[CandidateProfile],
+    job: JobProfile,
+    weights: Dict[str, float] | None = None,
+) -> List[MatchResult]:
+    """Build full results (skill lists, rationale) for the retained winners only."""
+    return [build_match_result(job, cand, weights) for _, cand in top.items()]
+
+def rank_profiles(
+    job: JobProfile,
+    cands: Sequence[CandidateProfile],
+    top_n: int = 10,
+    weights: Dict[str, float] | None = None,
+    record: Optional[Recorder] = None,
+) -> List[MatchResult]:
+    top: TopN[CandidateProfile] = TopN(top_n)
+    push_scored(top, job, cands, weights, record)
+    return finalize(top, job, weights)
+
+def rank_profiles_many(
+    jobs: Sequence[JobProfile],
+    cands: Sequence[CandidateProfile],
+    top_n: int = 10,
+    weights: Dict[str, float] | None = None,
+    records: Optional[Sequence[Recorder]] = None,
+) -> List[List[MatchResult]]:
+    """Top ``top_n`` candidates for each job, scoring the pool as one M x N matrix."""
+    tops: List[TopN[CandidateProfile]] = [TopN(top_n) for _ in jobs]
+    push_scored_many(tops, jobs, cands, weights, records)
+    return [finalize(top, job, weights) for top, job in zip(tops, jobs)]
+
+def rank_rows(
+    job: JobProfile,
+    matrix: CandidateMatrix,
+    load_profile: Callable[[int], CandidateProfile],
+    top_n: int = 10,
+    weights: Dict[str, float] | None = None,
+    rows: Optional[np.ndarray] = None,
+    record: Optional[Recorder] = None,
+) -> List[MatchResult]:
+    """Rank a prebuilt matrix; ``load_profile(row)`` is only called for winners.
+
+    If ``rows`` is given (e.g. an ANN shortlist), only those rows are scored.
+    """
+    if rows is None:
+        rows = range(len(matrix))
+    else:
+        matrix = matrix.take(rows)
+    columns = score_candidates(job, matrix)
+    if record is not None:
+        record(columns, rows)
+    top: TopN[int] = TopN(top_n)
+    top.push_many(overall_scores(columns, weights), rows)
+    return [build_match_result(job, load_profile(int(row)), weights) for _, row in top.items()]
+
+def rank_rows_many(
+    jobs: Sequence[JobProfile],
+    matrix: CandidateMatrix,
+    load_profile: Callable[[int], CandidateProfile],
+    top_n: int = 10,
+    weights: Dict[str, float] | None = None,
+    records: Optional[Sequence[Recorder]] = None,
+) -> List[List[MatchResult]]:
+    """``rank_rows`` for several jobs over the whole matrix."""
+    results = []
+    for i, (job, columns) in enumerate(zip(jobs, score_jobs(jobs, matrix))):
+        if records is not None:
+            records[i](columns, range(len(matrix)))
+        top: TopN[int] = TopN(top_n)
+        top.push_many(overall_scores(columns, weights), range(len(matrix)))
+        results.append([build_match_result(job, load_profile(int(row)), weights) for _, row in top.items()])
+    return results
@@ -3,10 +3,12 @@ import numpy as np
 
 from backend.models import JobProfile, CandidateProfile, MatchComponentScore
 from backend.config import DEFAULT_WEIGHTS
+from backend.nlp.taxonomy import TAXONOMY
+from backend.timing import timed
 
-def cosine_sim(a: List[float], b: List[float]) -> float:
-    a_arr = np.array(a, dtype=float)
-    b_arr = np.array(b, dtype=float)
+def cosine_sim(a, b) -> float:
+    a_arr = np.asarray(a, dtype=np.float64)
+    b_arr = np.asarray(b, dtype=np.float64)
     if np.linalg.norm(a_arr) == 0 or np.linalg.norm(b_arr) == 0:
         return 0.0
     return float(a_arr.dot(b_arr) / (np.linalg.norm(a_arr) * np.linalg.norm(b_arr)))
@@ -15,15 +17,7 @@ def skill_match_score(job: JobProfile, cand: CandidateProfile) -> Tuple[float, L
     job_required = set(job.required_skills)
     cand_skills = set(cand.skills)
 
-    exact = job_required & cand_skills
-
-    fuzzy = set()
-    for js in job_required:
-        for cs in cand_skills:
-            if js in cs or cs in js:
-                fuzzy.add(js)
-
-    covered = exact | fuzzy
+    covered = TAXONOMY.covered(job_required, cand_skills)
     score = len(covered) / len(job_required) if job_required else 1.0
 
     missing_required = sorted(job_required - covered)
@@ -34,6 +28,8 @@ def skill_match_score(job: JobProfile, cand: CandidateProfile) -> Tuple[float, L
 def experience_alignment_score(job: JobProfile, cand: CandidateProfile) -> float:
     if job.min_years_experience is None or cand.total_years_experience is None:
         return 0.5
+    if job.min_years_experience <= 0:
+        return 1.0  # no minimum: any known experience meets it
     ratio = cand.total_years_experience / job.min_years_experience
     if ratio >= 1:
         return 1.0
@@ -56,10 +52,11 @@ def certifications_match_score(job: JobProfile, cand: CandidateProfile) -> float
     return len(overlap) / len(job.certifications_required)
 
 def semantic_similarity_score(job: JobProfile, cand: CandidateProfile) -> float:
-    if not job.embedding or not cand.embedding:
+    if job.embedding is None or cand.embedding is None:
         return 0.0
     return cosine_sim(job.embedding, cand.embedding)
 
+@timed("compute_component_scores")
 def compute_component_scores(job: JobProfile, cand: CandidateProfile):
     s_skill, matched, missing_req, missing_pref = skill_match_score(job, cand)
     s_exp = experience_alignment_score(job, cand)
@@ -1,5 +1,64 @@
-from typing import List, Optional, Dict
-from pydantic import BaseModel
+from typing import Annotated, Any, List, Literal, Optional, Dict, Tuple
+import base64
+
+import numpy as np
+from pydantic import BaseModel, PlainSerializer, PlainValidator, WithJsonSchema
+
+class QuantizedEmbedding:
+    """int8 embedding with one float scale; ``np.asarray`` gives float32 back."""
+
+    __slots__ = ("values", "scale")
+
+    def __init__(self, values: np.ndarray, scale: float):
+        self.values = values
+        self.scale = scale
+
+    @classmethod
+    def from_array(cls, v: np.ndarray) -> "QuantizedEmbedding":
+        v = np.asarray(v, dtype=np.float32)
+        peak = float(np.abs(v).max()) if v.size else 0.0
+        scale = peak / 127 if peak else 1.0
+        return cls(np.round(v / scale).astype(np.int8), scale)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        out = self.values.astype(np.float32) * np.float32(self.scale)
+        return out if dtype is None else out.astype(dtype, copy=False)
+
+def _validate_embedding(value: Any):
+    if value is None or isinstance(value, QuantizedEmbedding):
+        return value
+    if isinstance(value, dict):
+        values = np.frombuffer(base64.b64decode(value["int8"]), dtype=np.int8)
+        return QuantizedEmbedding(values, float(value["scale"])) if len(values) else None
+    if isinstance(value, str):
+        value = np.frombuffer(base64.b64decode(value), dtype="<f4")
+    arr = np.asarray(value, dtype=np.float32)
+    if arr.ndim != 1:
+        raise ValueError(f"embedding must be one-dimensional, got shape {arr.shape}")
+    # Empty embeddings mean "none", so callers only need an ``is None`` check.
+    return arr if len(arr) else None
+
+def _serialize_embedding(value):
+    if isinstance(value, QuantizedEmbedding):
+        return {"int8": base64.b64encode(value.values.tobytes()).decode(), "scale": value.scale}
+    return base64.b64encode(np.asarray(value, dtype="<f4").tobytes()).decode()
+
+# A float32 vector (or QuantizedEmbedding) instead of a list of Python floats:
+# ~1.5 KB rather than ~12 KB per 384-dim profile, and no per-element
+# validation. Lists are still accepted; JSON carries base64 little-endian bytes.
+Embedding = Annotated[
+    Any,
+    PlainValidator(_validate_embedding),
+    PlainSerializer(_serialize_embedding, when_used="json-unless-none"),
+    WithJsonSchema({"anyOf": [
+        {"type": "string", "contentEncoding": "base64"},
+        {"type": "object", "properties": {"int8": {"type": "string"}, "scale": {"type": "number"}}},
+        {"type": "array", "items": {"type": "number"}},
+    ]}),
+]
 
 class EducationEntry(BaseModel):
     degree: Optional[str] = None
@@ -28,7 +87,7 @@ class JobProfile(BaseModel):
     education_requirements: List[str] = []
     certifications_required: List[str] = []
     certifications_preferred: List[str] = []
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Embedding] = None
     extra_metadata: Dict[str, str] = {}
 
 class CandidateProfile(BaseModel):
@@ -47,8 +106,14 @@ class CandidateProfile(BaseModel):
     total_years_experience: Optional[float] = None
     domains: List[str] = []
 
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Embedding] = None
     raw_text: str
+    # Lean mode: raw_text is emptied and, if spilled, lives at this
+    # (offset, length) in a TextStore; see resume_parser.make_lean.
+    raw_text_span: Optional[Tuple[int, int]] = None
+    # Set by nlp.dedup.Deduplicator: candidate_id of the (near-)identical
+    # resume whose features this profile reuses.
+    duplicate_of: Optional[str] = None
 
 class MatchComponentScore(BaseModel):
     skill_match: float
@@ -66,3 +131,42 @@ class MatchResult(BaseModel):
     missing_required_skills: List[str]
     nice_to_have_missing_skills: List[str]
     rationale: str
+
+class JobMatches(BaseModel):
+    job: str
+    matches: List[MatchResult]
+
+class WeightedMatches(BaseModel):
+    weights: Dict[str, float]
+    matches: List[MatchResult]
+
+# NDJSON stream records (--ndjson, /match/stream), told apart by ``type``.
+class StreamProgress(BaseModel):
+    type: Literal["progress"] = "progress"
+    stage: str
+    done: int
+    total: Optional[int] = None
+
+class StreamSkipped(BaseModel):
+    type: Literal["skipped"] = "skipped"
+    path: str
+    error: str
+
+class StreamResult(BaseModel):
+    type: Literal["result"] = "result"
+    job: Optional[str] = None
+    rank: int
+    match: MatchResult
+
+class StreamDone(BaseModel):
+    type: Literal["done"] = "done"
+    results: int
+    skipped: int = 0
+    job_id: Optional[str] = None
+    run_id: Optional[str] = None
+
+class RerankRequest(BaseModel):
+    run_id: str
+    # Each configuration overrides DEFAULT_WEIGHTS; {} keeps them all.
+    weights: List[Dict[str, float]] = [{}]
+    top_n: int = 10
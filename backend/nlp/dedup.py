@@ -0,0 +1,244 @@
+"""Exact and near-duplicate resume detection ahead of NER and embedding.
+
+Exact copies are found by a hash of the whitespace- and case-normalised text;
+near-duplicates (reposts, the same template with a few words changed) by
+MinHash signatures over word shingles, bucketed with LSH and confirmed by the
+estimated Jaccard similarity. A duplicate reuses its canonical copy's features
+instead of running the NLP stages again.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import re
+import time
+import zlib
+
+import numpy as np
+
+from backend.models import CandidateProfile
+from backend.nlp.features import TextFeatures, extract_features
+from backend.storage.feature_cache import FeatureCache
+
+_WORD = re.compile(r"\w+")
+_SHINGLE_MULT = np.uint64(0x100000001B3)
+
+@dataclass
+class DedupStats:
+    texts: int = 0
+    exact: int = 0
+    near: int = 0
+    nlp_texts: int = 0  # texts that went through extract_features
+    recomputed: int = 0  # duplicates whose canonical features had been evicted
+    nlp_seconds: float = 0.0
+    dedup_seconds: float = 0.0  # hashing and LSH lookups
+
+    @property
+    def duplicates(self) -> int:
+        return self.exact + self.near
+
+    @property
+    def saved_seconds(self) -> float:
+        """NLP time the duplicates would have cost, at the measured per-text rate."""
+        skipped = self.duplicates - self.recomputed
+        return skipped * self.nlp_seconds / self.nlp_texts if self.nlp_texts else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"dedup: {self.texts} texts, {self.texts - self.duplicates} unique, "
+            f"{self.exact} exact and {self.near} near duplicates; NLP skipped for {self.duplicates - self.recomputed} "
+            f"(~{self.saved_seconds:.2f}s saved, {self.dedup_seconds:.2f}s spent hashing)"
+        )
+
+def _exact_key(text: str) -> bytes:
+    return hashlib.blake2b(" ".join(text.lower().split()).encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+class Deduplicator:
+    """Finds duplicates among every text passed to ``extract_features``.
+
+    State is kept across calls, so a CSV streamed in chunks is deduplicated as
+    a whole. Texts whose MinHash signatures agree on at least ``threshold`` of
+    ``num_perm`` positions count as near-duplicates; ``bands`` LSH bands pick
+    which pairs are compared. ``near=False`` only catches exact copies.
+    Features are kept for the ``max_features`` most recently used canonical
+    texts (a few KB each); a duplicate of an older one is still linked to it
+    but runs NLP again.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle: int = 5,
+        near: bool = True,
+        seed: int = 1,
+        max_features: int = 10_000,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle = shingle
+        self.near = near
+        self.max_features = max_features
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self._exact: Dict[bytes, int] = {}
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._sigs: List[np.ndarray] = []
+        self._slots = 0
+        self._features: OrderedDict[int, TextFeatures] = OrderedDict()
+        self._ids: List[str] = []
+        self.stats = DedupStats()
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature (``num_perm`` uint32) over the text's word shingles."""
+        words = _WORD.findall(text.lower())
+        if not words:
+            return np.zeros(self.num_perm, dtype=np.uint32)
+        ids = np.fromiter((zlib.crc32(w.encode("utf-8", "surrogatepass")) for w in words), np.uint64, len(words))
+        k = min(self.shingle, len(ids))
+        n = len(ids) - k + 1
+        shingles = ids[:n].copy()
+        for j in range(1, k):
+            shingles = shingles * _SHINGLE_MULT + ids[j : j + n]
+        shingles = np.unique(shingles)
+        hashed = (shingles[:, None] * self._a + self._b) >> np.uint64(32)
+        return hashed.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in np.split(sig, self.bands)]
+
+    def _near_match(self, sig: np.ndarray, keys: List[bytes]) -> Optional[int]:
+        seen = {slot for b, key in enumerate(keys) for slot in self._buckets[b].get(key, ())}
+        best, best_sim = None, self.threshold
+        for slot in seen:
+            sim = float(np.mean(self._sigs[slot] == sig))
+            if sim >= best_sim:
+                best, best_sim = slot, sim
+        return best
+
+    def _assign(self, texts: Sequence[str], undo: List[Tuple[dict, bytes]]) -> Tuple[List[int], List[bool]]:
+        # Canonical slot of every text, and whether it is a duplicate of it.
+        # Every table entry added is logged in ``undo`` for ``_rollback``.
+        slots: List[int] = []
+        dup: List[bool] = []
+        for text in texts:
+            key = _exact_key(text)
+            slot = self._exact.get(key)
+            if slot is not None:
+                self.stats.exact += 1
+                slots.append(slot)
+                dup.append(True)
+                continue
+            sig = keys = None
+            if self.near:
+                sig = self.signature(text)
+                keys = self._band_keys(sig)
+                slot = self._near_match(sig, keys)
+            if slot is not None:
+                self.stats.near += 1
+                self._exact[key] = slot
+                undo.append((self._exact, key))
+                slots.append(slot)
+                dup.append(True)
+                continue
+            slot = self._slots
+            self._slots += 1
+            self._exact[key] = slot
+            undo.append((self._exact, key))
+            if self.near:
+                self._sigs.append(sig)
+                for b, k in enumerate(keys):
+                    self._buckets[b].setdefault(k, []).append(slot)
+                    undo.append((self._buckets[b], k))
+            slots.append(slot)
+            dup.append(False)
+        return slots, dup
+
+    def extract_features(
+        self,
+        texts: Sequence[str],
+        cache: Optional[FeatureCache] = None,
+        n_process: int = 1,
+        extract: Optional[Callable[[List[str]], List[TextFeatures]]] = None,
+    ) -> Tuple[List[TextFeatures], List[Optional[int]]]:
+        """``extract_features`` for ``texts``, running NLP only on new, unique ones.
+
+        Also returns, per text, the canonical slot it duplicates (``None`` for
+        a canonical copy); pass both the profiles and this list to ``link``.
+        ``extract`` replaces ``extract_features`` for the texts that need NLP,
+        e.g. to run it in worker processes.
+        """
+        start = time.perf_counter()
+        first_slot, counts = self._slots, (self.stats.exact, self.stats.near)
+        undo: List[Tuple[dict, bytes]] = []
+        slots, dup = self._assign(texts, undo)
+        self.stats.dedup_seconds += time.perf_counter() - start
+
+        # One text per slot without features: new canonical texts, and
+        # duplicates of older ones whose features were evicted.
+        todo: Dict[int, str] = {}
+        for i, s in enumerate(slots):
+            if s not in self._features and s not in todo:
+                todo[s] = texts[i]
+        fresh: Dict[int, TextFeatures] = {}
+        if todo:
+            start = time.perf_counter()
+            try:
+                pending = list(todo.values())
+                if extract is None:
+                    computed = extract_features(pending, cache, n_process=n_process)
+                else:
+                    computed = extract(pending)
+            except BaseException:
+                self._rollback(first_slot, undo)
+                self.stats.exact, self.stats.near = counts
+                raise
+            # Copies, so a kept embedding doesn't pin its whole batch.
+            fresh = {s: TextFeatures(f.entities, np.array(f.embedding)) for s, f in zip(todo, computed)}
+            self.stats.nlp_seconds += time.perf_counter() - start
+            self.stats.nlp_texts += len(todo)
+            self.stats.recomputed += sum(s < first_slot for s in todo)
+        self.stats.texts += len(texts)
+
+        features = []
+        for s in slots:
+            f = fresh.get(s)
+            if f is None:
+                f = self._features[s]
+                self._features.move_to_end(s)
+            features.append(f)
+        self._features.update(fresh)
+        while len(self._features) > self.max_features:
+            self._features.popitem(last=False)
+        return features, [s if d else None for s, d in zip(slots, dup)]
+
+    def _rollback(self, first_slot: int, undo: List[Tuple[dict, bytes]]) -> None:
+        # Forget what one failed ``extract_features`` call added, so later
+        # copies of its texts aren't matched to slots that have no features.
+        for table, key in reversed(undo):
+            value = table[key]
+            if isinstance(value, list):
+                value.pop()
+                if not value:
+                    del table[key]
+            else:
+                del table[key]
+        del self._sigs[first_slot:]
+        self._slots = first_slot
+
+    def link(self, cands: Sequence[CandidateProfile], duplicate_slots: Sequence[Optional[int]]) -> None:
+        """Record canonical candidate ids and point each duplicate's ``duplicate_of`` at one."""
+        for cand, slot in zip(cands, duplicate_slots):
+            if slot is None:
+                self._ids.append(cand.candidate_id)
+            else:
+                cand.duplicate_of = self._ids[slot]
+
+def collapse_duplicates(cands: Sequence[CandidateProfile]) -> List[CandidateProfile]:
+    """``cands`` without the profiles marked as duplicates of another one."""
+    return [c for c in cands if c.duplicate_of is None]
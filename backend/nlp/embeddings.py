@@ -1,8 +1,113 @@
-from sentence_transformers import SentenceTransformer
+from typing import Sequence
+import hashlib
+import re
+import threading
 
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+import numpy as np
 
-def embed_text(text: str):
-    text = text[:8000]
-    emb = _model.encode([text], convert_to_numpy=True)[0].tolist()
-    return emb
+from backend.config import EMBEDDING_DTYPE, EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE
+from backend.models import QuantizedEmbedding
+from backend.timing import timed
+
+MAX_EMBED_CHARS = 8000
+
+HASHING_ENCODER = "hashing"
+
+_model = None
+_model_lock = threading.Lock()
+# The encoder isn't documented as thread-safe; the API calls it from a thread
+# pool, so forward passes run one at a time (processes get their own model).
+_encode_lock = threading.Lock()
+
+class HashingEncoder:
+    """Deterministic, offline stand-in for a SentenceTransformer.
+
+    Each word (and word bigram) is hashed to a signed dimension, so texts
+    sharing vocabulary get a high cosine similarity. Useful for benchmarks and
+    for running without network access; the scores are not comparable with a
+    real encoder's.
+    """
+
+    _TOKEN = re.compile(r"\w+")
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _slot(self, token: str) -> int:
+        return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+    def encode(self, texts: Sequence[str], batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            words = self._TOKEN.findall(text.lower())
+            for token in words + [a + " " + b for a, b in zip(words, words[1:])]:
+                h = self._slot(token)
+                out[i, h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.where(norms == 0, 1.0, norms)
+
+def get_model():
+    """The shared encoder, loaded on first use."""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                if EMBEDDING_MODEL == HASHING_ENCODER:
+                    _model = HashingEncoder()
+                else:
+                    # Importing sentence_transformers pulls in torch, so it is
+                    # deferred along with the model itself.
+                    from sentence_transformers import SentenceTransformer
+
+                    _model = SentenceTransformer(EMBEDDING_MODEL)
+    return _model
+
+def set_model(model) -> None:
+    """Replace the shared encoder (``None`` reloads the configured one on next use).
+
+    The feature cache keys on ``EMBEDDING_MODEL``, so don't share a cache with
+    runs that use a different encoder.
+    """
+    global _model
+    with _model_lock:
+        _model = model
+
+@timed("embed_texts")
+def embed_texts(texts: Sequence[str], batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+    """Encode many texts in batched forward passes.
+
+    Texts are sorted by length before encoding so each batch pads to a similar
+    size; rows of the returned (len(texts), dim) float32 matrix follow the
+    input order.
+    """
+    model = get_model()
+    truncated = [t[:MAX_EMBED_CHARS] for t in texts]
+    dim = model.get_sentence_embedding_dimension()
+    out = np.empty((len(truncated), dim), dtype=np.float32)
+    if not truncated:
+        return out
+
+    order = sorted(range(len(truncated)), key=lambda i: len(truncated[i]), reverse=True)
+    with _encode_lock:
+        encoded = model.encode(
+            [truncated[i] for i in order],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+        )
+    out[order] = encoded
+    return out
+
+def embed_text(text: str) -> np.ndarray:
+    return embed_texts([text])[0]
+
+def compact_embedding(v: np.ndarray):
+    """``v`` as stored on a profile, per ``EMBEDDING_DTYPE``.
+
+    Always a copy, so a profile doesn't keep its whole ``embed_texts`` batch alive.
+    """
+    if EMBEDDING_DTYPE == "int8":
+        return QuantizedEmbedding.from_array(v)
+    return np.array(v, dtype=np.float32)
@@ -0,0 +1,61 @@
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import hashlib
+
+import numpy as np
+
+from backend.config import EMBEDDING_MODEL, SPACY_MODEL
+from backend.nlp.ner_skill_extractor import (
+    extract_entities_batch,
+    get_nlp,
+    match_skills,
+    EXTRACTOR_VERSION,
+    SKILLS_DICTIONARY_VERSION,
+)
+from backend.nlp.embeddings import embed_texts, get_model
+from backend.nlp.taxonomy import TAXONOMY
+from backend.storage.feature_cache import FeatureCache
+
+class TextFeatures(NamedTuple):
+    entities: Dict[str, List[str]]
+    embedding: np.ndarray
+
+_KEY_PREFIX = f"{EMBEDDING_MODEL}\0{SPACY_MODEL}\0{SKILLS_DICTIONARY_VERSION}\0{EXTRACTOR_VERSION}\0".encode()
+
+def warm_up() -> None:
+    """Load spaCy, the encoder, the skill matcher and taxonomy now instead of on first use."""
+    get_nlp()
+    get_model()
+    match_skills("")
+    TAXONOMY.warm_up()
+
+def feature_key(text: str) -> str:
+    """Cache key covering the text, the encoder, the spaCy model and the skills dictionary."""
+    return hashlib.sha256(_KEY_PREFIX + text.encode("utf-8", "surrogatepass")).hexdigest()
+
+def extract_features(
+    texts: Sequence[str],
+    cache: Optional[FeatureCache] = None,
+    n_process: int = 1,
+) -> List[TextFeatures]:
+    """Run NER and embedding for ``texts``, skipping any found in ``cache``."""
+    results: List[Optional[TextFeatures]] = [None] * len(texts)
+
+    keys: List[str] = []
+    if cache is not None:
+        keys = [feature_key(t) for t in texts]
+        cached = cache.get_many(keys)
+        for i, key in enumerate(keys):
+            if key in cached:
+                results[i] = TextFeatures(*cached[key])
+
+    todo = [i for i, r in enumerate(results) if r is None]
+    if todo:
+        pending = [texts[i] for i in todo]
+        ents = extract_entities_batch(pending, n_process=n_process)
+        embeddings = embed_texts(pending)
+        for i, e, emb in zip(todo, ents, embeddings):
+            results[i] = TextFeatures(e, emb)
+        if cache is not None:
+            cache.put_many((keys[i], e, emb) for i, e, emb in zip(todo, ents, embeddings))
+
+    return results
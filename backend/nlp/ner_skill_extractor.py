@@ -1,29 +1,141 @@
-import spacy
-from typing import List, Dict
-import json
-from pathlib import Path
-from .normalization import normalize_skill, normalize_degree
-
-try:
-    _nlp = spacy.load("en_core_web_sm")
-except OSError as e:
-    raise RuntimeError(
-        "spaCy model 'en_core_web_sm' is not installed. "
-        "Run: python -m spacy download en_core_web_sm"
-    ) from e
-
-skills_path = Path(__file__).resolve().parent.parent / "data" / "skills_dictionary.json"
-if skills_path.exists():
-    _SKILLS_SET = set(json.loads(skills_path.read_text()))
-else:
-    _SKILLS_SET = set()
+from typing import Dict, Iterable, List, Sequence
+from functools import lru_cache
+import re
+import threading
+from .normalization import normalize_degree
+from .taxonomy import TAXONOMY, SKILLS_DICTIONARY_VERSION
+from backend.config import NER_BATCH_SIZE, SPACY_MODEL
+from backend.timing import timed
+
+_nlp = None
+_nlp_lock = threading.Lock()
+# spaCy's Language isn't documented as thread-safe; calls into the shared
+# pipeline are serialized (the doc post-processing below runs outside it).
+_pipe_lock = threading.Lock()
+
+def _unused_pipes(nlp) -> List[str]:
+    """Components that don't feed ``doc.ents`` (tagger, parser, lemmatizer, ...)."""
+    keep = {"ner"}
+    for name in nlp.pipe_names:
+        if "ner" in getattr(nlp.get_pipe(name), "listening_components", []):
+            keep.add(name)
+    return [name for name in nlp.pipe_names if name not in keep]
+
+def get_nlp():
+    """The shared spaCy pipeline, loaded on first use."""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                _nlp = load_nlp(SPACY_MODEL)
+    return _nlp
+
+def load_nlp(name: str):
+    import spacy
+
+    if name == "blank":
+        return spacy.blank("en")
+    try:
+        nlp = spacy.load(name)
+    except OSError as e:
+        raise RuntimeError(
+            f"spaCy model '{name}' is not installed. "
+            f"Run: python -m spacy download {name}"
+        ) from e
+    # Only doc.ents is used, so the rest of the pipeline is switched off for good.
+    for pipe in _unused_pipes(nlp):
+        nlp.disable_pipe(pipe)
+    return nlp
+
+def set_nlp(nlp) -> None:
+    """Replace the shared spaCy pipeline (``None`` reloads the configured one on next use)."""
+    global _nlp
+    with _nlp_lock:
+        _nlp = nlp
+
+# Bump when extraction logic changes so cached features are recomputed.
+EXTRACTOR_VERSION = "3"
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    terminal = "" in node
+    alts = []
+    for ch in sorted(k for k in node if k):
+        atom = r"\s+" if ch == " " else re.escape(ch)
+        alts.append(atom + _trie_pattern(node[ch]))
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    if terminal:
+        return f"(?:{body})?"
+    return body
+
+def _compile_skill_matcher(skills: Iterable[str]) -> re.Pattern | None:
+    """Compile all skills into one prefix-shared regex.
+
+    Sharing prefixes keeps the work per text position bounded by the alphabet
+    rather than the dictionary size. Matches must sit on word boundaries, so
+    "java" does not fire inside "javascript", and the lookahead lets matches
+    overlap ("learning" is still found inside "deep learning"). Only the
+    longest skill at each position matches; ``match_skills`` recovers the
+    shorter ones it contains.
+    """
+    trie: Dict[str, dict] = {}
+    for skill in skills:
+        phrase = " ".join(skill.lower().split())
+        if not phrase:
+            continue
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    if not trie:
+        return None
+    return re.compile(r"(?<!\w)(?=(" + _trie_pattern(trie) + r")(?!\w))")
+
+@lru_cache(maxsize=None)
+def _skill_matcher() -> re.Pattern | None:
+    return _compile_skill_matcher(TAXONOMY.phrases)
+
+_NON_WORD = re.compile(r"\W")
+
+def match_skills(text: str) -> set:
+    """Return the canonical dictionary skills (names or aliases) mentioned in ``text``."""
+    matcher = _skill_matcher()
+    if matcher is None:
+        return set()
+    phrases = TAXONOMY.phrases
+    found = set()
+    for m in matcher.finditer(text.lower()):
+        phrase = " ".join(m.group(1).split())
+        found.update(phrases[phrase])
+        # Shorter skills starting at the same position ("machine learning" in
+        # "machine learning engineering") end where a non-word char follows.
+        for b in _NON_WORD.finditer(phrase):
+            found.update(phrases.get(phrase[: b.start()], ()))
+    return found
 
 _DEGREE_KEYWORDS = ["bachelor", "master", "phd", "b.tech", "bsc", "msc"]
 
+@timed("extract_entities")
 def extract_entities(text: str) -> Dict[str, List[str]]:
-    doc = _nlp(text)
+    nlp = get_nlp()
+    with _pipe_lock:
+        doc = nlp(text)
+    return _entities_from_doc(doc, text)
+
+@timed("extract_entities_batch")
+def extract_entities_batch(
+    texts: Sequence[str],
+    n_process: int = 1,
+    batch_size: int = NER_BATCH_SIZE,
+) -> List[Dict[str, List[str]]]:
+    """Batched ``extract_entities`` using ``nlp.pipe``; results follow input order."""
+    nlp = get_nlp()
+    with _pipe_lock:
+        docs = list(nlp.pipe(texts, n_process=n_process, batch_size=batch_size))
+    return [_entities_from_doc(doc, text) for doc, text in zip(docs, texts)]
 
-    skills = set()
+def _entities_from_doc(doc, text: str) -> Dict[str, List[str]]:
     orgs = set()
     certs = set()
     degrees = set()
@@ -36,9 +148,7 @@ def extract_entities(text: str) -> Dict[str, List[str]]:
             projects.add(ent.text.strip())
 
     lowered = text.lower()
-    for skill in _SKILLS_SET:
-        if skill.lower() in lowered:
-            skills.add(normalize_skill(skill))
+    skills = match_skills(text)
 
     for kw in _DEGREE_KEYWORDS:
         if kw in lowered:
@@ -1,12 +1,14 @@
+# Built-in aliases; skills_dictionary.json can add more (see taxonomy.py).
+SKILL_ALIASES = {
+    "js": "javascript",
+    "node.js": "nodejs",
+    "node": "nodejs",
+    "py": "python",
+}
+
 def normalize_skill(skill: str) -> str:
     skill = skill.strip().lower()
-    mapping = {
-        "js": "javascript",
-        "node.js": "nodejs",
-        "node": "nodejs",
-        "py": "python",
-    }
-    return mapping.get(skill, skill)
+    return SKILL_ALIASES.get(skill, skill)
 
 def normalize_degree(text: str) -> str:
     t = text.lower()
@@ -0,0 +1,108 @@
+"""Skill taxonomy built from ``data/skills_dictionary.json``.
+
+The dictionary is a JSON list whose items are either a skill name or an object
+with aliases::
+
+    ["python", {"name": "javascript", "aliases": ["js", "ecmascript"]}, ...]
+
+Both the names and their aliases are matched in text; whatever was matched
+maps to the canonical name. The fuzzy "covers" relation used by skill scoring
+(one skill's name contains the other's) is computed once over the taxonomy,
+so scoring is a set lookup instead of substring tests per candidate.
+"""
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Set, Union
+import hashlib
+import json
+
+from .normalization import SKILL_ALIASES, normalize_skill
+
+skills_path = Path(__file__).resolve().parent.parent / "data" / "skills_dictionary.json"
+
+DictionaryEntry = Union[str, Dict[str, object]]
+
+def _phrase(text: str) -> str:
+    return " ".join(text.lower().split())
+
+class SkillTaxonomy:
+    def __init__(self, entries: Iterable[DictionaryEntry]):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        # Lowercased text phrase found in resumes -> canonical names it stands for.
+        self.phrases: Dict[str, Set[str]] = {}
+        self.aliases: Dict[str, str] = dict(SKILL_ALIASES)
+
+        for entry in entries:
+            if isinstance(entry, str):
+                raw, aliases = entry, []
+            else:
+                raw, aliases = str(entry["name"]), [str(a) for a in entry.get("aliases", [])]
+            name = normalize_skill(raw)
+            if not name:
+                continue
+            self.ids.setdefault(name, len(self.ids))
+            self.phrases.setdefault(_phrase(raw), set()).add(name)
+            for alias in aliases:
+                self.phrases.setdefault(_phrase(alias), set()).add(name)
+                self.aliases[alias.strip().lower()] = name
+        self.names = list(self.ids)
+        self.phrases.pop("", None)
+        self._scan = lru_cache(maxsize=4096)(self._scan_names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, skill: str) -> bool:
+        return skill in self.ids
+
+    def canonical(self, skill: str) -> str:
+        """Map a skill or any of its aliases to its canonical name."""
+        key = skill.strip().lower()
+        return self.aliases.get(key, key)
+
+    @cached_property
+    def _covers(self) -> List[FrozenSet[str]]:
+        # Each name's substrings are looked up directly, which is
+        # O(names x len(name)^2) rather than O(names^2) substring tests.
+        related: List[Set[str]] = [{name} for name in self.names]
+        for i, name in enumerate(self.names):
+            n = len(name)
+            for start in range(n):
+                for end in range(start + 1, n + 1):
+                    j = self.ids.get(name[start:end])
+                    if j is not None and j != i:
+                        related[i].add(self.names[j])
+                        related[j].add(name)
+        return [frozenset(r) for r in related]
+
+    def warm_up(self) -> None:
+        """Build the covers relation now instead of on first use."""
+        self._covers
+
+    def covers(self, skill: str) -> FrozenSet[str]:
+        """Taxonomy names that fuzzily match ``skill`` (either contains the other)."""
+        i = self.ids.get(skill)
+        if i is not None:
+            return self._covers[i]
+        return self._scan(skill)
+
+    def _scan_names(self, skill: str) -> FrozenSet[str]:
+        return frozenset(n for n in self.names if skill in n or n in skill)
+
+    def covered(self, required: Iterable[str], skills: Iterable[str]) -> Set[str]:
+        """The ``required`` skills matched exactly or fuzzily by ``skills``."""
+        have = set(skills)
+        unknown = [s for s in have if s not in self.ids]
+        out = set()
+        for req in required:
+            if req in have or not self.covers(req).isdisjoint(have):
+                out.add(req)
+            elif any(req in s or s in req for s in unknown):
+                out.add(req)
+        return out
+
+_skills_bytes = skills_path.read_bytes() if skills_path.exists() else b""
+SKILLS_DICTIONARY_VERSION = hashlib.sha256(_skills_bytes).hexdigest()[:16]
+
+TAXONOMY = SkillTaxonomy(json.loads(_skills_bytes) if _skills_bytes else [])
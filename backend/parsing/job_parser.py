@@ -1,10 +1,12 @@
-from typing import List, Tuple, Optional
+from typing import List, Sequence, Tuple, Optional
 import re
 
-from .text_extraction import extract_text_any, TextExtractionError
-from backend.nlp.ner_skill_extractor import extract_entities
-from backend.nlp.embeddings import embed_text
+import numpy as np
+
+from .text_extraction import extract_text_any, extract_text_from_bytes, TextExtractionError
+from backend.nlp.features import TextFeatures, extract_features
 from backend.models import JobProfile
+from backend.storage.feature_cache import FeatureCache
 
 def _extract_title(text: str) -> Optional[str]:
     lines = [l.strip() for l in text.splitlines() if l.strip()]
@@ -34,13 +36,43 @@ def _extract_education_req(text: str) -> List[str]:
         degrees.append("PHD")
     return degrees
 
-def parse_job_profile(path: str) -> JobProfile:
+def _read_job(path: str) -> str:
+    try:
+        return extract_text_any(path)
+    except TextExtractionError as e:
+        raise RuntimeError(f"Error reading job profile file: {e}") from e
+
+def _read_job_upload(data: bytes, filename: str) -> str:
     try:
-        raw = extract_text_any(path)
+        return extract_text_from_bytes(data, filename)
     except TextExtractionError as e:
         raise RuntimeError(f"Error reading job profile file: {e}") from e
 
-    ents = extract_entities(raw)
+def parse_job_profile(path: str, cache: Optional[FeatureCache] = None) -> JobProfile:
+    return parse_job_text(_read_job(path), cache)
+
+def parse_job_profiles(paths: Sequence[str], cache: Optional[FeatureCache] = None) -> List[JobProfile]:
+    """Parse several job profiles, running NLP over all of them in one batch."""
+    return parse_job_texts([_read_job(str(p)) for p in paths], cache)
+
+def parse_job_upload(data: bytes, filename: str, cache: Optional[FeatureCache] = None) -> JobProfile:
+    """Parse a job profile file held in memory (e.g. an HTTP upload)."""
+    return parse_job_text(_read_job_upload(data, filename), cache)
+
+def parse_job_uploads(
+    uploads: Sequence[Tuple[str, bytes]],
+    cache: Optional[FeatureCache] = None,
+) -> List[JobProfile]:
+    return parse_job_texts([_read_job_upload(data, filename) for filename, data in uploads], cache)
+
+def parse_job_text(raw: str, cache: Optional[FeatureCache] = None) -> JobProfile:
+    return parse_job_texts([raw], cache)[0]
+
+def parse_job_texts(raws: Sequence[str], cache: Optional[FeatureCache] = None) -> List[JobProfile]:
+    return [_build_job(raw, f) for raw, f in zip(raws, extract_features(raws, cache))]
+
+def _build_job(raw: str, features: TextFeatures) -> JobProfile:
+    ents = features.entities
 
     title = _extract_title(raw)
     role_summary = _extract_role_summary(raw)
@@ -52,7 +84,7 @@ def parse_job_profile(path: str) -> JobProfile:
 
     domain = None
     cert_req = ents["certifications"]
-    embedding = embed_text(raw)
+    embedding = np.array(features.embedding, dtype=np.float32)
 
     return JobProfile(
         raw_text=raw,
@@ -0,0 +1,289 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import multiprocessing
+import os
+
+from backend.config import EMBEDDING_BATCH_SIZE, NER_BATCH_SIZE
+from backend.models import CandidateProfile
+from backend.nlp.dedup import Deduplicator
+from backend.nlp.features import TextFeatures, extract_features, warm_up
+from backend.parsing.resume_parser import (
+    ParseFailure, make_lean, parse_resumes_safe, parse_uploads_safe, profiles_from_texts, read_resumes_safe,
+    read_uploads_safe,
+)
+from backend.parsing.text_extraction import set_page_workers
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.text_store import TextStore
+
+# Files per task: large enough to keep NER/embedding batched inside a worker,
+# small enough to balance load across workers.
+MAX_CHUNK = 32
+# In-process parsing with a progress callback reports once per this many
+# files: several full NER/embedding batches, so reporting costs no batching.
+PROGRESS_CHUNK = 4 * max(EMBEDDING_BATCH_SIZE, NER_BATCH_SIZE)
+
+ParseResult = Tuple[List[CandidateProfile], List[ParseFailure]]
+# Called as ``progress(done, total)`` after each chunk of files is parsed.
+Progress = Callable[[int, int], None]
+
+def _init_worker() -> None:
+    # One model instance per process; keep BLAS/tokenizer thread pools from
+    # oversubscribing the cores the pool is already spreading work over.
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    # Files are already spread over the pool; don't split their pages as well.
+    set_page_workers(1)
+    warm_up()
+
+def _noop() -> None:
+    pass
+
+# Chunk tasks return ``(ok, failed, cache_counts)``. The cache arrives freshly
+# unpickled for each task, so its counters are this chunk's alone; the parent
+# adds them to its own.
+
+def _counts(cache: Optional[FeatureCache]):
+    return (cache.hits, cache.misses, cache.evictions) if cache is not None else None
+
+def _parse_chunk(items, fn, mask_pii, cache, lean):
+    ok, failed = fn(items, mask_pii=mask_pii, cache=cache, lean=lean)
+    return ok, failed, _counts(cache)
+
+def _read_chunk(items, read):
+    raws, failed = read(items)
+    return raws, failed, None
+
+def _features_chunk(texts, cache):
+    return extract_features(texts, cache), [], _counts(cache)
+
+class ParserPool:
+    """Process pool that parses resumes in parallel.
+
+    Workers are started with ``spawn`` and load spaCy and the encoder once in
+    their initializer, so a pool can be kept around and reused across calls.
+    With ``workers <= 1`` parsing runs in the calling process. With a
+    ``Deduplicator``, workers extract the text, duplicates are found here, and
+    only the texts that still need NLP go back out to the workers. If a worker
+    dies the pool is restarted; the chunks it may have been holding are
+    retried one at a time, and only a chunk that kills a worker on its own is
+    reported as failed.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if workers > 1:
+            self._start()
+
+    def _start(self) -> None:
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _restart(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._start()
+
+    def _submit(self, *args):
+        try:
+            return self._executor.submit(*args)
+        except BrokenProcessPool:
+            # A worker died since the last call (e.g. killed while idle).
+            self._restart()
+            return self._executor.submit(*args)
+
+    def parse(
+        self,
+        paths: Sequence[str],
+        mask_pii: bool = True,
+        cache: Optional[FeatureCache] = None,
+        lean: bool = False,
+        text_store: Optional[TextStore] = None,
+        progress: Optional[Progress] = None,
+        dedup: Optional[Deduplicator] = None,
+    ) -> ParseResult:
+        """Parse ``paths``; files that fail are returned as ``ParseFailure``s.
+
+        ``lean``, ``text_store`` and ``dedup`` are as for ``parse_resumes``.
+        """
+        paths = [str(p) for p in paths]
+        return self._run(
+            parse_resumes_safe, read_resumes_safe, paths, paths, mask_pii, cache, lean, text_store, progress, dedup
+        )
+
+    def parse_uploads(
+        self,
+        uploads: Sequence[Tuple[str, bytes]],
+        mask_pii: bool = True,
+        cache: Optional[FeatureCache] = None,
+        lean: bool = False,
+        text_store: Optional[TextStore] = None,
+        progress: Optional[Progress] = None,
+        dedup: Optional[Deduplicator] = None,
+    ) -> ParseResult:
+        """Parse in-memory ``(filename, data)`` resumes without touching disk."""
+        uploads = list(uploads)
+        names = [name for name, _ in uploads]
+        return self._run(
+            parse_uploads_safe, read_uploads_safe, uploads, names, mask_pii, cache, lean, text_store, progress, dedup
+        )
+
+    def _run(
+        self,
+        fn: Callable[..., ParseResult],
+        read: Callable[[list], Tuple[List[str], List[ParseFailure]]],
+        items: list,
+        names: List[str],
+        mask_pii: bool,
+        cache: Optional[FeatureCache],
+        lean: bool = False,
+        text_store: Optional[TextStore] = None,
+        progress: Optional[Progress] = None,
+        dedup: Optional[Deduplicator] = None,
+    ) -> ParseResult:
+        if self._executor is None and progress is None:
+            return fn(items, mask_pii=mask_pii, cache=cache, lean=lean, text_store=text_store, dedup=dedup)
+
+        cands: List[CandidateProfile] = []
+        failures: List[ParseFailure] = []
+        if self._executor is None or dedup is not None:
+            # In-process, progress is reported per PROGRESS_CHUNK files. With
+            # dedup on a pool, each window's texts are read by the workers and
+            # deduplicated here before NLP is sent back out.
+            step = PROGRESS_CHUNK if self._executor is None else max(PROGRESS_CHUNK, MAX_CHUNK * self.workers)
+            for i in range(0, len(items), step):
+                chunk = items[i : i + step]
+                if self._executor is None:
+                    ok, failed = fn(
+                        chunk, mask_pii=mask_pii, cache=cache, lean=lean, text_store=text_store, dedup=dedup
+                    )
+                else:
+                    raws, failed = self._gather(_read_chunk, chunk, names[i : i + step], (read,))
+                    ok = profiles_from_texts(
+                        raws, mask_pii, cache, lean, text_store, dedup, lambda texts: self._extract(texts, cache)
+                    )
+                cands.extend(ok)
+                failures.extend(failed)
+                if progress is not None:
+                    progress(min(i + step, len(items)), len(items))
+            return cands, failures
+
+        # Texts are dropped inside the workers so they never cross the process
+        # boundary; spilling has to happen here, where the store is appended to.
+        drop = lean and text_store is None
+        done = 0
+
+        def on_chunk(ok: List[CandidateProfile], n: int) -> None:
+            nonlocal done
+            if text_store is not None:
+                make_lean(ok, text_store)
+            done += n
+            if progress is not None:
+                progress(done, len(items))
+
+        return self._gather(_parse_chunk, items, names, (fn, mask_pii, cache, drop), cache, on_chunk)
+
+    def _extract(self, texts: List[str], cache: Optional[FeatureCache]) -> List[TextFeatures]:
+        """``extract_features`` spread over the workers."""
+        features, failed = self._gather(_features_chunk, texts, [""] * len(texts), (cache,), cache)
+        if failed:
+            raise RuntimeError(f"Feature extraction failed: {failed[0].error}")
+        return features
+
+    def _gather(
+        self,
+        task: Callable,
+        items: list,
+        names: List[str],
+        args: tuple,
+        cache: Optional[FeatureCache] = None,
+        on_chunk: Optional[Callable[[list, int], None]] = None,
+    ) -> Tuple[list, List[ParseFailure]]:
+        """Run ``task(chunk, *args)`` over chunks of ``items`` on the pool.
+
+        Results are concatenated in input order. A chunk whose worker fails
+        reports one ``ParseFailure`` per name in it; ``on_chunk(ok, n)`` is
+        called as each chunk of ``n`` items completes.
+        """
+        size = max(1, min(MAX_CHUNK, -(-len(items) // (self.workers * 4))))
+        starts = range(0, len(items), size)
+        results: Dict[int, Tuple[list, List[ParseFailure]]] = {}
+
+        def submit(start: int):
+            return self._submit(task, items[start : start + size], *args)
+
+        def collect(start: int, fut, retried: bool = False) -> None:
+            try:
+                ok, failed, counts = fut.result()
+                if counts is not None:
+                    cache.add_counts(*counts)
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool) and not retried:
+                    raise
+                # The chunk failed on its own; report every item it held.
+                failed = [ParseFailure(n, f"worker failed: {e}") for n in names[start : start + size]]
+                ok = []
+            results[start] = (ok, failed)
+            if on_chunk is not None:
+                on_chunk(ok, len(names[start : start + size]))
+
+        futures = [(start, submit(start)) for start in starts]
+        broken = []
+        for start, fut in futures:
+            try:
+                collect(start, fut)
+            except BrokenProcessPool:
+                broken.append(start)
+        if broken:
+            # Any chunk still in flight could have taken the worker down, so
+            # they are retried one at a time on a fresh pool.
+            self._restart()
+            for start in broken:
+                fut = submit(start)
+                collect(start, fut, retried=True)
+                if isinstance(fut.exception(), BrokenProcessPool):
+                    self._restart()
+
+        # Chunk order, not completion order: callers pair results with their inputs.
+        ok_all: list = []
+        failed_all: List[ParseFailure] = []
+        for start in starts:
+            ok, failed = results[start]
+            ok_all.extend(ok)
+            failed_all.extend(failed)
+        return ok_all, failed_all
+
+    def warm_up(self) -> None:
+        """Start every worker (running its initializer) before real work arrives."""
+        if self._executor is not None:
+            for fut in [self._executor.submit(_noop) for _ in range(self.workers)]:
+                fut.result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "ParserPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def parse_resumes_parallel(
+    paths: Sequence[str],
+    workers: int,
+    mask_pii: bool = True,
+    cache: Optional[FeatureCache] = None,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    progress: Optional[Progress] = None,
+    dedup: Optional[Deduplicator] = None,
+) -> ParseResult:
+    with ParserPool(workers) as pool:
+        return pool.parse(
+            paths, mask_pii=mask_pii, cache=cache, lean=lean, text_store=text_store, progress=progress, dedup=dedup
+        )
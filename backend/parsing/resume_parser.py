@@ -1,11 +1,20 @@
-from typing import List, Tuple
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
 import re
 import uuid
 
-from .text_extraction import extract_text_any, TextExtractionError
-from backend.nlp.ner_skill_extractor import extract_entities
-from backend.nlp.embeddings import embed_text
+import numpy as np
+
+from .text_extraction import extract_text_any, extract_text_from_bytes, TextExtractionError
+from backend.nlp.dedup import Deduplicator
+from backend.nlp.embeddings import compact_embedding
+from backend.nlp.features import TextFeatures, extract_features
 from backend.models import CandidateProfile, EducationEntry, ExperienceEntry
+from backend.storage.feature_cache import FeatureCache
+from backend.storage.text_store import TextStore
+
+class ParseFailure(NamedTuple):
+    path: str
+    error: str
 
 EMAIL_REGEX = r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
 PHONE_REGEX = r"(\+?\d[\d\-\s]{7,}\d)"
@@ -22,14 +31,19 @@ def _estimate_total_experience(text: str) -> float | None:
     matches = re.findall(r"(\d+)\+?\s+years?", text.lower())
     return float(max(map(int, matches))) if matches else None
 
-def parse_resume(path: str, mask_pii: bool = True) -> CandidateProfile:
+def _read_resume(path: str) -> str:
     try:
-        raw = extract_text_any(path)
+        return extract_text_any(path)
     except TextExtractionError as e:
         raise RuntimeError(f"Error reading resume file '{path}': {e}") from e
 
-    ents = extract_entities(raw)
+def _read_upload(filename: str, data: bytes) -> str:
+    try:
+        return extract_text_from_bytes(data, filename)
+    except TextExtractionError as e:
+        raise RuntimeError(f"Error reading resume file '{filename}': {e}") from e
 
+def _build_profile(raw: str, ents, embedding: np.ndarray, mask_pii: bool) -> CandidateProfile:
     email, phone = _extract_contact(raw)
     candidate_id = str(uuid.uuid4())
     name = None  # could be improved
@@ -48,7 +62,6 @@ def parse_resume(path: str, mask_pii: bool = True) -> CandidateProfile:
     experience: List[ExperienceEntry] = []
 
     total_exp = _estimate_total_experience(raw)
-    embedding = embed_text(raw)
 
     if mask_pii:
         email = None
@@ -67,6 +80,128 @@ def parse_resume(path: str, mask_pii: bool = True) -> CandidateProfile:
         projects=ents["projects"],
         total_years_experience=total_exp,
         domains=[],
-        embedding=embedding,
+        embedding=compact_embedding(embedding),
         raw_text=raw,
     )
+
+def make_lean(cands: Sequence[CandidateProfile], text_store: Optional[TextStore] = None) -> None:
+    """Free each profile's ``raw_text``, first appending it to ``text_store`` if given.
+
+    Scoring and ranking never read the text; ``fetch_raw_text`` gets a
+    spilled one back.
+    """
+    for c in cands:
+        if text_store is not None:
+            c.raw_text_span = text_store.append(c.raw_text)
+        c.raw_text = ""
+    if text_store is not None:
+        text_store.flush()
+
+def fetch_raw_text(cand: CandidateProfile, text_store: Optional[TextStore] = None) -> str:
+    if cand.raw_text_span is None or text_store is None:
+        return cand.raw_text
+    return text_store.fetch(*cand.raw_text_span)
+
+def parse_resume(
+    path: str,
+    mask_pii: bool = True,
+    cache: Optional[FeatureCache] = None,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
+) -> CandidateProfile:
+    return parse_resumes([path], mask_pii=mask_pii, cache=cache, lean=lean, text_store=text_store, dedup=dedup)[0]
+
+def parse_resumes(
+    paths: Sequence[str],
+    mask_pii: bool = True,
+    cache: Optional[FeatureCache] = None,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
+) -> List[CandidateProfile]:
+    """Parse several resumes, encoding all of them in one batched pass.
+
+    With ``lean`` (or a ``text_store`` to spill to) each profile's
+    ``raw_text`` is released right after feature extraction; see ``make_lean``.
+    With ``dedup``, duplicates of a resume seen before reuse its features
+    instead of running NER and embedding; see ``Deduplicator``.
+    """
+    raws = [_read_resume(p) for p in paths]
+    return profiles_from_texts(raws, mask_pii, cache, lean, text_store, dedup)
+
+def parse_resumes_safe(
+    paths: Sequence[str],
+    mask_pii: bool = True,
+    cache: Optional[FeatureCache] = None,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
+) -> Tuple[List[CandidateProfile], List[ParseFailure]]:
+    """Like ``parse_resumes``, but unreadable files are reported, not raised."""
+    raws, failures = read_resumes_safe(paths)
+    return profiles_from_texts(raws, mask_pii, cache, lean, text_store, dedup), failures
+
+def parse_uploads_safe(
+    uploads: Sequence[Tuple[str, bytes]],
+    mask_pii: bool = True,
+    cache: Optional[FeatureCache] = None,
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
+) -> Tuple[List[CandidateProfile], List[ParseFailure]]:
+    """Parse in-memory ``(filename, data)`` resumes; failures carry the filename."""
+    raws, failures = read_uploads_safe(uploads)
+    return profiles_from_texts(raws, mask_pii, cache, lean, text_store, dedup), failures
+
+def read_resumes_safe(paths: Sequence[str]) -> Tuple[List[str], List[ParseFailure]]:
+    """Text of each readable resume, in order, and the files that failed."""
+    raws: List[str] = []
+    failures: List[ParseFailure] = []
+    for p in paths:
+        try:
+            raws.append(_read_resume(p))
+        except Exception as e:
+            failures.append(ParseFailure(str(p), str(e)))
+    return raws, failures
+
+def read_uploads_safe(uploads: Sequence[Tuple[str, bytes]]) -> Tuple[List[str], List[ParseFailure]]:
+    """``read_resumes_safe`` for in-memory ``(filename, data)`` resumes."""
+    raws: List[str] = []
+    failures: List[ParseFailure] = []
+    for filename, data in uploads:
+        try:
+            raws.append(_read_upload(filename, data))
+        except Exception as e:
+            failures.append(ParseFailure(filename, str(e)))
+    return raws, failures
+
+def profiles_from_texts(
+    raws: List[str],
+    mask_pii: bool,
+    cache: Optional[FeatureCache],
+    lean: bool = False,
+    text_store: Optional[TextStore] = None,
+    dedup: Optional[Deduplicator] = None,
+    extract: Optional[Callable[[List[str]], List[TextFeatures]]] = None,
+) -> List[CandidateProfile]:
+    """Profiles for already extracted resume texts.
+
+    ``extract`` replaces ``extract_features(raws, cache)`` for the NLP step
+    (with ``dedup``, only the texts that need it are passed).
+    """
+    if dedup is not None:
+        features, duplicates = dedup.extract_features(raws, cache, extract=extract)
+    elif extract is not None:
+        features = extract(raws)
+    else:
+        features = extract_features(raws, cache)
+    cands = [
+        _build_profile(raw, f.entities, f.embedding, mask_pii)
+        for raw, f in zip(raws, features)
+    ]
+    if dedup is not None:
+        dedup.link(cands, duplicates)
+    if lean or text_store is not None:
+        make_lean(cands, text_store)
+    return cands
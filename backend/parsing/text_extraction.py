@@ -1,11 +1,160 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+import multiprocessing
+import time
+
 import fitz  # PyMuPDF
 from docx import Document
 
+from backend.config import EXTRACT_MAX_CHARS, EXTRACT_MAX_PAGES, PDF_PAGE_WORKERS, PDF_PARALLEL_MIN_PAGES
+from backend import timing
+from backend.timing import timed
+
 class TextExtractionError(Exception):
     pass
 
-def extract_text_from_pdf(path: str) -> str:
+class ExtractionStats(NamedTuple):
+    pages: int  # pages (PDF) or paragraphs (DOCX) in the document
+    read: int  # pages/paragraphs whose text was extracted
+    skipped: int  # image-only PDF pages, not run through text extraction
+    chars: int
+    truncated: bool  # the page or character budget cut the document short
+    seconds: float
+
+class Extraction(NamedTuple):
+    text: str
+    stats: ExtractionStats
+
+PdfSource = Union[str, bytes]
+
+_page_workers = PDF_PAGE_WORKERS
+_page_executor: Optional[ProcessPoolExecutor] = None
+
+def set_page_workers(workers: int) -> None:
+    """Processes used to split one large PDF's pages (1 reads in-process)."""
+    global _page_workers, _page_executor
+    if _page_executor is not None and workers != _page_workers:
+        _page_executor.shutdown(wait=False)
+        _page_executor = None
+    _page_workers = workers
+
+def _budget(value: Optional[int], default: int) -> Optional[int]:
+    value = default if value is None else value
+    return value if value > 0 else None
+
+def _open_pdf(source: PdfSource):
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+def _page_text(page) -> Optional[str]:
+    # A page without fonts is a scan or a picture; get_text has nothing to find.
+    if not page.get_fonts():
+        return None
+    return page.get_text("text")
+
+def _pdf_pages(source: PdfSource, start: int, stop: int) -> List[Optional[str]]:
+    with _open_pdf(source) as doc:
+        return [_page_text(doc[i]) for i in range(start, stop)]
+
+def _pdf_pages_parallel(source: PdfSource, n: int) -> Iterator[Optional[str]]:
+    # Page blocks are read ahead by at most two per worker and yielded in
+    # order, so a reader that stops at the character budget stops the rest.
+    global _page_executor
+    if _page_executor is None:
+        _page_executor = ProcessPoolExecutor(
+            max_workers=_page_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    step = max(8, -(-n // (_page_workers * 4)))
+    starts = iter(range(0, n, step))
+    pending = deque()
+
+    def submit_next() -> None:
+        start = next(starts, None)
+        if start is not None:
+            pending.append(_page_executor.submit(_pdf_pages, source, start, min(start + step, n)))
+
+    for _ in range(2 * _page_workers):
+        submit_next()
+    try:
+        while pending:
+            block = pending.popleft().result()
+            submit_next()
+            yield from block
+    finally:
+        for f in pending:
+            f.cancel()
+
+def _take_pages(texts: Iterable[Optional[str]], max_chars: Optional[int]) -> List[Optional[str]]:
+    # Pages up to and including the one that crosses the character budget.
+    pages, chars = [], 0
+    for text in texts:
+        pages.append(text)
+        chars += len(text) + 1 if text is not None else 1
+        if max_chars and chars > max_chars:
+            break
+    return pages
+
+def _pdf_text(
+    doc,
+    label: str,
+    source: PdfSource,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Extraction:
+    start = time.perf_counter()
+    try:
+        total = doc.page_count
+        if not total:
+            raise TextExtractionError(f"No text extracted from PDF: {label}")
+        max_pages = _budget(max_pages, EXTRACT_MAX_PAGES)
+        max_chars = _budget(max_chars, EXTRACT_MAX_CHARS)
+        n = min(total, max_pages or total)
+
+        if _page_workers > 1 and n >= PDF_PARALLEL_MIN_PAGES:
+            texts = _pdf_pages_parallel(source, n)
+        else:
+            texts = (_page_text(doc[i]) for i in range(n))
+        try:
+            pages = _take_pages(texts, max_chars)
+        finally:
+            texts.close()
+    finally:
+        doc.close()
+
+    text = "\n".join(t or "" for t in pages)
+    truncated = len(pages) < total
+    if max_chars and len(text) > max_chars:
+        text, truncated = text[:max_chars], True
+    skipped = sum(t is None for t in pages)
+    stats = ExtractionStats(
+        total, len(pages) - skipped, skipped, len(text), truncated, time.perf_counter() - start
+    )
+    return Extraction(text, stats)
+
+def _docx_text(document, label: str, max_chars: Optional[int] = None) -> Extraction:
+    start = time.perf_counter()
+    paragraphs = document.paragraphs
+    if not paragraphs:
+        raise TextExtractionError(f"No text extracted from DOCX: {label}")
+    max_chars = _budget(max_chars, EXTRACT_MAX_CHARS)
+    texts, chars = [], 0
+    for para in paragraphs:
+        texts.append(para.text)
+        chars += len(texts[-1]) + 1
+        if max_chars and chars > max_chars:
+            break
+    text = "\n".join(texts)
+    truncated = len(texts) < len(paragraphs)
+    if max_chars and len(text) > max_chars:
+        text, truncated = text[:max_chars], True
+    stats = ExtractionStats(len(paragraphs), len(texts), 0, len(text), truncated, time.perf_counter() - start)
+    return Extraction(text, stats)
+
+def _pdf_file(path: str, max_pages: Optional[int], max_chars: Optional[int]) -> Extraction:
     p = Path(path)
     if not p.exists():
         raise TextExtractionError(f"PDF file not found: {p.resolve()}")
@@ -13,12 +162,9 @@ def extract_text_from_pdf(path: str) -> str:
         doc = fitz.open(path)
     except Exception as e:
         raise TextExtractionError(f"Failed to open PDF '{p}': {e}")
-    texts = [page.get_text("text") for page in doc]
-    if not texts:
-        raise TextExtractionError(f"No text extracted from PDF: {p.resolve()}")
-    return "\n".join(texts)
+    return _pdf_text(doc, str(p.resolve()), str(p), max_pages, max_chars)
 
-def extract_text_from_docx(path: str) -> str:
+def _docx_file(path: str, max_chars: Optional[int]) -> Extraction:
     p = Path(path)
     if not p.exists():
         raise TextExtractionError(f"DOCX file not found: {p.resolve()}")
@@ -26,15 +172,67 @@ def extract_text_from_docx(path: str) -> str:
         document = Document(path)
     except Exception as e:
         raise TextExtractionError(f"Failed to open DOCX '{p}': {e}")
-    texts = [para.text for para in document.paragraphs]
-    if not texts:
-        raise TextExtractionError(f"No text extracted from DOCX: {p.resolve()}")
-    return "\n".join(texts)
+    return _docx_text(document, str(p.resolve()), max_chars)
+
+def extract_text_from_pdf(path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    return _pdf_file(path, max_pages, max_chars).text
+
+def extract_text_from_docx(path: str, max_chars: Optional[int] = None) -> str:
+    return _docx_file(path, max_chars).text
 
-def extract_text_any(path: str) -> str:
+def extract_document(path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> Extraction:
+    """Text of a PDF/DOCX file and how much of it was read.
+
+    Reading stops once ``max_pages`` PDF pages or ``max_chars`` characters
+    are in (defaults: ``JOBMATCH_MAX_PAGES``/``JOBMATCH_MAX_CHARS``; 0 for no
+    limit). Image-only pages are skipped.
+    """
     suffix = Path(path).suffix.lower()
     if suffix == ".pdf":
-        return extract_text_from_pdf(path)
+        return _pdf_file(path, max_pages, max_chars)
     if suffix in (".doc", ".docx"):
-        return extract_text_from_docx(path)
+        return _docx_file(path, max_chars)
     raise TextExtractionError(f"Unsupported file type: '{suffix}' for file {path}")
+
+def extract_document_bytes(
+    data: bytes, filename: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None
+) -> Extraction:
+    """``extract_document`` for an in-memory file; ``filename`` only selects the format."""
+    suffix = Path(filename).suffix.lower()
+    if suffix == ".pdf":
+        try:
+            doc = fitz.open(stream=data, filetype="pdf")
+        except Exception as e:
+            raise TextExtractionError(f"Failed to open PDF '{filename}': {e}")
+        return _pdf_text(doc, filename, data, max_pages, max_chars)
+    if suffix in (".doc", ".docx"):
+        try:
+            document = Document(BytesIO(data))
+        except Exception as e:
+            raise TextExtractionError(f"Failed to open DOCX '{filename}': {e}")
+        return _docx_text(document, filename, max_chars)
+    raise TextExtractionError(f"Unsupported file type: '{suffix}' for file {filename}")
+
+def _report(stats: ExtractionStats) -> None:
+    # Totals for --profile and /metrics; timing.count is a no-op when disabled.
+    timing.count("extract_documents")
+    timing.count("extract_pages", stats.pages)
+    timing.count("extract_pages_read", stats.read)
+    timing.count("extract_pages_skipped", stats.skipped)
+    timing.count("extract_chars", stats.chars)
+    timing.count("extract_truncated", int(stats.truncated))
+
+@timed("extract_text_any")
+def extract_text_any(path: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    extraction = extract_document(path, max_pages, max_chars)
+    _report(extraction.stats)
+    return extraction.text
+
+@timed("extract_text_from_bytes")
+def extract_text_from_bytes(
+    data: bytes, filename: str, max_pages: Optional[int] = None, max_chars: Optional[int] = None
+) -> str:
+    """Extract text from an in-memory file; ``filename`` only selects the format."""
+    extraction = extract_document_bytes(data, filename, max_pages, max_chars)
+    _report(extraction.stats)
+    return extraction.text
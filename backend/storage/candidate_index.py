@@ -0,0 +1,255 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+import json
+
+import numpy as np
+
+from backend.config import EMBEDDING_MODEL
+from backend.models import CandidateProfile, EducationEntry
+from backend.matching.batch_scoring import CandidateMatrix, pack_bitsets
+from backend.nlp.ner_skill_extractor import EXTRACTOR_VERSION, SKILLS_DICTIONARY_VERSION
+from backend.storage.text_store import TextStore
+
+INDEX_VERSION = 1
+
+# Rows copied/packed per step while finalizing, to bound memory.
+_FINALIZE_CHUNK = 65536
+
+_STRING_COLUMNS = ("ids", "names", "texts")
+_INDEX_FILES = (
+    "meta.json",
+    "embeddings.npy",
+    "embeddings.tmp",
+    "norms.npy",
+    "experience.npy",
+    "skills.npy",
+    "degrees.npy",
+    "certs.npy",
+    "ivf_centroids.npy",
+    "ivf_order.npy",
+    "ivf_offsets.npy",
+) + tuple(f"{c}.bin" for c in _STRING_COLUMNS) + tuple(f"{c}_offsets.npy" for c in _STRING_COLUMNS)
+
+class StringColumn:
+    """Read-only string column stored as a UTF-8 blob plus an offsets array."""
+
+    def __init__(self, store: TextStore, offsets: np.ndarray, empty_is_none: bool = False):
+        self.store = store
+        self.offsets = offsets
+        self.empty_is_none = empty_is_none
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        start = int(self.offsets[i])
+        value = self.store.fetch(start, int(self.offsets[i + 1]) - start)
+        if self.empty_is_none and not value:
+            return None
+        return value
+
+class _Vocab:
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    def encode(self, values: Iterable[str]) -> List[int]:
+        return sorted({self.ids.setdefault(v, len(self.ids)) for v in values})
+
+    def words(self) -> List[str]:
+        return list(self.ids)
+
+class IndexWriter:
+    """Streams candidate batches into an on-disk index directory."""
+
+    def __init__(self, out_dir: str):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        for name in _INDEX_FILES:
+            (self.out_dir / name).unlink(missing_ok=True)
+
+        self.count = 0
+        self.dim: Optional[int] = None
+        self._unembedded_prefix = 0
+        self._emb_file = open(self.out_dir / "embeddings.tmp", "wb")
+        self._norms: List[np.ndarray] = []
+        self._experience: List[np.ndarray] = []
+        self._rows: Dict[str, List[List[int]]] = {"skills": [], "degrees": [], "certs": []}
+        self._vocabs = {"skills": _Vocab(), "degrees": _Vocab(), "certs": _Vocab()}
+        self._strings = {c: TextStore(str(self.out_dir / f"{c}.bin")) for c in _STRING_COLUMNS}
+        self._offsets: Dict[str, List[int]] = {c: [0] for c in _STRING_COLUMNS}
+
+    def add(self, cands: Sequence[CandidateProfile]) -> None:
+        if not cands:
+            return
+        if self.dim is None:
+            self.dim = next((len(c.embedding) for c in cands if c.embedding is not None), None)
+            if self.dim is None:
+                self._unembedded_prefix += len(cands)
+            else:
+                self._emb_file.write(np.zeros((self._unembedded_prefix, self.dim), np.float32).tobytes())
+
+        if self.dim is not None:
+            emb = np.zeros((len(cands), self.dim), dtype=np.float32)
+            for i, c in enumerate(cands):
+                if c.embedding is not None:
+                    emb[i] = c.embedding
+            self._emb_file.write(emb.tobytes())
+            self._norms.append(np.linalg.norm(emb.astype(np.float64), axis=1))
+        else:
+            self._norms.append(np.zeros(len(cands)))
+
+        self._experience.append(np.array(
+            [np.nan if c.total_years_experience is None else c.total_years_experience for c in cands],
+            dtype=np.float64,
+        ))
+        for c in cands:
+            self._rows["skills"].append(self._vocabs["skills"].encode(c.skills))
+            self._rows["degrees"].append(
+                self._vocabs["degrees"].encode(e.degree for e in c.education if e.degree)
+            )
+            self._rows["certs"].append(self._vocabs["certs"].encode(c.certifications))
+            for column, value in (("ids", c.candidate_id), ("names", c.name or ""), ("texts", c.raw_text)):
+                _, length = self._strings[column].append(value)
+                self._offsets[column].append(self._offsets[column][-1] + length)
+
+        self.count += len(cands)
+
+    def close(self) -> int:
+        """Write the final arrays and metadata; returns the number of candidates."""
+        self._emb_file.close()
+        dim = self.dim or 0
+        tmp = self.out_dir / "embeddings.tmp"
+        out = np.lib.format.open_memmap(
+            self.out_dir / "embeddings.npy", mode="w+", dtype=np.float32, shape=(self.count, dim)
+        )
+        if self.count and dim:
+            src = np.memmap(tmp, dtype=np.float32, mode="r", shape=(self.count, dim))
+            for start in range(0, self.count, _FINALIZE_CHUNK):
+                out[start : start + _FINALIZE_CHUNK] = src[start : start + _FINALIZE_CHUNK]
+            del src
+        out.flush()
+        del out
+        tmp.unlink()
+
+        np.save(self.out_dir / "norms.npy", np.concatenate(self._norms) if self._norms else np.zeros(0))
+        np.save(
+            self.out_dir / "experience.npy",
+            np.concatenate(self._experience) if self._experience else np.zeros(0),
+        )
+
+        for field, vocab in self._vocabs.items():
+            rows = self._rows[field]
+            width = len(vocab.ids)
+            bits = np.lib.format.open_memmap(
+                self.out_dir / f"{field}.npy", mode="w+", dtype=np.uint8, shape=(self.count, (width + 7) // 8)
+            )
+            for start in range(0, self.count, _FINALIZE_CHUNK):
+                bits[start : start + _FINALIZE_CHUNK] = pack_bitsets(rows[start : start + _FINALIZE_CHUNK], width)
+            bits.flush()
+            del bits
+
+        for column, store in self._strings.items():
+            store.close()
+            np.save(self.out_dir / f"{column}_offsets.npy", np.asarray(self._offsets[column], dtype=np.int64))
+
+        meta = {
+            "index_version": INDEX_VERSION,
+            "count": self.count,
+            "dim": dim,
+            "embedding_model": EMBEDDING_MODEL,
+            "skills_dictionary_version": SKILLS_DICTIONARY_VERSION,
+            "extractor_version": EXTRACTOR_VERSION,
+            "skill_vocab": self._vocabs["skills"].words(),
+            "degree_vocab": self._vocabs["degrees"].words(),
+            "cert_vocab": self._vocabs["certs"].words(),
+        }
+        (self.out_dir / "meta.json").write_text(json.dumps(meta))
+        return self.count
+
+def build_index(out_dir: str, batches: Iterable[Sequence[CandidateProfile]]) -> int:
+    """Write every candidate from ``batches`` into a new index at ``out_dir``."""
+    writer = IndexWriter(out_dir)
+    for batch in batches:
+        writer.add(batch)
+    return writer.close()
+
+class CandidateIndex:
+    """Read-only, memory-mapped view of an index written by ``build_index``.
+
+    Opening only reads ``meta.json`` and maps the arrays, so startup cost does
+    not depend on the number of candidates.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = Path(index_dir)
+        meta_path = self.index_dir / "meta.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Candidate index not found: {self.index_dir.resolve()}")
+        self.meta = json.loads(meta_path.read_text())
+        if self.meta.get("index_version") != INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported candidate index version {self.meta.get('index_version')} "
+                f"(expected {INDEX_VERSION}); rebuild the index"
+            )
+        if self.meta["embedding_model"] != EMBEDDING_MODEL:
+            raise ValueError(
+                f"Index was built with embedding model '{self.meta['embedding_model']}', "
+                f"but '{EMBEDDING_MODEL}' is configured; rebuild the index"
+            )
+        if self.meta.get("skills_dictionary_version") != SKILLS_DICTIONARY_VERSION:
+            raise ValueError("Index was built with a different skills dictionary; rebuild the index")
+        if self.meta.get("extractor_version") != EXTRACTOR_VERSION:
+            raise ValueError(
+                f"Index was built with skill extractor version {self.meta.get('extractor_version')} "
+                f"(current {EXTRACTOR_VERSION}); rebuild the index"
+            )
+
+        def load(name: str) -> np.ndarray:
+            return np.load(self.index_dir / name, mmap_mode="r")
+
+        strings = {
+            c: StringColumn(
+                TextStore(str(self.index_dir / f"{c}.bin")),
+                load(f"{c}_offsets.npy"),
+                empty_is_none=(c == "names"),
+            )
+            for c in _STRING_COLUMNS
+        }
+        self.texts = strings["texts"]
+        self.matrix = CandidateMatrix(
+            ids=strings["ids"],
+            names=strings["names"],
+            embeddings=load("embeddings.npy"),
+            norms=load("norms.npy"),
+            experience=load("experience.npy"),
+            skill_vocab=self.meta["skill_vocab"],
+            skill_bits=load("skills.npy"),
+            degree_vocab=self.meta["degree_vocab"],
+            degree_bits=load("degrees.npy"),
+            cert_vocab=self.meta["cert_vocab"],
+            cert_bits=load("certs.npy"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.matrix)
+
+    def profile(self, i: int) -> CandidateProfile:
+        """Rebuild the scoring-relevant parts of candidate ``i`` as a profile."""
+        m = self.matrix
+        skills = sorted(_bits_to_words(m.skill_bits[i], m.skill_vocab))
+        exp = float(m.experience[i])
+        return CandidateProfile(
+            candidate_id=m.ids[i],
+            name=m.names[i],
+            education=[EducationEntry(degree=d) for d in sorted(_bits_to_words(m.degree_bits[i], m.degree_vocab))],
+            skills=skills,
+            technologies=skills,
+            certifications=sorted(_bits_to_words(m.cert_bits[i], m.cert_vocab)),
+            total_years_experience=None if np.isnan(exp) else exp,
+            embedding=np.array(m.embeddings[i], dtype=np.float32) if m.embeddings.shape[1] else None,
+            raw_text=self.texts[i],
+        )
+
+def _bits_to_words(row: np.ndarray, vocab: List[str]) -> List[str]:
+    ids = np.flatnonzero(np.unpackbits(np.asarray(row), count=len(vocab)))
+    return [vocab[j] for j in ids]
@@ -0,0 +1,395 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import os
+import threading
+
+import numpy as np
+from pydantic import BaseModel, TypeAdapter, model_validator
+
+from backend.config import POOL_DIR
+from backend.models import CandidateProfile, EducationEntry, JobProfile, MatchResult
+from backend.matching.batch_scoring import CandidateMatrix, pack_bitsets, score_candidates, overall_scores
+from backend.matching.ranking import Recorder, TopN, build_match_result
+from backend.storage.text_store import TextStore
+
+# Compact once deleted rows outnumber live ones (and there are enough of them
+# for a rewrite to be worth it).
+_COMPACT_MIN_DELETED = 1024
+# Past this many segments the smaller half is merged into one, so startup and
+# the number of open text files stay bounded however many adds there are.
+_MAX_SEGMENTS = 16
+
+class _PoolRecord(BaseModel):
+    # The scoring-relevant parts of a profile; see CandidatePool.profile.
+    candidate_id: str
+    name: Optional[str] = None
+    skills: List[str] = []
+    degrees: List[str] = []
+    certifications: List[str] = []
+    total_years_experience: Optional[float] = None
+    source: Optional[str] = None
+    text: Tuple[int, int]
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_profile(cls, data):
+        # Older segments stored the whole profile under "profile".
+        if isinstance(data, dict) and "profile" in data:
+            p = data["profile"]
+            degrees = [e["degree"] for e in p.get("education", []) if e.get("degree")]
+            data = {**p, "degrees": degrees, "source": data.get("source"), "text": data["text"]}
+        return data
+
+_SEGMENT = TypeAdapter(List[_PoolRecord])
+
+class _BitColumn:
+    """Growable packed bitset column over a vocabulary that only ever grows."""
+
+    def __init__(self):
+        self.vocab: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self.bits = np.zeros((0, 0), dtype=np.uint8)
+
+    def set_rows(self, start: int, values: Sequence[Iterable[str]], capacity: int) -> None:
+        ids = self._ids
+        rows = [sorted({ids[v] if v in ids else self._add(v) for v in vs}) for vs in values]
+        width = (len(self.vocab) + 7) // 8
+        if self.bits.shape[0] < capacity or self.bits.shape[1] < width:
+            cols = self.bits.shape[1] if width <= self.bits.shape[1] else max(width, 2 * self.bits.shape[1])
+            grown = np.zeros((capacity, cols), dtype=np.uint8)
+            grown[: self.bits.shape[0], : self.bits.shape[1]] = self.bits
+            self.bits = grown
+        packed = pack_bitsets(rows, len(self.vocab))
+        self.bits[start : start + len(rows), : packed.shape[1]] = packed
+
+    def _add(self, value: str) -> int:
+        self._ids[value] = len(self.vocab)
+        self.vocab.append(value)
+        return self._ids[value]
+
+    def view(self, n: int) -> np.ndarray:
+        return self.bits[:n, : (len(self.vocab) + 7) // 8]
+
+    def words(self, row: int) -> List[str]:
+        ids = np.flatnonzero(np.unpackbits(self.bits[row], count=len(self.vocab)))
+        return [self.vocab[j] for j in ids]
+
+def _grow(arr: np.ndarray, capacity: int) -> np.ndarray:
+    if len(arr) >= capacity:
+        return arr
+    grown = np.zeros((max(capacity, 2 * len(arr)),) + arr.shape[1:], dtype=arr.dtype)
+    grown[: len(arr)] = arr
+    return grown
+
+class CandidatePool:
+    """Mutable, persistent candidate pool the API matches jobs against.
+
+    Only columns live in memory: ids, names, embeddings, norms, experience
+    and skill/degree/cert bitsets. Profiles are rebuilt from them (with the
+    raw text read back from disk) only for the candidates that make a top N,
+    as ``CandidateIndex.profile`` does; fields that don't affect scoring are
+    not kept.
+
+    On disk every ``add`` writes one immutable segment (``NNNNNN.npy``
+    embeddings, ``NNNNNN.txt`` raw texts and ``NNNNNN.jsonl`` records, the
+    last written atomically so a segment either exists or doesn't) and deletes
+    are appended to ``deleted.txt``. Once there are more than ``_MAX_SEGMENTS``
+    segments the smaller half is merged; when deleted rows outnumber live ones
+    the pool is compacted into a single new segment.
+    """
+
+    def __init__(self, pool_dir: str = POOL_DIR):
+        self.pool_dir = Path(pool_dir)
+        self.segments_dir = self.pool_dir / "segments"
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._count = 0
+        self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        self._norms = np.zeros(0)
+        self._experience = np.zeros(0)
+        self._alive = np.zeros(0, dtype=bool)
+        self._bits = {"skills": _BitColumn(), "degrees": _BitColumn(), "certs": _BitColumn()}
+        self._ids: List[str] = []
+        self._names: List[Optional[str]] = []
+        self._sources: List[Optional[str]] = []
+        self._spans: List[Tuple[int, int, int]] = []
+        self._rows: Dict[str, int] = {}
+        self._texts: Dict[int, TextStore] = {}
+        self._segment = 0
+
+    def load(self) -> int:
+        """(Re)load the pool from disk; returns the number of live candidates."""
+        with self._lock:
+            self._close_texts()
+            self._reset()
+            self.segments_dir.mkdir(parents=True, exist_ok=True)
+            for meta in sorted(self.segments_dir.glob("*.jsonl")):
+                seg = int(meta.stem)
+                lines = [line for line in meta.read_text().splitlines() if line]
+                # One validation pass over the whole segment is much faster
+                # than parsing line by line.
+                records = _SEGMENT.validate_json("[" + ",".join(lines) + "]")
+                self._texts[seg] = TextStore(str(meta.with_suffix(".txt")))
+                self._append(records, [(seg, *r.text) for r in records], np.load(meta.with_suffix(".npy")))
+                self._segment = max(self._segment, seg)
+            deleted = self.pool_dir / "deleted.txt"
+            if deleted.exists():
+                self._kill(deleted.read_text().split())
+            return len(self)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, cands: Sequence[CandidateProfile], sources: Optional[Sequence[Optional[str]]] = None) -> List[str]:
+        """Store ``cands`` (``sources`` are e.g. upload filenames); returns their ids."""
+        if not cands:
+            return []
+        sources = list(sources) if sources is not None else [None] * len(cands)
+        with self._lock:
+            self._write_segment(cands, sources)
+            if len(self._texts) > _MAX_SEGMENTS:
+                self._merge_segments()
+                self._maybe_compact()
+        return [c.candidate_id for c in cands]
+
+    def delete(self, candidate_ids: Iterable[str]) -> List[str]:
+        """Remove candidates; returns the ids that were actually in the pool."""
+        with self._lock:
+            removed = [i for i in dict.fromkeys(candidate_ids) if i in self._rows]
+            if not removed:
+                return []
+            self.pool_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.pool_dir / "deleted.txt", "a") as f:
+                f.write("".join(f"{i}\n" for i in removed))
+            self._kill(removed)
+            self._maybe_compact()
+            return removed
+
+    def _maybe_compact(self) -> None:
+        dead = self._count - len(self._rows)
+        if dead >= _COMPACT_MIN_DELETED and dead > len(self._rows):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the live candidates as one segment and drop everything else."""
+        with self._lock:
+            live = sorted(self._rows.values())
+            cands = [self.profile(r) for r in live]
+            sources = [self._sources[r] for r in live]
+            old = sorted(self.segments_dir.glob("*.jsonl"))
+            segment = self._segment
+            self._close_texts()
+            self._reset()
+            self._segment = segment
+            if cands:
+                self._write_segment(cands, sources)
+            # The new segment is complete before the old ones go, so a crash
+            # here at worst leaves duplicates, which load() resolves.
+            for meta in old:
+                for suffix in (".jsonl", ".npy", ".txt"):
+                    meta.with_suffix(suffix).unlink(missing_ok=True)
+            (self.pool_dir / "deleted.txt").unlink(missing_ok=True)
+
+    def get(self, candidate_id: str) -> Optional[CandidateProfile]:
+        with self._lock:
+            row = self._rows.get(candidate_id)
+            return None if row is None else self.profile(row)
+
+    def list_candidates(self, offset: int = 0, limit: int = 100) -> List[Dict]:
+        """Summaries of live candidates, oldest first."""
+        with self._lock:
+            rows = sorted(self._rows.values())[offset : offset + limit]
+            return [
+                {
+                    "candidate_id": self._ids[r],
+                    "name": self._names[r],
+                    "source": self._sources[r],
+                    "skills": sorted(self._bits["skills"].words(r)),
+                    "total_years_experience": self._years(r),
+                }
+                for r in rows
+            ]
+
+    def _years(self, row: int) -> Optional[float]:
+        exp = float(self._experience[row])
+        return None if np.isnan(exp) else exp
+
+    def profile(self, row: int) -> CandidateProfile:
+        """Rebuild the scoring-relevant parts of ``row`` as a profile, with its raw text."""
+        seg, offset, length = self._spans[row]
+        skills = sorted(self._bits["skills"].words(row))
+        return CandidateProfile(
+            candidate_id=self._ids[row],
+            name=self._names[row],
+            education=[EducationEntry(degree=d) for d in sorted(self._bits["degrees"].words(row))],
+            skills=skills,
+            technologies=skills,
+            certifications=sorted(self._bits["certs"].words(row)),
+            total_years_experience=self._years(row),
+            embedding=np.array(self._embeddings[row]) if self._embeddings.shape[1] else None,
+            raw_text=self._texts[seg].fetch(offset, length),
+        )
+
+    def matrix(self) -> Tuple[CandidateMatrix, np.ndarray]:
+        """Scoring view over every stored row, plus the mask of live rows.
+
+        The view stays valid without the lock: adds only write past its rows
+        or into new arrays, and the ids, vocabularies and mask are copies.
+        """
+        with self._lock:
+            n = self._count
+            matrix = CandidateMatrix(
+                ids=self._ids[:n],
+                names=self._names[:n],
+                embeddings=self._embeddings[:n],
+                norms=self._norms[:n],
+                experience=self._experience[:n],
+                skill_vocab=list(self._bits["skills"].vocab),
+                skill_bits=self._bits["skills"].view(n),
+                degree_vocab=list(self._bits["degrees"].vocab),
+                degree_bits=self._bits["degrees"].view(n),
+                cert_vocab=list(self._bits["certs"].vocab),
+                cert_bits=self._bits["certs"].view(n),
+            )
+            return matrix, self._alive[:n].copy()
+
+    def match(
+        self,
+        job: JobProfile,
+        top_n: int = 10,
+        weights: Dict[str, float] | None = None,
+        record: Optional[Recorder] = None,
+    ) -> List[MatchResult]:
+        """Top ``top_n`` live candidates; ``record`` gets the score columns and candidate ids.
+
+        Scoring runs on a snapshot outside the lock, so matches run alongside
+        each other and alongside adds; a winner deleted meanwhile is left out.
+        """
+        matrix, alive = self.matrix()
+        rows = np.flatnonzero(alive)
+        columns = score_candidates(job, matrix)
+        if record is not None:
+            record({c: v[rows] for c, v in columns.items()}, [matrix.ids[r] for r in rows])
+        scores = overall_scores(columns, weights)
+        top: TopN[int] = TopN(top_n)
+        top.push_many(scores[rows], rows)
+        winners = [self.get(matrix.ids[row]) for _, row in top.items()]
+        return [build_match_result(job, cand, weights) for cand in winners if cand is not None]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "candidates": len(self._rows),
+                "deleted_rows": self._count - len(self._rows),
+                "segments": len(self._texts),
+                "skill_vocab": len(self._bits["skills"].vocab),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_texts()
+
+    def _close_texts(self) -> None:
+        for store in self._texts.values():
+            store.close()
+
+    def _write_segment(self, cands: Sequence[CandidateProfile], sources: List[Optional[str]]) -> None:
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self._segment += 1
+        seg = self._segment
+        base = self.segments_dir / f"{seg:06d}"
+
+        dim = self._embeddings.shape[1] or max((len(c.embedding) for c in cands if c.embedding is not None), default=0)
+        emb = np.zeros((len(cands), dim), dtype=np.float32)
+        for i, c in enumerate(cands):
+            if c.embedding is not None:
+                emb[i] = c.embedding
+        np.save(base.with_suffix(".npy"), emb)
+
+        store = TextStore(str(base.with_suffix(".txt")))
+        spans = [store.append(c.raw_text) for c in cands]
+        # Segments are immutable; fetch() maps the file again when it is read.
+        store.close()
+        records = [
+            _PoolRecord(
+                candidate_id=c.candidate_id,
+                name=c.name,
+                skills=c.skills,
+                degrees=[e.degree for e in c.education if e.degree],
+                certifications=c.certifications,
+                total_years_experience=c.total_years_experience,
+                source=source,
+                text=span,
+            )
+            for c, source, span in zip(cands, sources, spans)
+        ]
+
+        tmp = base.with_suffix(".jsonl.tmp")
+        with open(tmp, "w") as f:
+            f.writelines(r.model_dump_json() + "\n" for r in records)
+        os.replace(tmp, base.with_suffix(".jsonl"))
+
+        self._texts[seg] = store
+        self._append(records, [(seg, *span) for span in spans], emb)
+
+    def _merge_segments(self) -> None:
+        # Rewrite the live rows of the smaller half of the segments as one new
+        # segment; their old rows become dead, as after a delete.
+        sizes = dict.fromkeys(self._texts, 0)
+        for row in self._rows.values():
+            sizes[self._spans[row][0]] += 1
+        merge = set(sorted(sizes, key=lambda seg: (sizes[seg], seg))[: len(sizes) // 2 + 1])
+        live = sorted(r for r in self._rows.values() if self._spans[r][0] in merge)
+        cands = [self.profile(r) for r in live]
+        sources = [self._sources[r] for r in live]
+        if cands:
+            self._write_segment(cands, sources)
+        # As in compact(), the merged segment is complete before the old ones go.
+        for seg in merge:
+            self._texts.pop(seg).close()
+            for suffix in (".jsonl", ".npy", ".txt"):
+                (self.segments_dir / f"{seg:06d}").with_suffix(suffix).unlink(missing_ok=True)
+
+    def _append(self, records: List[_PoolRecord], spans: List[Tuple[int, int, int]], emb: np.ndarray) -> None:
+        start, end = self._count, self._count + len(records)
+        if emb.shape[1] and self._embeddings.shape[1] == 0:
+            self._embeddings = np.zeros((len(self._embeddings), emb.shape[1]), dtype=np.float32)
+        elif emb.shape[1] and emb.shape[1] != self._embeddings.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {emb.shape[1]} does not match the pool's {self._embeddings.shape[1]}"
+            )
+        self._embeddings = _grow(self._embeddings, end)
+        self._norms = _grow(self._norms, end)
+        self._experience = _grow(self._experience, end)
+        self._alive = _grow(self._alive, end)
+
+        if emb.shape[1]:
+            self._embeddings[start:end] = emb
+            self._norms[start:end] = np.linalg.norm(emb.astype(np.float64), axis=1)
+        self._experience[start:end] = [
+            np.nan if r.total_years_experience is None else r.total_years_experience for r in records
+        ]
+        self._alive[start:end] = True
+        capacity = len(self._alive)
+        self._bits["skills"].set_rows(start, [r.skills for r in records], capacity)
+        self._bits["degrees"].set_rows(start, [r.degrees for r in records], capacity)
+        self._bits["certs"].set_rows(start, [r.certifications for r in records], capacity)
+
+        # A candidate id seen again (e.g. after an interrupted compaction)
+        # resolves to its newest row.
+        self._kill([r.candidate_id for r in records])
+        for i, r in enumerate(records):
+            self._rows[r.candidate_id] = start + i
+        self._ids.extend(r.candidate_id for r in records)
+        self._names.extend(r.name for r in records)
+        self._sources.extend(r.source for r in records)
+        self._spans.extend(spans)
+        self._count = end
+
+    def _kill(self, candidate_ids: Iterable[str]) -> None:
+        for i in candidate_ids:
+            row = self._rows.pop(i, None)
+            if row is not None:
+                self._alive[row] = False
@@ -0,0 +1,147 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from backend.config import FEATURE_CACHE_DIR, FEATURE_CACHE_MAX_BYTES
+
+Entities = Dict[str, List[str]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    key TEXT PRIMARY KEY,
+    entities TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS features_last_access ON features (last_access);
+"""
+
+# SQLite caps the number of bound parameters per statement.
+_QUERY_CHUNK = 500
+
+class FeatureCache:
+    """On-disk cache of extracted entities and embeddings keyed by content hash.
+
+    Entries are evicted least-recently-used first once the stored payload
+    exceeds ``max_bytes``. The cache is a single SQLite file, so it can be
+    shared between runs and between worker processes.
+    """
+
+    def __init__(self, cache_dir: str = FEATURE_CACHE_DIR, max_bytes: int = FEATURE_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.cache_dir / "features.sqlite"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __getstate__(self):
+        # Worker processes reopen their own connection.
+        return {"cache_dir": self.cache_dir, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(str(state["cache_dir"]), state["max_bytes"])
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Tuple[Entities, np.ndarray]]:
+        found: Dict[str, Tuple[Entities, np.ndarray]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[start : start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT key, entities, embedding FROM features "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, entities, embedding in rows:
+                    found[key] = (json.loads(entities), np.frombuffer(embedding, dtype=np.float32))
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE features SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.commit()
+            self.hits += sum(1 for k in keys if k in found)
+            self.misses += sum(1 for k in keys if k not in found)
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, Entities, np.ndarray]]) -> None:
+        now = time.time()
+        rows = []
+        for key, entities, embedding in items:
+            ents_json = json.dumps(entities)
+            emb_bytes = np.asarray(embedding, dtype=np.float32).tobytes()
+            rows.append((key, ents_json, emb_bytes, len(ents_json) + len(emb_bytes), now))
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO features (key, entities, embedding, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM features").fetchone()
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% of the budget so eviction doesn't run on every insert.
+        target = int(self.max_bytes * 0.9)
+        cursor = self._conn.execute("SELECT key, size FROM features ORDER BY last_access")
+        doomed = []
+        for key, size in cursor:
+            if total <= target:
+                break
+            doomed.append((key,))
+            total -= size
+        cursor.close()
+        self._conn.executemany("DELETE FROM features WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def add_counts(self, hits: int, misses: int, evictions: int = 0) -> None:
+        """Fold in counters from a copy of this cache used elsewhere (a worker process)."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM features"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM features")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from typing import Dict, Generic, Optional, Tuple, TypeVar
+import hashlib
+import threading
+import time
+
+from backend.config import JOB_CACHE_MAX_ENTRIES, JOB_CACHE_TTL_SECONDS
+from backend.models import JobProfile
+
+V = TypeVar("V")
+
+class TTLCache(Generic[V]):
+    """In-process LRU whose entries expire ``ttl_seconds`` after they were stored.
+
+    The least recently used entry is dropped once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = JOB_CACHE_MAX_ENTRIES, ttl_seconds: float = JOB_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, value: V) -> None:
+        if self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (expires, _) in self._entries.items() if expires <= now]
+            for k in expired:
+                del self._entries[k]
+            self.evictions += len(expired)
+            self._entries[key] = (now + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+class JobCache(TTLCache[JobProfile]):
+    """Parsed job profiles keyed by the SHA-256 of the uploaded file.
+
+    The hex digest doubles as the ``job_id`` API clients pass back instead of
+    re-uploading.
+    """
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
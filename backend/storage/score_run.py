@@ -0,0 +1,175 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+import json
+import os
+
+import numpy as np
+
+from backend.config import DEFAULT_WEIGHTS
+from backend.matching.batch_scoring import COMPONENTS
+from backend.matching.ranking import TopN, build_match_result
+from backend.models import CandidateProfile, JobProfile, MatchComponentScore, MatchResult
+from backend.storage.candidate_index import CandidateIndex
+from backend.storage.text_store import TextStore
+
+SCORE_RUN_VERSION = 1
+
+_RUN_FILES = ("run.json", "job.json", "components.npy", "profiles.bin", "profile_spans.npy", "rows.npy")
+
+Weights = Optional[Mapping[str, float]]
+
+def resolve_weights(weights: Weights) -> Dict[str, float]:
+    """``weights`` over ``DEFAULT_WEIGHTS``; components left out keep their default."""
+    unknown = set(weights or ()) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown score components {sorted(unknown)}; expected some of {list(COMPONENTS)}")
+    return {**DEFAULT_WEIGHTS, **(weights or {})}
+
+def weight_matrix(weights: Sequence[Weights]) -> np.ndarray:
+    """(K, 5) matrix of weight configurations in ``COMPONENTS`` order."""
+    return np.array([[resolve_weights(w)[c] for c in COMPONENTS] for w in weights], dtype=np.float64).reshape(-1, len(COMPONENTS))
+
+def _scoring_only(cand: CandidateProfile) -> CandidateProfile:
+    # Results are rebuilt from the stored components; text and embedding aren't needed.
+    return cand.model_copy(update={"raw_text": "", "raw_text_span": None, "embedding": None})
+
+class ScoreRun:
+    """Component scores of one job against a whole candidate pool.
+
+    ``components`` is the (N, 5) matrix in ``COMPONENTS`` order, so ranking
+    under other weights is one matrix product; profiles are only loaded for
+    the candidates that make a top N.
+    """
+
+    def __init__(self, job: JobProfile, components: np.ndarray, load_profile: Callable[[int], CandidateProfile]):
+        self.job = job
+        self.components = components
+        self.profile = lru_cache(maxsize=4096)(load_profile)
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def fit_scores(self, weights: Sequence[Weights]) -> np.ndarray:
+        """(N, K) overall scores (0-100) under each of ``weights``."""
+        return self.components @ weight_matrix(weights).T * 100.0
+
+    def rerank(self, weights: Sequence[Weights], top_n: int = 10) -> List[List[MatchResult]]:
+        """Top ``top_n`` results under each weight configuration."""
+        resolved = [resolve_weights(w) for w in weights]
+        fits = self.fit_scores(resolved)
+        ranked = []
+        for k, w in enumerate(resolved):
+            top: TopN[int] = TopN(top_n)
+            top.push_many(fits[:, k], range(len(self)))
+            ranked.append([self._result(row, w) for _, row in top.items()])
+        return ranked
+
+    def _result(self, row: int, weights: Dict[str, float]) -> MatchResult:
+        comps = MatchComponentScore(**{c: float(v) for c, v in zip(COMPONENTS, self.components[row])})
+        return build_match_result(self.job, self.profile(int(row)), weights, comps)
+
+    @classmethod
+    def load(cls, run_dir: str) -> "ScoreRun":
+        path = Path(run_dir)
+        meta_path = path / "run.json"
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Score run not found: {path.resolve()}")
+        meta = json.loads(meta_path.read_text())
+        if meta.get("version") != SCORE_RUN_VERSION or meta.get("components") != list(COMPONENTS):
+            raise ValueError(f"Unsupported score run format in {path}; rank again with --save-scores")
+        job = JobProfile.model_validate_json((path / "job.json").read_text())
+        components = np.load(path / "components.npy")
+        if meta.get("index"):
+            index = CandidateIndex(meta["index"])
+            rows = np.load(path / "rows.npy")
+
+            def load_profile(i: int) -> CandidateProfile:
+                return _scoring_only(index.profile(int(rows[i])))
+        else:
+            store = TextStore(str(path / "profiles.bin"))
+            spans = np.load(path / "profile_spans.npy")
+
+            def load_profile(i: int) -> CandidateProfile:
+                return CandidateProfile.model_validate_json(store.fetch(*spans[i]))
+        return cls(job, components, load_profile)
+
+class ScoreRunWriter:
+    """Collects the component columns of a ranking run, batch by batch.
+
+    Pass ``add`` as the ``record`` hook of the ranking functions. With
+    ``out_dir`` the run is written there (profiles stream to disk as they
+    arrive); otherwise it is kept in memory. Runs over a prebuilt index
+    (``index_dir``) are recorded as index rows instead of profiles. With
+    ``lookup`` the recorded items are keys (e.g. pool candidate ids) that it
+    turns into profiles: an in-memory run keeps only the keys and looks up the
+    winners when it is re-ranked.
+    """
+
+    def __init__(
+        self,
+        job: JobProfile,
+        out_dir: Optional[str] = None,
+        index_dir: Optional[str] = None,
+        lookup: Optional[Callable[[Any], CandidateProfile]] = None,
+    ):
+        self.job = job
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.index_dir = str(Path(index_dir).resolve()) if index_dir else None
+        self.lookup = lookup
+        self._blocks: List[np.ndarray] = []
+        self._items: list = []
+        self._store: Optional[TextStore] = None
+        if self.out_dir is not None:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            for name in _RUN_FILES:
+                (self.out_dir / name).unlink(missing_ok=True)
+            if self.index_dir is None:
+                self._store = TextStore(str(self.out_dir / "profiles.bin"))
+
+    def add(self, columns: Dict[str, np.ndarray], items: Sequence) -> None:
+        """Record a scored batch: ``items`` are profiles, ``lookup`` keys, or matrix rows for an index run."""
+        self._blocks.append(np.column_stack([np.asarray(columns[c], dtype=np.float64) for c in COMPONENTS]))
+        if self.index_dir is not None:
+            self._items.extend(int(i) for i in items)
+        elif self.lookup is not None and self._store is None:
+            self._items.extend(items)
+        elif self.lookup is not None:
+            self._items.extend(self._store.append(_scoring_only(self.lookup(k)).model_dump_json()) for k in items)
+        elif self._store is not None:
+            self._items.extend(self._store.append(_scoring_only(c).model_dump_json()) for c in items)
+        else:
+            self._items.extend(_scoring_only(c) for c in items)
+
+    def close(self) -> ScoreRun:
+        components = np.concatenate(self._blocks) if self._blocks else np.zeros((0, len(COMPONENTS)))
+        if self.out_dir is None:
+            if self.lookup is not None:
+                keys, lookup = self._items, self.lookup
+                return ScoreRun(self.job, components, lambda i: lookup(keys[i]))
+            return ScoreRun(self.job, components, self._items.__getitem__)
+        np.save(self.out_dir / "components.npy", components)
+        if self.index_dir is not None:
+            np.save(self.out_dir / "rows.npy", np.asarray(self._items, dtype=np.int64))
+        else:
+            np.save(self.out_dir / "profile_spans.npy", np.asarray(self._items, dtype=np.int64).reshape(-1, 2))
+            self._store.close()
+        (self.out_dir / "job.json").write_text(self.job.model_dump_json())
+        # run.json goes last: a directory without it is an unfinished run.
+        meta = {"version": SCORE_RUN_VERSION, "components": list(COMPONENTS), "count": len(components), "index": self.index_dir}
+        tmp = self.out_dir / "run.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.out_dir / "run.json")
+        return ScoreRun.load(str(self.out_dir))
+
+def score_run_writers(
+    out_dir: str,
+    jobs: Sequence[JobProfile],
+    labels: Optional[Sequence[str]] = None,
+    index_dir: Optional[str] = None,
+    lookup: Optional[Callable[[Any], CandidateProfile]] = None,
+) -> List[ScoreRunWriter]:
+    """Writers for ``jobs``: into ``out_dir`` itself, or ``out_dir/<label>`` per job when ``labels`` are given."""
+    if labels is None:
+        return [ScoreRunWriter(job, out_dir, index_dir, lookup) for job in jobs]
+    return [ScoreRunWriter(job, str(Path(out_dir) / label), index_dir, lookup) for job, label in zip(jobs, labels)]
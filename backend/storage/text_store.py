@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import Optional, Tuple
+import mmap
+import threading
+
+class TextStore:
+    """Append-only UTF-8 text file addressed by ``(offset, length)`` byte ranges.
+
+    Reads go through a memory map that is refreshed when the file has grown
+    since it was mapped, so texts can be fetched right after being appended.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self._writer = None
+        self._map: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {"path": str(self.path)}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    def append(self, text: str) -> Tuple[int, int]:
+        data = text.encode("utf-8", "surrogatepass")
+        with self._lock:
+            if self._writer is None:
+                self._writer = open(self.path, "ab")
+            offset = self._writer.tell()
+            self._writer.write(data)
+        return offset, len(data)
+
+    def fetch(self, offset: int, length: int) -> str:
+        if length == 0:
+            return ""
+        with self._lock:
+            end = offset + length
+            if self._map is None or end > len(self._map):
+                self._remap(end)
+            return self._map[offset:end].decode("utf-8", "surrogatepass")
+
+    def _remap(self, needed: int) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        size = self.path.stat().st_size
+        if needed > size:
+            raise IndexError(f"Byte range ends at {needed} but {self.path} holds {size} bytes")
+        if size == 0:
+            return
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            if self._map is not None:
+                self._map.close()
+                self._map = None
@@ -0,0 +1,53 @@
+"""NDJSON output: one JSON record per line, written as soon as it exists.
+
+Records are the ``Stream*`` models in ``backend.models``: ``progress`` while
+resumes are parsed, ``skipped`` for unreadable files, one ``result`` per
+ranked candidate and a final ``done``. Each is serialized with pydantic's
+``model_dump_json`` and no indentation.
+"""
+import sys
+from typing import IO, Iterator, Optional, Sequence
+
+from pydantic import BaseModel
+
+from backend.models import MatchResult, StreamDone, StreamProgress, StreamResult, StreamSkipped
+from backend.parsing.parallel import Progress
+from backend.parsing.resume_parser import ParseFailure
+
+def ndjson_line(record: BaseModel) -> str:
+    return record.model_dump_json() + "\n"
+
+def result_records(matches: Sequence[MatchResult], job: Optional[str] = None) -> Iterator[StreamResult]:
+    for rank, match in enumerate(matches, 1):
+        yield StreamResult(job=job, rank=rank, match=match)
+
+class NdjsonWriter:
+    """Writes records to ``out`` (stdout); ``done`` reports the results and
+    skipped files since the previous ``done``, so a watch loop gets per-update counts."""
+
+    def __init__(self, out: Optional[IO[str]] = None):
+        self.out = out or sys.stdout
+        self.results = 0
+        self.skipped = 0
+
+    def write(self, record: BaseModel) -> None:
+        self.out.write(ndjson_line(record))
+        self.out.flush()
+
+    def progress(self, stage: str) -> Progress:
+        """A ``progress(done, total)`` callback writing ``stage`` records."""
+        return lambda done, total: self.write(StreamProgress(stage=stage, done=done, total=total))
+
+    def failures(self, failures: Sequence[ParseFailure]) -> None:
+        for f in failures:
+            self.write(StreamSkipped(path=f.path, error=f.error))
+        self.skipped += len(failures)
+
+    def matches(self, matches: Sequence[MatchResult], job: Optional[str] = None) -> None:
+        for record in result_records(matches, job):
+            self.write(record)
+        self.results += len(matches)
+
+    def done(self) -> None:
+        self.write(StreamDone(results=self.results, skipped=self.skipped))
+        self.results = self.skipped = 0
@@ -0,0 +1,181 @@
+"""Timing spans for the pipeline stages.
+
+Spans are off by default and then cost a single flag check. ``enable()`` turns
+them on: durations go into per-stage histograms (exported by the API's
+/metrics) and, with ``keep_samples``, raw samples for the CLIs' ``--profile``
+percentiles. ``count()`` keeps running totals next to them (pages and
+characters extracted, ...). Stages that run inside ``ParserPool`` worker
+processes are not collected.
+"""
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+import threading
+import time
+
+import numpy as np
+
+# Upper bounds in seconds, as Prometheus ``le`` buckets.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram:
+    def __init__(self, keep_samples: bool = False):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.samples: Optional[List[float]] = [] if keep_samples else None
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+        if self.samples is not None:
+            self.samples.append(seconds)
+
+class Histograms:
+    """Thread-safe histograms keyed by a tuple of label values."""
+
+    def __init__(self, keep_samples: bool = False):
+        self.keep_samples = keep_samples
+        self._lock = threading.Lock()
+        self._hists: Dict[Tuple[str, ...], Histogram] = {}
+
+    def observe(self, key: Tuple[str, ...], seconds: float) -> None:
+        with self._lock:
+            hist = self._hists.get(key)
+            if hist is None:
+                hist = self._hists[key] = Histogram(self.keep_samples)
+            hist.observe(seconds)
+
+    def items(self) -> List[Tuple[Tuple[str, ...], Histogram]]:
+        with self._lock:
+            return sorted(self._hists.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hists.clear()
+
+    def prometheus(self, metric: str, labels: Sequence[str], help_text: str) -> List[str]:
+        """Prometheus text-format lines for every histogram in the set."""
+        lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for key, hist in self.items():
+            base = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(labels, key))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (float("inf"),), hist.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{{base}{sep}le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{base}}} {hist.sum!r}")
+            lines.append(f"{metric}_count{{{base}}} {hist.count}")
+        return lines
+
+class Counters:
+    """Thread-safe running totals keyed by name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+
+    def add(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0) + value
+
+    def items(self) -> List[Tuple[str, float]]:
+        with self._lock:
+            return sorted(self._totals.items())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._totals.clear()
+
+    def prometheus(self, metric: str, label: str, help_text: str) -> List[str]:
+        lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{{label}="{_escape(name)}"}} {value!r}' for name, value in self.items()]
+        return lines
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+stages = Histograms()
+counters = Counters()
+_enabled = False
+
+def enable(keep_samples: bool = False) -> None:
+    """Start recording spans; ``keep_samples`` keeps every duration for percentiles."""
+    global _enabled, stages
+    if keep_samples != stages.keep_samples:
+        stages = Histograms(keep_samples)
+    _enabled = True
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+def is_enabled() -> bool:
+    return _enabled
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        stages.observe((self.stage,), time.perf_counter() - self.start)
+
+_NULL_SPAN = nullcontext()
+
+def span(stage: str):
+    """``with span("stage"): ...`` records the block's duration when enabled."""
+    return _Span(stage) if _enabled else _NULL_SPAN
+
+def count(name: str, value: float = 1) -> None:
+    """Add ``value`` to the running total ``name`` when enabled."""
+    if _enabled:
+        counters.add(name, value)
+
+def timed(stage: str):
+    """Decorator recording each call of the function as ``stage``."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stages.observe((stage,), time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+def summary() -> List[Dict]:
+    """Per-stage call count, total and percentiles (ms), slowest stage first."""
+    rows = []
+    for (stage,), hist in stages.items():
+        row = {"stage": stage, "calls": hist.count, "total_s": hist.sum, "mean_ms": hist.sum / hist.count * 1000}
+        if hist.samples:
+            p50, p90, p99, top = np.percentile(hist.samples, [50, 90, 99, 100]) * 1000
+            row.update(p50_ms=p50, p90_ms=p90, p99_ms=p99, max_ms=top)
+        rows.append(row)
+    rows.sort(key=lambda r: r["total_s"], reverse=True)
+    return rows
+
+def format_summary(wall_seconds: Optional[float] = None) -> str:
+    """``summary()`` as a fixed-width table for the CLIs' ``--profile``."""
+    header = f"{'stage':28s} {'calls':>8s} {'total s':>9s} {'mean ms':>9s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}"
+    lines = [header]
+    for r in summary():
+        pct = " ".join(f"{r.get(k, float('nan')):9.2f}" for k in ("p50_ms", "p90_ms", "p99_ms", "max_ms"))
+        lines.append(f"{r['stage']:28s} {r['calls']:8d} {r['total_s']:9.3f} {r['mean_ms']:9.2f} {pct}")
+    if wall_seconds is not None:
+        lines.append(f"{'wall time':28s} {'':8s} {wall_seconds:9.3f}")
+    for name, value in counters.items():
+        lines.append(f"{name:28s} {value:8g}")
+    return "\n".join(lines)
@@ -0,0 +1,48 @@
+import itertools
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from backend.storage import feature_cache
+from backend.storage.feature_cache import FeatureCache
+
+ENTRY_BYTES = len("{}") + 8 * 4  # entities JSON plus an 8-dim float32 embedding
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    # A strictly increasing clock, so least-recently-used order is unambiguous.
+    clock = itertools.count(1)
+    monkeypatch.setattr(feature_cache, "time", SimpleNamespace(time=lambda: float(next(clock))))
+    cache = FeatureCache(str(tmp_path), max_bytes=5 * ENTRY_BYTES)
+    yield cache
+    cache.close()
+
+def _put(cache, key):
+    cache.put_many([(key, {}, np.full(8, len(key), dtype=np.float32))])
+
+def test_hits_and_misses(cache):
+    _put(cache, "a")
+    found = cache.get_many(["a", "b", "a"])
+    assert list(found) == ["a"]
+    np.testing.assert_array_equal(found["a"][1], np.full(8, 1, dtype=np.float32))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 1, 1)
+
+def test_evicts_least_recently_used(cache):
+    for key in ["k0", "k1", "k2", "k3", "k4"]:
+        _put(cache, key)
+    cache.get_many(["k0"])  # now the most recently used
+    _put(cache, "k5")
+    # Over budget: trimmed to 90% of it, oldest first.
+    assert set(cache.get_many(["k0", "k1", "k2", "k3", "k4", "k5"])) == {"k0", "k3", "k4", "k5"}
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["entries"] == 4
+    assert stats["bytes"] == 4 * ENTRY_BYTES
+
+def test_add_counts(cache):
+    cache.get_many(["x"])
+    cache.add_counts(3, 4, 1)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (3, 5, 1)
@@ -0,0 +1,40 @@
+import random
+
+import numpy as np
+import pytest
+
+from backend.matching.ranking import SCORE_DECIMALS, TopN
+
+def _expected(scores, n):
+    # What ranking used to do: a stable descending sort on the rounded score.
+    order = sorted(range(len(scores)), key=lambda i: round(float(scores[i]), SCORE_DECIMALS), reverse=True)
+    return order[:n]
+
+@pytest.mark.parametrize("seed", range(20))
+def test_push_many_matches_stable_sort(seed):
+    rng = random.Random(seed)
+    # Few distinct values, so most scores tie once rounded.
+    values = [68.92, 68.921, 68.9249, 68.919, 50.0, 12.3456, 0.0]
+    scores = np.array([rng.choice(values) + rng.uniform(0, 1e-6) for _ in range(rng.randint(1, 80))])
+    n = rng.randint(0, 12)
+    top = TopN(n)
+    # Several batches, as when candidates are streamed in chunks.
+    cut = rng.randint(0, len(scores))
+    top.push_many(scores[:cut], list(range(cut)))
+    top.push_many(scores[cut:], list(range(cut, len(scores))))
+    assert [i for _, i in top.items()] == _expected(scores, n)
+
+def test_push_matches_push_many():
+    rng = np.random.default_rng(0)
+    scores = np.round(rng.uniform(0, 100, 500), 1)
+    one, many = TopN(25), TopN(25)
+    for i, s in enumerate(scores):
+        one.push(s, i)
+    many.push_many(scores, list(range(len(scores))))
+    assert one.items() == many.items()
+    assert [i for _, i in many.items()] == _expected(scores, 25)
+
+def test_scores_are_rounded_for_ties():
+    top = TopN(2)
+    top.push_many(np.array([68.9201, 68.9249, 68.9199]), ["a", "b", "c"])
+    assert top.items() == [(68.92, "a"), (68.92, "b")]
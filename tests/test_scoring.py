@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+import pytest
+
+from backend.matching.batch_scoring import COMPONENTS, CandidateMatrix, score_candidates, score_jobs
+from backend.matching.ranking import build_match_result
+from backend.matching.scoring import compute_component_scores
+from backend.models import CandidateProfile, EducationEntry, JobProfile
+from backend.nlp.taxonomy import TAXONOMY
+
+SKILLS = sorted(TAXONOMY.phrases)[:40] + ["cobol dialect", "python scripting", "sql"]
+DEGREES = ["bachelor", "master", "phd"]
+CERTS = ["aws", "pmp", "cka"]
+
+def _candidates(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    cands = []
+    for i in range(n):
+        emb = None if rng.random() < 0.2 else np.array([rng.uniform(-1, 1) for _ in range(8)], dtype=np.float32)
+        if emb is not None and rng.random() < 0.1:
+            emb[:] = 0
+        cands.append(CandidateProfile(
+            candidate_id=f"c{i}",
+            raw_text="",
+            skills=rng.sample(SKILLS, rng.randint(0, 6)),
+            education=[EducationEntry(degree=d) for d in rng.sample(DEGREES, rng.randint(0, 2))],
+            certifications=rng.sample(CERTS, rng.randint(0, 2)),
+            total_years_experience=None if rng.random() < 0.2 else rng.choice([0.0, 0.5, 2.0, 5.0, 12.0]),
+            embedding=emb,
+        ))
+    return cands
+
+def _job(min_years, seed: int = 1) -> JobProfile:
+    rng = random.Random(seed)
+    return JobProfile(
+        raw_text="",
+        required_skills=rng.sample(SKILLS, 4) + ["python"],
+        preferred_skills=rng.sample(SKILLS, 2),
+        min_years_experience=min_years,
+        education_requirements=["master"],
+        certifications_required=["aws", "pmp"],
+        embedding=np.array([rng.uniform(-1, 1) for _ in range(8)], dtype=np.float32),
+    )
+
+@pytest.mark.parametrize("min_years", [None, 0, 0.0, 3, 7.5])
+def test_batch_scores_match_scalar(min_years):
+    cands = _candidates(200)
+    job = _job(min_years)
+    columns = score_candidates(job, CandidateMatrix.from_profiles(cands))
+    for i, cand in enumerate(cands):
+        comps = compute_component_scores(job, cand)[0]
+        for name in COMPONENTS:
+            assert columns[name][i] == pytest.approx(getattr(comps, name), abs=1e-9), (name, i)
+
+def test_score_jobs_matches_score_candidates():
+    cands = _candidates(100, seed=3)
+    jobs = [_job(m, seed=s) for s, m in enumerate([None, 0, 4])]
+    m = CandidateMatrix.from_profiles(cands)
+    for job, columns in zip(jobs, score_jobs(jobs, m)):
+        expected = score_candidates(job, m)
+        for name in COMPONENTS:
+            np.testing.assert_allclose(columns[name], expected[name], atol=1e-9)
+
+def test_zero_minimum_experience_builds_results():
+    job = _job(0)
+    for cand in _candidates(20, seed=5):
+        result = build_match_result(job, cand)
+        expected = 0.5 if cand.total_years_experience is None else 1.0
+        assert result.components.experience_alignment == expected
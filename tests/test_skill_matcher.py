@@ -0,0 +1,49 @@
+import random
+import re
+
+import pytest
+
+from backend.nlp import ner_skill_extractor
+from backend.nlp.ner_skill_extractor import match_skills
+from backend.nlp.taxonomy import TAXONOMY
+
+PHRASES = [
+    "machine learning", "machine learning engineering", "deep learning", "learning",
+    "c", "c++", "c#", "node", "node.js", "java", "javascript", "sql", "nosql", "ci/cd",
+]
+FILLER = ["with", "and", "in", "expert", "years", "js", "machines", "engineering", "(", ")", ",", ".", "/", "-"]
+
+def _brute_force(text, phrases):
+    # Every dictionary phrase found on word boundaries, one regex per phrase.
+    lowered = text.lower()
+    found = set()
+    for phrase, names in phrases.items():
+        pattern = r"(?<!\w)" + r"\s+".join(re.escape(w) for w in phrase.split()) + r"(?!\w)"
+        if re.search(pattern, lowered):
+            found |= names
+    return found
+
+@pytest.fixture
+def dictionary(monkeypatch):
+    phrases = {p: {p} for p in PHRASES}
+    monkeypatch.setattr(TAXONOMY, "phrases", phrases)
+    ner_skill_extractor._skill_matcher.cache_clear()
+    yield phrases
+    ner_skill_extractor._skill_matcher.cache_clear()
+
+def test_prefix_skills_at_the_same_position(dictionary):
+    assert match_skills("Machine  Learning Engineering, C++ and Node.js") == {
+        "machine learning", "machine learning engineering", "learning", "c", "c++", "node", "node.js",
+    }
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_brute_force(dictionary, seed):
+    rng = random.Random(seed)
+    words = [rng.choice(PHRASES + FILLER) for _ in range(rng.randint(0, 40))]
+    seps = [rng.choice([" ", "  ", "\n", "", ", "]) for _ in words]
+    text = "".join(w.upper() if rng.random() < 0.2 else w for pair in zip(words, seps) for w in pair)
+    assert match_skills(text) == _brute_force(text, dictionary)
+
+def test_real_dictionary_matches_brute_force():
+    text = "Python and SQL developer; built REST APIs with Django, Docker, AWS and machine learning pipelines."
+    assert match_skills(text) == _brute_force(text, TAXONOMY.phrases)